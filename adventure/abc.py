@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 from abc import ABC, abstractmethod
 from types import SimpleNamespace
-from typing import TYPE_CHECKING, Any, Dict, List, Literal, MutableMapping, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Mapping, MutableMapping, Optional, Set, Tuple, Union
 
 import discord
 from redbot.core import Config, commands
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
     from .adventureresult import AdventureResults
     from .adventureset import TaxesConverter
     from .charsheet import Character, Item
+    from .combat import Action
     from .constants import Rarities, Treasure
     from .converters import (
         BackpackFilterParser,
@@ -28,8 +29,16 @@ if TYPE_CHECKING:
         ThemeSetMonterConverter,
         ThemeSetPetConverter,
     )
+    from .engine import Outcome
     from .game_session import GameSession
+    from .gear_sets import GearSetIndex
+    from .monster_index import MonsterIndex
+    from .ranking import LeaderboardIndex
+    from .registry import BoundedRegistry, RegistryStats
+    from .replay import ReplayLog
     from .rng import Random
+    from .scheduler import Scheduler
+    from .theme import ThemeData
     from .types import Monster
 
 
@@ -44,26 +53,34 @@ class AdventureMixin(ABC):
         self.config: Config
         self.bot: Red
         self._adv_results: AdventureResults
+        self._leaderboard_index: LeaderboardIndex
         self.settings: Dict[Any, Any]
         self.emojis: SimpleNamespace
         self._ready: asyncio.Event
-        self._adventure_countdown: dict
-        self._rewards: dict
-        self._reward_message: dict
-        self._loss_message = {}
-        self._trader_countdown = {}
+        self._adventure_countdown: BoundedRegistry[int, float]
+        self._rewards: BoundedRegistry[int, dict]
+        self._reward_message: BoundedRegistry[int, str]
+        self._loss_message: BoundedRegistry[int, str]
+        self._trader_countdown: BoundedRegistry[int, int]
+        self._last_trade: BoundedRegistry[int, float]
         self._current_traders = {}
         self._curent_trader_stock = {}
         self._sessions: MutableMapping[int, GameSession] = {}
-        self._react_messaged = []
+        self._user_sessions: Dict[int, Dict[int, GameSession]] = {}
+        self._cart_channels: Set[int] = set()
+        self._adventure_messages: Set[int] = set()
+        self._react_messaged: BoundedRegistry[str, bool]
         self._daily_bonus: dict = {}
         self.tasks = {}
-        self.locks: MutableMapping[int, asyncio.Lock] = {}
-        self.gb_task = None
+        self.locks: BoundedRegistry[int, asyncio.Lock]
+        self._scheduler: Scheduler
+        self._replays: ReplayLog
 
         self.RAISINS: list = None
         self.THREATEE: list = None
         self.TR_GEAR_SET: dict = None
+        self.GEAR_SETS: GearSetIndex = None
+        self._theme_data: Optional[ThemeData] = None
         self.ATTRIBS: dict = None
         self.MONSTERS: dict = None
         self.AS_MONSTERS: dict = None
@@ -85,10 +102,34 @@ class AdventureMixin(ABC):
     def get_lock(self, member: discord.User) -> asyncio.Lock:
         raise NotImplementedError()
 
+    @abstractmethod
+    def registry_stats(self) -> Dict[str, RegistryStats]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def load_theme(self, theme: str) -> ThemeData:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_cached_character(self, user: discord.User) -> Optional[Character]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_character(self, ctx: commands.Context, user: discord.User) -> Character:
+        raise NotImplementedError()
+
     @abstractmethod
     def in_adventure(self, ctx: Optional[commands.Context] = None, user: Optional[discord.Member] = None) -> bool:
         raise NotImplementedError()
 
+    @abstractmethod
+    def remove_session(self, guild_id: int):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def record_ability(self, c: Character, roll: Optional[float] = None):
+        raise NotImplementedError()
+
     @abstractmethod
     async def _clear_react(self, msg: discord.Message):
         raise NotImplementedError()
@@ -110,10 +151,6 @@ class AdventureMixin(ABC):
     async def initialize(self):
         raise NotImplementedError()
 
-    @abstractmethod
-    async def cleanup_tasks(self):
-        raise NotImplementedError()
-
     @abstractmethod
     async def _migrate_config(self, from_version: int, to_version: int) -> None:
         raise NotImplementedError()
@@ -123,7 +160,7 @@ class AdventureMixin(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    async def _garbage_collection(self):
+    def _expire_session(self, guild_id: int, session: GameSession):
         raise NotImplementedError()
 
     @abstractmethod
@@ -139,17 +176,29 @@ class AdventureMixin(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    async def get_challenge(self, monsters: Dict[str, Monster], rng: Random):
+    async def get_challenge(self, monsters: Mapping[str, Monster], rng: Random):
         raise NotImplementedError()
 
     @abstractmethod
     def _dynamic_monster_stats(self, choice: Monster, rng: Random) -> Monster:
         raise NotImplementedError()
 
+    @abstractmethod
+    def get_monster_index(self, monsters: Mapping[str, Monster]) -> MonsterIndex:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_monster_roster(self) -> Mapping[str, Monster]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def invalidate_monster_roster(self, theme: Optional[str] = None) -> None:
+        raise NotImplementedError()
+
     @abstractmethod
     async def update_monster_roster(
         self, c: Optional[Character] = None, rng: Optional[Random] = None
-    ) -> Tuple[Dict[str, Monster], float, bool]:
+    ) -> Tuple[Mapping[str, Monster], float, bool]:
         raise NotImplementedError()
 
     @abstractmethod
@@ -173,7 +222,7 @@ class AdventureMixin(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    async def _handle_adventure(self, reaction: discord.Reaction, user: discord.Member):
+    async def _handle_adventure(self, reaction: discord.Reaction, user: discord.Member, action: Action):
         raise NotImplementedError()
 
     @abstractmethod
@@ -181,23 +230,19 @@ class AdventureMixin(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    async def handle_run(self, guild_id, attack, diplomacy, magic, shame=False):
+    async def handle_run(self, guild_id, shame=False) -> str:
         raise NotImplementedError()
 
     @abstractmethod
-    async def handle_fight(self, guild_id, fumblelist, critlist, attack, magic):
+    async def handle_fight(self, guild_id, outcome: Outcome) -> str:
         raise NotImplementedError()
 
     @abstractmethod
-    async def handle_pray(self, guild_id, fumblelist, attack, diplomacy, magic):
+    async def handle_pray(self, guild_id, outcome: Outcome) -> str:
         raise NotImplementedError()
 
     @abstractmethod
-    async def handle_talk(self, guild_id, fumblelist, critlist, diplomacy):
-        raise NotImplementedError()
-
-    @abstractmethod
-    async def handle_basilisk(self, ctx: commands.Context):
+    async def handle_talk(self, guild_id, outcome: Outcome) -> str:
         raise NotImplementedError()
 
     @abstractmethod
@@ -207,7 +252,7 @@ class AdventureMixin(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    async def _adv_countdown(self, ctx: commands.Context, seconds, title) -> asyncio.Task:
+    async def _adv_countdown(self, ctx: commands.Context, seconds, title) -> asyncio.Future:
         raise NotImplementedError()
 
     @abstractmethod
@@ -294,6 +339,10 @@ class AdventureMixin(ABC):
     async def advcooldown(self, ctx: commands.Context, *, time_in_seconds: int):
         raise NotImplementedError()
 
+    @abstractmethod
+    async def update_interval(self, ctx: commands.Context, seconds: float):
+        raise NotImplementedError()
+
     @abstractmethod
     async def version(self, ctx: commands.Context):
         raise NotImplementedError()
@@ -553,6 +602,10 @@ class AdventureMixin(ABC):
     async def _adventurestats(self, ctx: commands.Context):
         raise NotImplementedError()
 
+    @abstractmethod
+    async def _adventureregistries(self, ctx: commands.Context):
+        raise NotImplementedError()
+
     #######################################################################
     # economy.py                                                          #
     #######################################################################
@@ -639,6 +692,10 @@ class AdventureMixin(ABC):
     async def wscoreboard(self, ctx: commands.Context, show_global: bool = False):
         raise NotImplementedError()
 
+    @abstractmethod
+    async def myrank(self, ctx: commands.Context, show_global: bool = False):
+        raise NotImplementedError()
+
     @abstractmethod
     async def get_weekly_scoreboard(self, positions: int = None, guild: discord.Guild = None) -> List[tuple]:
         raise NotImplementedError()
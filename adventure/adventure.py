@@ -1,14 +1,13 @@
 # -*- coding: utf-8 -*-
 import asyncio
 import contextlib
-import json
 import logging
 import random
 import time
 from abc import ABC
-from datetime import datetime, timedelta
-from types import SimpleNamespace
-from typing import Dict, Literal, MutableMapping, Optional, Tuple, Union
+from datetime import datetime
+from types import MappingProxyType, SimpleNamespace
+from typing import Dict, Literal, Mapping, MutableMapping, Optional, Set, Tuple, Union
 
 import discord
 from discord.ext.commands import CheckFailure
@@ -20,8 +19,8 @@ from redbot.core.errors import BalanceTooHigh
 from redbot.core.i18n import Translator, cog_i18n
 from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import bold, box, humanize_list, humanize_number, pagify
-from redbot.core.utils.predicates import ReactionPredicate
 
+from . import engine
 from .adventureresult import AdventureResults
 from .adventureset import AdventureSetCommands
 from .backpack import BackPackCommands
@@ -35,14 +34,22 @@ from .converters import ArgParserFailure, ChallengeConverter
 from .defaults import default_global, default_guild, default_user
 from .dev import DevCommands
 from .economy import EconomyCommands
-from .game_session import GameSession
+from .engine import Outcome, RollKind
+from .game_session import Action, GameSession
+from .gear_sets import GearSetIndex
 from .helpers import _get_epoch, _remaining, is_dev, smart_embed
 from .leaderboards import LeaderboardCommands
 from .loadouts import LoadoutCommands
 from .loot import LootCommands
+from .monster_index import MonsterIndex
 from .negaverse import Negaverse
+from .ranking import LeaderboardIndex
 from .rebirth import RebirthCommands
+from .registry import BoundedRegistry, RegistryStats
+from .replay import RESULT_STREAM, ReplayLog, ReplayRecord
 from .rng import GameSeed, Random
+from .scheduler import Scheduler
+from .theme import InvalidTheme, ThemeData
 from .themeset import ThemesetCommands
 from .types import Monster
 
@@ -52,6 +59,17 @@ log = logging.getLogger("red.cogs.adventure")
 
 
 _SCHEMA_VERSION = 4
+# How often, in seconds, to check the theme's files for changes
+THEME_CHECK_INTERVAL = 30
+# How long, in seconds, a session is kept before it's considered abandoned
+SESSION_TIMEOUT = 60 * 6
+# How long, in seconds, the per user, guild and message registries keep an entry after it was last used
+REGISTRY_TTL = 60 * 60
+REGISTRY_LONG_TTL = 60 * 60 * 24 * 7
+# How many of each guild's latest adventures the monster's stats are based on
+NUM_RAIDS = 20
+# How long, in seconds, new adventure results wait before they are written to disk
+RESULTS_SAVE_DELAY = 60
 _config: Config = None
 
 
@@ -90,17 +108,20 @@ class Adventure(
         user_id: int,
     ):
         await self.config.user_from_id(user_id).clear()
+        self._leaderboard_index.remove(user_id)
         await bank._config.user_from_id(
             user_id
         ).clear()  # This will only ever touch the separate currency, leaving bot economy to be handled by core.
+        bank._invalidate(user_id)
 
     __version__ = "4.1.1"
 
     def __init__(self, bot: Red):
         self.bot = bot
         bank._init(bot)
-        self._last_trade = {}
-        self._adv_results = AdventureResults(20)
+        # when each guild last saw a cart, kept for longer than any sensible cart timeout
+        self._last_trade: BoundedRegistry[int, float] = BoundedRegistry(maxsize=100_000, ttl=REGISTRY_LONG_TTL)
+        self._adv_results = AdventureResults(NUM_RAIDS)
         self.emojis = SimpleNamespace()
         self.emojis.fumble = "\N{EXCLAMATION QUESTION MARK}\N{VARIATION SELECTOR-16}"
         self.emojis.level_up = "\N{BLACK UP-POINTING DOUBLE TRIANGLE}"
@@ -127,20 +148,26 @@ class Adventure(
         self.emojis.dipl = self.emojis.talk
         self.red_340_or_newer = version_info >= VersionInfo.from_str("3.4.0")
 
-        self._adventure_actions = [
+        self._adventure_actions = (
             self.emojis.attack,
             self.emojis.magic,
             self.emojis.talk,
             self.emojis.pray,
             self.emojis.run,
-        ]
-        self._adventure_controls = {
-            "fight": self.emojis.attack,
-            "magic": self.emojis.magic,
-            "talk": self.emojis.talk,
-            "pray": self.emojis.pray,
-            "run": self.emojis.run,
-        }
+        )
+        self._adventure_controls = MappingProxyType(
+            {
+                "fight": self.emojis.attack,
+                "magic": self.emojis.magic,
+                "talk": self.emojis.talk,
+                "pray": self.emojis.pray,
+                "run": self.emojis.run,
+            }
+        )
+        # the action each reaction on an adventure message stands for
+        self._adventure_reactions: Mapping[str, Action] = MappingProxyType(
+            {emoji: Action[name] for name, emoji in self._adventure_controls.items()}
+        )
         self._treasure_controls = {
             self.emojis.yes: "equip",
             self.emojis.no: "backpack",
@@ -148,26 +175,47 @@ class Adventure(
         }
         self._yes_no_controls = {self.emojis.yes: "yes", self.emojis.no: "no"}
 
-        self._adventure_countdown = {}
-        self._rewards = {}
-        self._reward_message = {}
-        self._loss_message = {}
-        self._trader_countdown = {}
+        # These only hold state while an adventure or cart is running so anything left
+        # behind by one that errored is dropped after a while instead of kept forever.
+        self._adventure_countdown: BoundedRegistry[int, float] = BoundedRegistry(maxsize=10_000, ttl=REGISTRY_TTL)
+        self._rewards: BoundedRegistry[int, dict] = BoundedRegistry(maxsize=100_000, ttl=REGISTRY_TTL)
+        self._reward_message: BoundedRegistry[int, str] = BoundedRegistry(maxsize=10_000, ttl=REGISTRY_TTL)
+        self._loss_message: BoundedRegistry[int, str] = BoundedRegistry(maxsize=10_000, ttl=REGISTRY_TTL)
+        self._trader_countdown: BoundedRegistry[int, int] = BoundedRegistry(maxsize=10_000, ttl=REGISTRY_TTL)
         self._current_traders = {}
         self._curent_trader_stock = {}
         self._sessions: MutableMapping[int, GameSession] = {}
-        self._react_messaged = []
+        # user id -> guild id -> the session they joined, kept up to date by the sessions
+        self._user_sessions: Dict[int, Dict[int, GameSession]] = {}
+        # the channels of every guild the cart can show up in, kept up to date by `[p]adventureset cart`
+        self._cart_channels: Set[int] = set()
+        # the messages of the adventures running in every guild
+        self._adventure_messages: Set[int] = set()
+        self._react_messaged: BoundedRegistry[str, bool] = BoundedRegistry(maxsize=100_000, ttl=REGISTRY_TTL)
         self.tasks = {}
-        self.locks: MutableMapping[int, asyncio.Lock] = {}
-        self.gb_task = None
+        # a lock that is held is never dropped, otherwise two commands could get different locks
+        self.locks: BoundedRegistry[int, asyncio.Lock] = BoundedRegistry(
+            maxsize=100_000, ttl=REGISTRY_TTL, can_evict=lambda lock: not lock.locked()
+        )
+        # runs countdowns, session expiry and cart departures
+        self._scheduler = Scheduler()
+        # what each adventure's result was worked out from, so it can be replayed
+        self._replays = ReplayLog(cog_data_path(self) / "replays.jsonl")
 
         self.config = Config.get_conf(self, 2_710_801_001, force_registration=True)
+        self._leaderboard_index = LeaderboardIndex(self.config)
         self._daily_bonus = {}
         self._separate_economy = None
 
         self.RAISINS: list = None
         self.THREATEE: list = None
         self.TR_GEAR_SET: dict = None
+        self.GEAR_SETS: GearSetIndex = None
+        self._theme_data: Optional[ThemeData] = None
+        self._theme_task = None
+        self._monster_rosters: Dict[str, Mapping[str, Monster]] = {}
+        self._monster_roster_version = 0
+        self._monster_index: Optional[MonsterIndex] = None
         self.ATTRIBS: dict = None
         self.MONSTERS: Dict[str, Monster] = None
         self.AS_MONSTERS: dict = None
@@ -179,7 +227,6 @@ class Adventure(
         self.config.register_guild(**default_guild)
         self.config.register_global(**default_global)
         self.config.register_user(**default_user)
-        self.cleanup_loop = self.bot.loop.create_task(self.cleanup_tasks())
         log.debug("Creating Task")
         self._init_task = self.bot.loop.create_task(self.initialize())
         self._ready_event = asyncio.Event()
@@ -247,113 +294,74 @@ class Adventure(
             _config = self.config
             theme = await self.config.theme()
             self._separate_economy = await self.config.separate_economy()
-            if theme in {"default"}:
-                get_path = bundled_data_path
-            else:
-                get_path = cog_data_path
-
-            as_monster_fp = get_path(self) / f"{theme}" / "as_monsters.json"
-            attribs_fp = get_path(self) / f"{theme}" / "attribs.json"
-            locations_fp = get_path(self) / f"{theme}" / "locations.json"
-            monster_fp = get_path(self) / f"{theme}" / "monsters.json"
-            pets_fp = get_path(self) / f"{theme}" / "pets.json"
-            raisins_fp = get_path(self) / f"{theme}" / "raisins.json"
-            threatee_fp = get_path(self) / f"{theme}" / "threatee.json"
-            tr_set_fp = get_path(self) / f"{theme}" / "tr_set.json"
-            prefixes_fp = get_path(self) / f"{theme}" / "prefixes.json"
-            materials_fp = get_path(self) / f"{theme}" / "materials.json"
-            equipment_fp = get_path(self) / f"{theme}" / "equipment.json"
-            suffixes_fp = get_path(self) / f"{theme}" / "suffixes.json"
-            set_bonuses = get_path(self) / f"{theme}" / "set_bonuses.json"
-            action_response = get_path(self) / f"{theme}" / "action_response.json"
-            files = {
-                "pets": pets_fp,
-                "attr": attribs_fp,
-                "monster": monster_fp,
-                "location": locations_fp,
-                "raisins": raisins_fp,
-                "threatee": threatee_fp,
-                "set": tr_set_fp,
-                "as_monsters": as_monster_fp,
-                "prefixes": prefixes_fp,
-                "materials": materials_fp,
-                "equipment": equipment_fp,
-                "suffixes": suffixes_fp,
-                "set_bonuses": set_bonuses,
-                "action_response": action_response,
-            }
-            for name, file in files.items():
-                if not file.exists():
-                    files[name] = bundled_data_path(self) / "default" / f"{file.name}"
-
-            with files["pets"].open("r") as f:
-                self.PETS = json.load(f)
-            with files["attr"].open("r") as f:
-                self.ATTRIBS = json.load(f)
-            with files["monster"].open("r") as f:
-                self.MONSTERS = json.load(f)
-            with files["as_monsters"].open("r") as f:
-                self.AS_MONSTERS = json.load(f)
-            with files["location"].open("r") as f:
-                self.LOCATIONS = json.load(f)
-            with files["raisins"].open("r") as f:
-                self.RAISINS = json.load(f)
-            with files["threatee"].open("r") as f:
-                self.THREATEE = json.load(f)
-            with files["set"].open("r") as f:
-                self.TR_GEAR_SET = json.load(f)
-            with files["prefixes"].open("r") as f:
-                self.PREFIXES = json.load(f)
-            with files["materials"].open("r") as f:
-                self.MATERIALS = json.load(f)
-            with files["equipment"].open("r") as f:
-                self.EQUIPMENT = json.load(f)
-            with files["suffixes"].open("r") as f:
-                self.SUFFIXES = json.load(f)
-            with files["set_bonuses"].open("r") as f:
-                self.SET_BONUSES = json.load(f)
-            with files["action_response"].open("r") as f:
-                self.ACTION_RESPONSE = json.load(f)
-
-            if not all(
-                i
-                for i in [
-                    len(self.PETS) > 0,
-                    len(self.ATTRIBS) > 0,
-                    len(self.MONSTERS) > 0,
-                    len(self.LOCATIONS) > 0,
-                    len(self.RAISINS) > 0,
-                    len(self.THREATEE) > 0,
-                    len(self.TR_GEAR_SET) > 0,
-                    len(self.PREFIXES) > 0,
-                    len(self.MATERIALS) > 0,
-                    len(self.EQUIPMENT) > 0,
-                    len(self.SUFFIXES) > 0,
-                    len(self.SET_BONUSES) > 0,
-                ]
-            ):
+            try:
+                await self.load_theme(theme)
+            except InvalidTheme:
                 log.critical(f"{theme} theme is invalid, resetting it to the default theme.")
                 await self.config.theme.set("default")
                 await self.initialize()
                 return
             await self._migrate_config(from_version=await self.config.schema_version(), to_version=_SCHEMA_VERSION)
             self._daily_bonus = await self.config.daily_bonus.all()
+            all_guilds = await self.config.all_guilds()
+            self._cart_channels = {
+                channel_id for guild_data in all_guilds.values() for channel_id in guild_data.get("cart_channels") or []
+            }
+            await self._load_adventure_results()
         except Exception as err:
             log.exception("There was an error starting up the cog", exc_info=err)
         else:
             self._ready_event.set()
-            self.gb_task = self.bot.loop.create_task(self._garbage_collection())
+            self._scheduler.start()
+            if self._theme_task is None:
+                self._theme_task = self.bot.loop.create_task(self._watch_theme())
 
-    async def cleanup_tasks(self):
-        await self._ready_event.wait()
-        while self is self.bot.get_cog("Adventure"):
-            to_delete = []
-            for msg_id, task in self.tasks.items():
-                if task.done():
-                    to_delete.append(msg_id)
-            for task in to_delete:
-                del self.tasks[task]
-            await asyncio.sleep(300)
+    async def load_theme(self, theme: str) -> ThemeData:
+        """Load a theme's files in a thread and swap it in.
+
+        Raises
+        ------
+        InvalidTheme
+            If the theme is missing data.
+        """
+        get_path = bundled_data_path if theme == "default" else cog_data_path
+        theme_data = await self.bot.loop.run_in_executor(
+            None, ThemeData.load, theme, get_path(self) / theme, bundled_data_path(self) / "default"
+        )
+        # nothing is awaited while swapping so no command can see half of each theme
+        self._theme_data = theme_data
+        for attr, data in theme_data.data.items():
+            setattr(self, attr, data)
+        self.GEAR_SETS = theme_data.gear_sets
+        self.invalidate_monster_roster()
+        log.debug("Loaded the %s theme", theme)
+        return theme_data
+
+    async def _watch_theme(self):
+        """Reload the theme when its files change on disk."""
+        failed = None
+        with contextlib.suppress(asyncio.CancelledError):
+            while True:
+                await asyncio.sleep(THEME_CHECK_INTERVAL)
+                theme_data = self._theme_data
+                if theme_data is None:
+                    continue
+                theme = theme_data.name
+                get_path = bundled_data_path if theme == "default" else cog_data_path
+                mtimes = await self.bot.loop.run_in_executor(
+                    None, ThemeData.current_mtimes, get_path(self) / theme, bundled_data_path(self) / "default"
+                )
+                if mtimes == theme_data.mtimes or mtimes == failed:
+                    continue
+                try:
+                    await self.load_theme(theme)
+                except Exception as exc:
+                    # keep using what we have until the files are fixed
+                    log.exception("Error reloading the %s theme", theme, exc_info=exc)
+                    failed = mtimes
+                else:
+                    log.info("Reloaded the %s theme after its files changed", theme)
+                    failed = None
 
     async def _migrate_config(self, from_version: int, to_version: int) -> None:
         log.debug(f"from_version: {from_version} to_version:{to_version}")
@@ -492,13 +500,17 @@ class Adventure(
         with something requiring their attention.
         """
         author = user or ctx.author
-        sessions = self._sessions
-        if not sessions:
-            return False or self.get_lock(author).locked()
-        for session in self._sessions.values():
-            if session.in_adventure(author):
-                return True
-        return False or self.get_lock(author).locked()
+        if author.id in self._user_sessions:
+            return True
+        return self.get_lock(author).locked()
+
+    def remove_session(self, guild_id: int):
+        """Removes the guild's adventure along with its participants."""
+        self._scheduler.cancel(("session", guild_id))
+        session = self._sessions.pop(guild_id, None)
+        if session is not None:
+            self._adventure_messages.discard(session.message_id)
+            session.close()
 
     async def allow_in_dm(self, ctx):
         """Checks if the bank is global and allows the command in dm."""
@@ -507,21 +519,88 @@ class Adventure(
         return bool(ctx.guild is None and await bank.is_global())
 
     def get_lock(self, member: discord.User) -> asyncio.Lock:
-        if member.id not in self.locks:
-            self.locks[member.id] = asyncio.Lock()
-        return self.locks[member.id]
+        lock = self.locks.get(member.id)
+        if lock is None:
+            lock = self.locks[member.id] = asyncio.Lock()
+        return lock
+
+    def registry_stats(self) -> Dict[str, RegistryStats]:
+        """Returns the size and evictions of each registry that holds per user, guild or message state."""
+        registries = {
+            "locks": self.locks,
+            "rewards": self._rewards,
+            "reward_message": self._reward_message,
+            "loss_message": self._loss_message,
+            "react_messaged": self._react_messaged,
+            "last_trade": self._last_trade,
+            "trader_countdown": self._trader_countdown,
+            "adventure_countdown": self._adventure_countdown,
+        }
+        return {name: registry.stats() for name, registry in registries.items()}
+
+    def get_cached_character(self, user: discord.User) -> Optional[Character]:
+        """Returns the character sheet an active adventure holds for this user, if any."""
+        for session in self._user_sessions.get(user.id, {}).values():
+            c = session.characters.get(user.id)
+            if c is not None:
+                return c
+        return None
+
+    async def get_character(self, ctx: commands.Context, user: discord.User) -> Character:
+        """Returns the user's character sheet.
+
+        If the user is part of an active adventure the sheet held by that adventure
+        is returned so that changes made outside of it are not lost when
+        the adventure writes its sheets back.
+        """
+        c = self.get_cached_character(user)
+        if c is None:
+            return await Character.from_json(ctx, self.config, user, self._daily_bonus)
+        c.bal = await bank.get_balance(user)
+        return c
+
+    async def _load_adventure_results(self):
+        """Reads the latest adventure results of every guild saved before the cog was last unloaded."""
+        path = cog_data_path(self) / "adventure_results.bin"
+        try:
+            data = await self.bot.loop.run_in_executor(None, path.read_bytes)
+        except FileNotFoundError:
+            return
+        except OSError:
+            log.exception("Error reading the adventure results")
+            return
+        try:
+            self._adv_results = AdventureResults.from_bytes(data, NUM_RAIDS)
+        except ValueError:
+            log.exception("The saved adventure results can't be read, starting without them")
 
-    async def _garbage_collection(self):
-        await self.bot.wait_until_red_ready()
-        delta = timedelta(minutes=6)
-        with contextlib.suppress(asyncio.CancelledError):
-            while True:
-                async for guild_id, session in AsyncIter(self._sessions.copy().items(), steps=100):
-                    if datetime.now() > (session.start_time + delta):
-                        if guild_id in self._sessions:
-                            log.debug("Removing old session from %s", guild_id)
-                            del self._sessions[guild_id]
-                await asyncio.sleep(5)
+    async def _save_adventure_results(self):
+        data = self._adv_results.to_bytes()
+        try:
+            await self.bot.loop.run_in_executor(None, self._write_adventure_results, data)
+        except OSError:
+            log.exception("Error saving the adventure results")
+
+    def _write_adventure_results(self, data: bytes):
+        path = cog_data_path(self) / "adventure_results.bin"
+        # written next to it first so a crash can't leave half a file
+        temp = path.with_suffix(".tmp")
+        temp.write_bytes(data)
+        temp.replace(path)
+
+    def record_ability(self, c: Character, roll: Optional[float] = None):
+        """Notes the class ability used in the adventures the character is in and retakes their combat profile.
+
+        Used when a class ability is used with a command, the buttons of an
+        adventure note it themselves.
+        """
+        for session in self._user_sessions.get(c.user.id, {}).values():
+            session.record_ability(c, roll)
+
+    def _expire_session(self, guild_id: int, session: GameSession):
+        if self._sessions.get(guild_id) is session:
+            log.debug("Removing old session from %s", guild_id)
+            self.remove_session(guild_id)
 
     @commands.cooldown(rate=1, per=5, type=commands.BucketType.guild)
     @commands.hybrid_command(name="adventure", aliases=["a"])
@@ -588,15 +667,14 @@ class Adventure(
                 self._sessions[ctx.guild.id].finished = True
             await self.config.guild(ctx.guild).cooldown.set(0)
             log.exception("Something went wrong controlling the game", exc_info=exc)
-            while ctx.guild.id in self._sessions:
-                del self._sessions[ctx.guild.id]
+            self.remove_session(ctx.guild.id)
             return
         if not reward and not participants:
             await self.config.guild(ctx.guild).cooldown.set(0)
-            while ctx.guild.id in self._sessions:
-                del self._sessions[ctx.guild.id]
+            self.remove_session(ctx.guild.id)
             return
-        reward_copy = reward.copy()
+        session = self._sessions.get(ctx.guild.id)
+        reward_copy = dict(reward.items())
         send_message = ""
         for userid, rewards in reward_copy.items():
             if rewards:
@@ -612,10 +690,15 @@ class Adventure(
             for page in pagify(send_message):
                 await smart_embed(ctx, page, success=True)
         if participants:
-            for user in participants:  # reset activated abilities
+            if session is not None:
+                await session.load_characters(participants, refresh_balance=True)
+            for user in participants:  # reset activated abilities and write the sheets back
                 async with self.get_lock(user):
                     try:
-                        c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                        if session is not None:
+                            c = await session.get_character(user)
+                        else:
+                            c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         continue
@@ -624,7 +707,7 @@ class Adventure(
                     if c.last_currency_check + 600 < time.time() or c.bal > c.last_known_currency:
                         c.last_known_currency = await bank.get_balance(user)
                         c.last_currency_check = time.time()
-                    await self.config.user(user).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
         if ctx.message.id in self._reward_message:
             extramsg = self._reward_message.pop(ctx.message.id)
             if extramsg:
@@ -636,8 +719,7 @@ class Adventure(
                 extramsg = _(f"{extramsg} to repair their gear.")
                 for msg in pagify(extramsg, page_length=1900):
                     await smart_embed(ctx, msg, success=False)
-        while ctx.guild.id in self._sessions:
-            del self._sessions[ctx.guild.id]
+        self.remove_session(ctx.guild.id)
 
     @_adventure.error
     async def _error_handler(self, ctx: commands.Context, error: Exception) -> None:
@@ -654,8 +736,7 @@ class Adventure(
         ):
             if ctx.guild.id in self._sessions:
                 self._sessions[ctx.guild.id].finished = True
-            while ctx.guild.id in self._sessions:
-                del self._sessions[ctx.guild.id]
+            self.remove_session(ctx.guild.id)
             handled = False
         elif isinstance(error, RuntimeError):
             handled = True
@@ -688,11 +769,29 @@ class Adventure(
 
         await ctx.bot.on_command_error(ctx, error, unhandled_by_cog=not handled)
 
-    async def get_challenge(self, monsters: Dict[str, Monster], rng: Random):
+    def get_monster_index(self, monsters: Mapping[str, Monster]) -> MonsterIndex:
+        """Gets the selection index of a monster roster, reusing it for the cached roster."""
+        index = self._monster_index
+        if index is None or index.monsters is not monsters:
+            index = MonsterIndex(monsters)
+            if monsters is self._monster_rosters.get(self._theme_data.name):
+                self._monster_index = index
+        return index
+
+    async def get_challenge(self, monsters: Mapping[str, Monster], rng: Random):
         possible_monsters = []
         stat_range = rng.internal_seed.stat_range
         log.debug("Random Seed is %s", int(rng.internal_seed))
         log.debug(stat_range)
+        if rng.internal_seed.version >= 1:
+            index = self.get_monster_index(monsters)
+            choice = index.choose(
+                stat_range.stat_type, int(stat_range.min_stat) * 0.5, int(stat_range.max_stat) * 1.2, rng
+            )
+            if choice is None:
+                choice = rng.choice(index.names)
+            return choice
+        # seeds from before the monster index keep the original selection so they play out the same
         async for (e, (m, stats)) in AsyncIter(monsters.items(), steps=100).enumerate(start=1):
             main_stat = stats["hp"] if (stat_range.stat_type == "hp") else stats["dipl"]
             appropriate_range = (int(stat_range.min_stat) * 0.5) <= main_stat <= (int(stat_range.max_stat) * 1.2)
@@ -712,120 +811,39 @@ class Adventure(
         return choice
 
     def _dynamic_monster_stats(self, choice: Monster, rng: Random) -> Monster:
-        stat_range = rng.internal_seed.stat_range
-        win_percentage = stat_range.win_percent
-        choice["cdef"] = choice.get("cdef", 1.0)
-        if win_percentage >= 0.90:
-            # more than 90% win rate
-            monster_hp_min = int(choice["hp"] * 2)
-            monster_hp_max = int(choice["hp"] * 3)
-            # hp 2-3x base
-            monster_diplo_min = int(choice["dipl"] * 2)
-            monster_diplo_max = int(choice["dipl"] * 3)
-            # dipl 2-3x base
-            percent_pdef = rng.randrange(25, 30) / 100
-            monster_pdef = choice["pdef"] * percent_pdef
-            percent_mdef = rng.randrange(25, 30) / 100
-            monster_mdef = choice["mdef"] * percent_mdef
-            percent_cdef = rng.randrange(25, 30) / 100
-            monster_cdef = choice["cdef"] * percent_cdef
-        elif win_percentage >= 0.75:
-            # less than 90% win rate but more than 75%
-            monster_hp_min = int(choice["hp"] * 1.5)
-            monster_hp_max = int(choice["hp"] * 2)
-            # hp 1.5-2x base
-            monster_diplo_min = int(choice["dipl"] * 1.5)
-            monster_diplo_max = int(choice["dipl"] * 2)
-            # dipl 1.5-2x base
-            percent_pdef = rng.randrange(15, 25) / 100
-            monster_pdef = choice["pdef"] * percent_pdef
-            percent_mdef = rng.randrange(15, 25) / 100
-            monster_mdef = choice["mdef"] * percent_mdef
-            percent_cdef = rng.randrange(15, 25) / 100
-            monster_cdef = choice["cdef"] * percent_cdef
-        elif win_percentage >= 0.50:
-            # less than 75% win rate but more than 50%
-            monster_hp_min = int(choice["hp"])
-            monster_hp_max = int(choice["hp"] * 1.5)
-            # hp 1-1.5x base
-            monster_diplo_min = int(choice["dipl"])
-            monster_diplo_max = int(choice["dipl"] * 1.5)
-            # dipl 1-1.5x base
-            percent_pdef = rng.randrange(1, 15) / 100
-            monster_pdef = choice["pdef"] * percent_pdef
-            percent_mdef = rng.randrange(1, 15) / 100
-            monster_mdef = choice["mdef"] * percent_mdef
-            percent_cdef = rng.randrange(1, 15) / 100
-            monster_cdef = choice["cdef"] * percent_cdef
-        elif win_percentage >= 0.35:
-            # less than 50% win rate but more than 35%
-            monster_hp_min = int(choice["hp"] * 0.9)
-            monster_hp_max = int(choice["hp"])
-            # hp 0.9-1x base
-            monster_diplo_min = int(choice["dipl"] * 0.9)
-            monster_diplo_max = int(choice["dipl"])
-            # dipl 0.9-1x base
-            percent_pdef = rng.randrange(1, 15) / 100
-            monster_pdef = choice["pdef"] * percent_pdef * -1
-            percent_mdef = rng.randrange(1, 15) / 100
-            monster_mdef = choice["mdef"] * percent_mdef * -1
-            percent_cdef = rng.randrange(1, 15) / 100
-            monster_cdef = choice["cdef"] * percent_cdef * -1
-        elif win_percentage >= 0.15:
-            # less than 35% win rate but more than 15%
-            monster_hp_min = int(choice["hp"] * 0.8)
-            monster_hp_max = int(choice["hp"] * 0.9)
-            # hp 0.8-0.9x base
-            monster_diplo_min = int(choice["dipl"] * 0.8)
-            monster_diplo_max = int(choice["dipl"] * 0.9)
-            # dipl 0.8-0.9x base
-            percent_pdef = rng.randrange(15, 25) / 100
-            monster_pdef = choice["pdef"] * percent_pdef * -1
-            percent_mdef = rng.randrange(15, 25) / 100
-            monster_mdef = choice["mdef"] * percent_mdef * -1
-            percent_cdef = rng.randrange(15, 25) / 100
-            monster_cdef = choice["cdef"] * percent_cdef * -1
-        else:
-            # less than 15% win rate
-            monster_hp_min = int(choice["hp"] * 0.6)
-            monster_hp_max = int(choice["hp"] * 0.8)
-            # hp 0.6-0.8x base
-            monster_diplo_min = int(choice["dipl"] * 0.6)
-            monster_diplo_max = int(choice["dipl"] * 0.8)
-            # dipl 0.6-0.8x base
-            percent_pdef = rng.randrange(25, 30) / 100
-            monster_pdef = choice["pdef"] * percent_pdef * -1
-            percent_mdef = rng.randrange(25, 30) / 100
-            monster_mdef = choice["mdef"] * percent_mdef * -1
-            percent_cdef = rng.randrange(25, 30) / 100
-            monster_cdef = choice["cdef"] * percent_cdef * -1
-
-        if monster_hp_min < monster_hp_max:
-            new_hp = rng.randrange(monster_hp_min, monster_hp_max)
-        elif monster_hp_max < monster_hp_min:
-            new_hp = rng.randrange(monster_hp_max, monster_hp_min)
-        else:
-            new_hp = max(monster_hp_max, monster_hp_min)
-        if monster_diplo_min < monster_diplo_max:
-            new_diplo = rng.randrange(monster_diplo_min, monster_diplo_max)
-        elif monster_diplo_max < monster_diplo_min:
-            new_diplo = rng.randrange(monster_diplo_max, monster_diplo_min)
+        return engine.dynamic_monster_stats(choice, rng)
+
+    async def get_monster_roster(self) -> Mapping[str, Monster]:
+        """Gets every monster of the current theme, including the custom ones, sorted by name.
+
+        The roster is shared and read only, it's built once and reused until
+        the theme or its custom monsters change.
+        """
+        theme_data = self._theme_data
+        roster = self._monster_rosters.get(theme_data.name)
+        if roster is not None:
+            return roster
+        version = self._monster_roster_version
+        extra_monsters = await self.config.themes.get_raw(theme_data.name, "monsters", default={})
+        monsters = {**theme_data.monsters, **extra_monsters}
+        roster = MappingProxyType({k: MappingProxyType(v) for k, v in sorted(monsters.items(), key=lambda x: x[0])})
+        if version == self._monster_roster_version and theme_data is self._theme_data:
+            # only keep it if nothing changed while we were reading the custom monsters
+            self._monster_rosters[theme_data.name] = roster
+        return roster
+
+    def invalidate_monster_roster(self, theme: Optional[str] = None) -> None:
+        """Forget the monster roster of a theme, or of every theme if none is given."""
+        self._monster_roster_version += 1
+        self._monster_index = None
+        if theme is None:
+            self._monster_rosters.clear()
         else:
-            new_diplo = max(monster_diplo_max, monster_diplo_min)
-
-        new_pdef = choice["pdef"] + monster_pdef
-        new_mdef = choice["mdef"] + monster_mdef
-        new_cdef = choice["cdef"] + monster_cdef
-        choice["hp"] = new_hp
-        choice["dipl"] = new_diplo
-        choice["pdef"] = new_pdef
-        choice["mdef"] = new_mdef
-        choice["cdef"] = new_cdef
-        return choice
+            self._monster_rosters.pop(theme, None)
 
     async def update_monster_roster(
         self, c: Optional[Character] = None, rng: Optional[Random] = None
-    ) -> Tuple[Dict[str, Monster], float, bool]:
+    ) -> Tuple[Mapping[str, Monster], float, bool]:
         """
         Gets the current list of available monsters, their stats, and whether
         or not to spawn a transcended.
@@ -838,7 +856,7 @@ class Adventure(
 
         Returns
         -------
-            Tuple[Dict[str, Monster], float, bool]
+            Tuple[Mapping[str, Monster], float, bool]
                 The Available monsters dictionary, the stats they should have scaled,
                 and whether or not it is transcended.
         """
@@ -846,25 +864,8 @@ class Adventure(
             transcended_chance = rng.randint(0, 10)
         else:
             transcended_chance = random.randint(0, 10)
-        theme = await self.config.theme()
-        extra_monsters = await self.config.themes.all()
-        extra_monsters = extra_monsters.get(theme, {}).get("monsters", {})
-        monsters = {**self.MONSTERS, **self.AS_MONSTERS, **extra_monsters}
-        monsters = {k: v for k, v in sorted(monsters.items(), key=lambda x: x[0])}
-        transcended = False
-        # set our default return values first
-        monster_stats = 1.0
-        if transcended_chance == 5:
-            monster_stats = 2.0
-
-        # if this is a normal adventure start e.g. not a bot owner
-        # picking the adventure, then we can randomly adjust the stats
-        if c is not None:
-            if transcended_chance == 5:
-                monster_stats = 2 + max((c.rebirths // 10) - 1, 0)
-                transcended = True
-            elif c.rebirths >= 10:
-                monster_stats = 1 + max((c.rebirths // 10) - 1, 0) / 2
+        monsters = await self.get_monster_roster()
+        monster_stats, transcended = engine.monster_scaling(transcended_chance, c.rebirths if c is not None else None)
         return monsters, monster_stats, transcended
 
     async def _simple(
@@ -940,6 +941,8 @@ class Adventure(
         # if ctx.author.id in DEV_LIST:
         # timer = 20
 
+        update_interval = await self.config.update_interval()
+        self.remove_session(ctx.guild.id)
         self._sessions[ctx.guild.id] = GameSession(
             ctx=ctx,
             cog=self,
@@ -960,6 +963,11 @@ class Adventure(
             easy_mode=easy_mode,
             no_monster=no_monster,
             rng=rng,
+            update_interval=update_interval,
+        )
+        session = self._sessions[ctx.guild.id]
+        self._scheduler.schedule(
+            ("session", ctx.guild.id), SESSION_TIMEOUT, lambda: self._expire_session(ctx.guild.id, session)
         )
         adventure_msg = (
             f"{adventure_msg}{text}\n{rng.choice(self.LOCATIONS)}\n"
@@ -1081,11 +1089,13 @@ class Adventure(
 
         session.message_id = adventure_msg.id
         session.message = adventure_msg
+        self._adventure_messages.add(adventure_msg.id)
         # start_adding_reactions(adventure_msg, self._adventure_actions)
         timer = await self._adv_countdown(ctx, session.timer, "Time remaining")
         self.dispatch_adventure(session)
 
         self.tasks[adventure_msg.id] = timer
+        timer.add_done_callback(lambda _: self.tasks.pop(adventure_msg.id, None))
         try:
             await asyncio.wait_for(timer, timeout=timeout + 5)
         except asyncio.TimeoutError:
@@ -1093,7 +1103,7 @@ class Adventure(
         except Exception as exc:
             timer.cancel()
             log.exception("Error with the countdown timer", exc_info=exc)
-        await adventure_msg.edit(view=None)
+        await session.flush(remove_view=True)
         try:
             return await self._result(ctx, adventure_msg)
         except Exception:
@@ -1140,84 +1150,65 @@ class Adventure(
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction: discord.Reaction, user: discord.Member):
         """This will be a cog level reaction_add listener for game logic."""
-        await self.bot.wait_until_ready()
-        if user.bot:
+        # this runs for every reaction the bot can see, anything that isn't
+        # an action on an adventure is let go before awaiting anything
+        if reaction.message.id not in self._adventure_messages:
+            return
+        action = self._adventure_reactions.get(str(reaction.emoji))
+        if action is None or user.bot:
             return
-        emojis = list(ReactionPredicate.NUMBER_EMOJIS) + self._adventure_actions
-        if str(reaction.emoji) not in emojis:
+        if (guild := getattr(user, "guild", None)) is None:
             return
+        await self.bot.wait_until_ready()
         if self.red_340_or_newer:
-            if (guild := getattr(user, "guild", None)) is not None:
-                if await self.bot.cog_disabled_in_guild(self, guild):
-                    return
-            else:
+            if await self.bot.cog_disabled_in_guild(self, guild):
                 return
         if not await self.has_perm(user):
             return
-        if guild.id in self._sessions:
-            if reaction.message.id == self._sessions[guild.id].message_id:
-                if guild.id in self._adventure_countdown:
-                    (timer, done, sremain) = self._adventure_countdown[guild.id]
-                    if sremain > 3:
-                        await self._handle_adventure(reaction, user)
-
-    async def _handle_adventure(self, reaction: discord.Reaction, user: discord.Member):
-        action = {v: k for k, v in self._adventure_controls.items()}[str(reaction.emoji)]
+        session = self._sessions.get(guild.id)
+        if session is not None and reaction.message.id == session.message_id:
+            if guild.id in self._adventure_countdown:
+                (timer, done, sremain) = await _remaining(self._adventure_countdown[guild.id])
+                if sremain > 3:
+                    await self._handle_adventure(reaction, user, action)
+
+    async def _handle_adventure(self, reaction: discord.Reaction, user: discord.Member, action: Action):
         session = self._sessions[user.guild.id]
         has_fund = await has_funds(user, 250)
-        for x in ["fight", "magic", "talk", "pray", "run"]:
-            if user in getattr(session, x, []):
-                getattr(session, x).remove(user)
-
-            if not has_fund or user in getattr(session, x, []):
-                if reaction.message.channel.permissions_for(user.guild.me).manage_messages:
-                    symbol = self._adventure_controls[x]
+        session.leave(user)
+        if not has_fund:
+            if reaction.message.channel.permissions_for(user.guild.me).manage_messages:
+                for symbol in self._adventure_controls.values():
                     await reaction.message.remove_reaction(symbol, user)
+            with contextlib.suppress(discord.HTTPException):
+                await user.send(
+                    _(
+                        "You contemplate going on an adventure with your friends, so "
+                        "you go to your bank to get some money to prepare and they "
+                        "tell you that your bank is empty!\n"
+                        "You run home to look for some spare coins and you can't "
+                        "even find a single one, so you tell your friends that you can't "
+                        "join them as you already have plans... as you are too embarrassed "
+                        "to tell them you are broke!"
+                    )
+                )
+            return
 
         restricted = await self.config.restrict()
-        if user not in getattr(session, action, []):
-            if not has_fund:
-                with contextlib.suppress(discord.HTTPException):
-                    await user.send(
-                        _(
-                            "You contemplate going on an adventure with your friends, so "
-                            "you go to your bank to get some money to prepare and they "
-                            "tell you that your bank is empty!\n"
-                            "You run home to look for some spare coins and you can't "
-                            "even find a single one, so you tell your friends that you can't "
-                            "join them as you already have plans... as you are too embarrassed "
-                            "to tell them you are broke!"
-                        )
-                    )
-                return
-            if restricted:
-                all_users = []
-                for guild_id, guild_session in self._sessions.items():
-                    guild_users_in_game = (
-                        guild_session.fight
-                        + guild_session.magic
-                        + guild_session.talk
-                        + guild_session.pray
-                        + guild_session.run
-                    )
-                    all_users = all_users + guild_users_in_game
-
-                if user in all_users:
-                    user_id = f"{user.id}-{user.guild.id}"
-                    # iterating through reactions here and removing them seems to be expensive
-                    # so they can just keep their react on the adventures they can't join
-                    if user_id not in self._react_messaged:
-                        await reaction.message.channel.send(
-                            _(
-                                "{c}, you are already in an existing adventure. "
-                                "Wait for it to finish before joining another one."
-                            ).format(c=bold(user.display_name))
-                        )
-                        self._react_messaged.append(user_id)
-                else:
-                    getattr(session, action).append(user)
-            else:
-                getattr(session, action).append(user)
+        if restricted and user.id in self._user_sessions:
+            user_id = f"{user.id}-{user.guild.id}"
+            # iterating through reactions here and removing them seems to be expensive
+            # so they can just keep their react on the adventures they can't join
+            if user_id not in self._react_messaged:
+                await reaction.message.channel.send(
+                    _(
+                        "{c}, you are already in an existing adventure. "
+                        "Wait for it to finish before joining another one."
+                    ).format(c=bold(user.display_name))
+                )
+                self._react_messaged[user_id] = True
+        elif session.join(user, action):
+            await session.take_profile(user)
 
     async def get_treasure(
         self,
@@ -1406,9 +1397,6 @@ class Adventure(
             log.debug("Session not found for %s", ctx.guild.id)
             return
         calc_msg = await ctx.send(_("Calculating..."))
-        attack = 0
-        diplomacy = 0
-        magic = 0
         fumblelist: list = []
         critlist: list = []
         failed = False
@@ -1417,17 +1405,12 @@ class Adventure(
             await message.clear_reactions()
         session = self._sessions[ctx.guild.id]
         challenge = session.challenge
-        fight_list = list(set(session.fight))
-        talk_list = list(set(session.talk))
-        pray_list = list(set(session.pray))
-        run_list = list(set(session.run))
-        magic_list = list(set(session.magic))
-
-        self._sessions[ctx.guild.id].fight = fight_list
-        self._sessions[ctx.guild.id].talk = talk_list
-        self._sessions[ctx.guild.id].pray = pray_list
-        self._sessions[ctx.guild.id].run = run_list
-        self._sessions[ctx.guild.id].magic = magic_list
+        fight_list = session.fight
+        talk_list = session.talk
+        pray_list = session.pray
+        run_list = session.run
+        magic_list = session.magic
+        await session.load_profiles(session.actions)
         fight_name_list = []
         wizard_name_list = []
         talk_name_list = []
@@ -1480,7 +1463,7 @@ class Adventure(
             for action_name, action in participants.items():
                 for user in action:
                     try:
-                        c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                        c = await session.get_character(user)
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         continue
@@ -1493,10 +1476,7 @@ class Adventure(
                         c.adventures.update({special_action: current_val + 1})
                         c.weekly_score.update({"adventures": c.weekly_score.get("adventures", 0) + 1})
                         parsed_users.append(user)
-                    await self.config.user(user).set(await c.to_json(ctx, self.config))
-            attack, diplomacy, magic, run_msg = await self.handle_run(
-                ctx.guild.id, attack, diplomacy, magic, shame=True
-            )
+            run_msg = await self.handle_run(ctx.guild.id, shame=True)
             if run_msg:
                 run_msg = _("It's a shame for the following adventurers...\n{run_msg}\n").format(run_msg=run_msg)
 
@@ -1513,25 +1493,52 @@ class Adventure(
             return
 
         people = len(fight_list) + len(magic_list) + len(talk_list) + len(pray_list) + len(run_list)
-        attack, diplomacy, magic, run_msg = await self.handle_run(ctx.guild.id, attack, diplomacy, magic)
-        failed = await self.handle_basilisk(ctx)
-        fumblelist, attack, diplomacy, magic, pray_msg = await self.handle_pray(
-            ctx.guild.id, fumblelist, attack, diplomacy, magic
+        requirements = session.miniboss["requirements"] if session.miniboss else None
+        # rolled with a generator of its own so the result only depends on the seed and what is recorded
+        outcome = engine.resolve(
+            session.combat_stats(),
+            session.party(),
+            session.rng.derive(RESULT_STREAM),
+            insight=session.insight,
+            requirements=requirements,
+            reacted=session.reacted,
         )
-        fumblelist, critlist, diplomacy, talk_msg = await self.handle_talk(
-            ctx.guild.id, fumblelist, critlist, diplomacy
-        )
-        fumblelist, critlist, attack, magic, fight_msg = await self.handle_fight(
-            ctx.guild.id, fumblelist, critlist, attack, magic
+        self._replays.append(
+            ReplayRecord.from_outcome(
+                int(session.rng.internal_seed),
+                ctx.guild.id,
+                challenge,
+                session.monster_stats,
+                session.joins,
+                session.abilities,
+                outcome,
+                insight=session.insight,
+                requirements=requirements,
+                reacted=session.reacted,
+            )
         )
+        run_msg = await self.handle_run(ctx.guild.id)
+        pray_msg = await self.handle_pray(ctx.guild.id, outcome)
+        talk_msg = await self.handle_talk(ctx.guild.id, outcome)
+        fight_msg = await self.handle_fight(ctx.guild.id, outcome)
+        failed = outcome.failed
+        fumblelist = list(outcome.fumbles)
+        critlist = list(outcome.crits)
+        # fumbling fighters, wizards and talkers are taken off their action
+        for user in fumblelist:
+            if session.actions.get(user) is not Action.pray:
+                session.actions.remove(user)
+        fight_list = session.fight
+        talk_list = session.talk
+        magic_list = session.magic
         result_msg = run_msg + pray_msg + talk_msg + fight_msg
-        hp = session.monster_hp()
-        dipl = session.monster_dipl()
+        hp = outcome.monster.hp
+        dipl = outcome.monster.dipl
 
-        dmg_dealt = int(attack + magic)
-        diplomacy = int(diplomacy)
-        slain = dmg_dealt >= int(hp)
-        persuaded = diplomacy >= int(dipl)
+        dmg_dealt = outcome.damage
+        diplomacy = int(outcome.diplomacy)
+        slain = outcome.slain
+        persuaded = outcome.persuaded
         crit_bonus = len(critlist) != 0
         damage_str = ""
         diplo_str = ""
@@ -1554,6 +1561,8 @@ class Adventure(
             self._adv_results.add_result(ctx.guild, "attack", dmg_dealt, people, slain)
         else:
             self._adv_results.add_result(ctx.guild, "talk", diplomacy, people, persuaded)
+        if "results" not in self._scheduler:
+            self._scheduler.schedule("results", RESULTS_SAVE_DELAY, self._save_adventure_results)
         result_msg = result_msg + "\n" + damage_str + diplo_str
 
         await calc_msg.delete()
@@ -1565,9 +1574,10 @@ class Adventure(
         treasure = await self.get_treasure(session, hp, dipl, slain, persuaded, failed, crit_bonus)
         if run_list:
             users = run_list
+            await session.load_characters(users, refresh_balance=True)
             for user in users:
                 try:
-                    c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                    c = await session.get_character(user)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
@@ -1592,9 +1602,10 @@ class Adventure(
             currency_name = await bank.get_currency_name(
                 ctx.guild,
             )
+            await session.load_characters(session.participants, refresh_balance=True)
             for user in session.participants:
                 try:
-                    c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                    c = await session.get_character(user)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
@@ -1616,7 +1627,6 @@ class Adventure(
                             await bank.set_balance(user, 0)
                 c.adventures.update({"loses": c.adventures.get("loses", 0) + 1})
                 c.weekly_score.update({"adventures": c.weekly_score.get("adventures", 0) + 1})
-                await self.config.user(user).set(await c.to_json(ctx, self.config))
             loss_list = []
             result_msg += session.miniboss["defeat"]
             if len(repair_list) > 0:
@@ -1640,9 +1650,10 @@ class Adventure(
             currency_name = await bank.get_currency_name(
                 ctx.guild,
             )
+            await session.load_characters(session.participants, refresh_balance=True)
             for user in session.participants:
                 try:
-                    c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                    c = await session.get_character(user)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
@@ -1682,9 +1693,7 @@ class Adventure(
             result_msg += _("The {miniboss}'s {special} was countered, but they still managed to kill you.").format(
                 miniboss=bold(miniboss), special=special
             )
-        amount = 1 * session.monster_stats
-        amount *= (hp + dipl) if slain and persuaded else hp if slain else dipl
-        amount += int(amount * (0.25 * people))
+        amount = engine.reward_amount(outcome, session.monster_stats, people)
         currency_name = await bank.get_currency_name(ctx.guild)
         if people == 1:
             if slain:
@@ -1696,7 +1705,7 @@ class Adventure(
                     ctx,
                     [u for u in fight_list + magic_list + pray_list if u not in fumblelist],
                     amount,
-                    round(((attack if group == fighters_final_string else magic) / hp) * 0.25),
+                    round(((outcome.attack if group == fighters_final_string else outcome.magic) / hp) * 0.25),
                     treasure,
                 )
 
@@ -1718,9 +1727,10 @@ class Adventure(
                     ctx.guild,
                 )
                 users = set(fight_list + magic_list + talk_list + pray_list + fumblelist)
+                await session.load_characters(users, refresh_balance=True)
                 for user in users:
                     try:
-                        c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                        c = await session.get_character(user)
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         continue
@@ -1890,9 +1900,10 @@ class Adventure(
                     ctx.guild,
                 )
                 users = set(fight_list + magic_list + talk_list + pray_list + fumblelist)
+                await session.load_characters(users, refresh_balance=True)
                 for user in users:
                     try:
-                        c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                        c = await session.get_character(user)
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         continue
@@ -1955,7 +1966,7 @@ class Adventure(
         for action_name, action in participants.items():
             for user in action:
                 try:
-                    c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                    c = await session.get_character(user)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
@@ -1967,13 +1978,12 @@ class Adventure(
                     c.adventures.update({special_action: current_val + 1})
                     c.weekly_score.update({"adventures": c.weekly_score.get("adventures", 0) + 1})
                     parsed_users.append(user)
-                await self.config.user(user).set(await c.to_json(ctx, self.config))
 
-    async def handle_run(self, guild_id, attack, diplomacy, magic, shame=False):
+    async def handle_run(self, guild_id, shame=False) -> str:
         runners = []
         msg = ""
         session = self._sessions[guild_id]
-        if len(list(session.run)) != 0:
+        if session.actions.count(Action.run) != 0:
             for user in session.run:
                 runners.append(f"{bold(user.display_name)}")
             msg += _("{} just ran away.\n").format(humanize_list(runners))
@@ -1981,240 +1991,100 @@ class Adventure(
                 msg += _(
                     "They are now regretting their pathetic display of courage as their friends enjoy all their new loot.\n"
                 )
-        return (attack, diplomacy, magic, msg)
-
-    async def handle_fight(self, guild_id, fumblelist, critlist, attack, magic):
-        session = self._sessions[guild_id]
-        ctx = session.ctx
-        fight_list = list(set(session.fight))
-        magic_list = list(set(session.magic))
-        attack_list = list(set(fight_list + magic_list))
-        pdef = max(session.monster_modified_stats["pdef"], 0.5)
-        mdef = max(session.monster_modified_stats["mdef"], 0.5)
+        return msg
 
+    async def handle_fight(self, guild_id, outcome: Outcome) -> str:
+        attack_list = [*outcome.party.fight, *outcome.party.magic]
         fumble_count = 0
-        # make sure we pass this check first
         failed_emoji = self.emojis.fumble
         if len(attack_list) >= 1:
             msg = ""
             report = _("Attack Party: \n\n")
         else:
-            return (fumblelist, critlist, attack, magic, "")
+            return ""
 
-        for user in fight_list:
-            try:
-                c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
-            except Exception as exc:
-                log.exception("Error with the new character sheet", exc_info=exc)
-                continue
-            crit_mod = max(max(c.dex, c.luck // 2) + (c.total_att // 20), 0)  # Thanks GoaFan77
-            mod = 0
-            max_roll = 100 if c.rebirths >= 30 else 50 if c.rebirths >= 15 else 20
-            if crit_mod != 0:
-                mod = round(crit_mod / 10)
-            if c.rebirths < 15 < mod:
-                mod = 15
-                max_roll = 20
-            elif (mod + 1) > 45:
-                mod = 45
-
-            roll = max(session.rng.randint((1 + mod), max_roll), 1)
-            if c.heroclass.get("pet", {}).get("bonuses", {}).get("crit", False):
-                pet_crit = c.heroclass.get("pet", {}).get("bonuses", {}).get("crit", 0)
-                pet_crit = session.rng.randint(pet_crit, 100)
-                if pet_crit == 100:
-                    roll = max_roll
-                elif roll <= 25 and pet_crit >= 95:
-                    roll = session.rng.randint(max_roll - 5, max_roll)
-                elif roll > 25 and pet_crit >= 95:
-                    roll = session.rng.randint(roll, max_roll)
-            roll_perc = roll / max_roll
-            att_value = c.total_att
-            rebirths = c.rebirths * (3 if c.hc is not HeroClasses.berserker else 1)
-            if roll_perc < 0.10:
-                if c.hc is HeroClasses.berserker and c.heroclass["ability"]:
-                    bonus_roll = session.rng.randint(5, 15)
-                    bonus_multi = session.rng.choice([0.2, 0.3, 0.4, 0.5])
-                    bonus = max(bonus_roll, int((roll + att_value + rebirths) * bonus_multi))
-                    attack += int((roll - bonus + att_value) / pdef)
-                    report += (
-                        f"{bold(user.display_name)}: "
-                        f"{self.emojis.dice}({roll}) + "
-                        f"{self.emojis.berserk}{humanize_number(bonus)} + "
-                        f"{self.emojis.attack}{str(humanize_number(att_value))}\n"
-                    )
-                else:
-                    msg += _("{user} fumbled the attack.\n").format(user=bold(user.display_name))
-                    fumblelist.append(user)
-                    fumble_count += 1
-            elif roll_perc > 0.95 or c.hc is HeroClasses.berserker:
+        for result in outcome.rolls_for(Action.fight):
+            user = result.player
+            if result.kind is RollKind.saved:
+                report += (
+                    f"{bold(user.display_name)}: "
+                    f"{self.emojis.dice}({result.roll}) + "
+                    f"{self.emojis.berserk}{humanize_number(result.bonus)} + "
+                    f"{self.emojis.attack}{str(humanize_number(result.stat))}\n"
+                )
+            elif result.fumble:
+                msg += _("{user} fumbled the attack.\n").format(user=bold(user.display_name))
+                fumble_count += 1
+            elif result.kind is RollKind.boosted:
                 crit_str = ""
-                crit_bonus = 0
-                base_bonus = session.rng.randint(5, 10) + rebirths
-                if roll_perc > 0.95:
+                if result.crit:
                     msg += _("{user} landed a critical hit.\n").format(user=bold(user.display_name))
-                    critlist.append(user)
-                    crit_bonus = (session.rng.randint(5, 20)) + (rebirths * 2)
-                    crit_str = f"{self.emojis.crit} {humanize_number(crit_bonus)}"
-                if c.hc is HeroClasses.berserker and c.heroclass["ability"]:
-                    base_bonus = (session.rng.randint(1, 10) + 5) * (rebirths // 2)
-                base_str = f"{self.emojis.crit}️ {humanize_number(base_bonus)}"
-                attack += int((roll + base_bonus + crit_bonus + att_value) / pdef)
+                    crit_str = f"{self.emojis.crit} {humanize_number(result.crit_bonus)}"
+                base_str = f"{self.emojis.crit}️ {humanize_number(result.bonus)}"
                 bonus = base_str + crit_str
                 report += (
                     f"{bold(user.display_name)}: "
-                    f"{self.emojis.dice}({roll}) + "
+                    f"{self.emojis.dice}({result.roll}) + "
                     f"{self.emojis.berserk}{bonus} + "
-                    f"{self.emojis.attack}{str(humanize_number(att_value))}\n"
+                    f"{self.emojis.attack}{str(humanize_number(result.stat))}\n"
                 )
             else:
-                attack += int((roll + att_value) / pdef) + rebirths
                 report += (
                     f"{bold(user.display_name)}: "
-                    f"{self.emojis.dice}({roll}) + "
-                    f"{self.emojis.attack}{str(humanize_number(att_value))}\n"
+                    f"{self.emojis.dice}({result.roll}) + "
+                    f"{self.emojis.attack}{str(humanize_number(result.stat))}\n"
                 )
-            if session.insight[0] == 1 and user.id != session.insight[1].user.id:
-                attack += int(session.insight[1].total_att * 0.2)
-        for user in magic_list:
-            try:
-                c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
-            except Exception as exc:
-                log.exception("Error with the new character sheet", exc_info=exc)
-                continue
-            crit_mod = max(max(c.dex, c.luck // 2) + (c.total_int // 20), 0)
-            mod = 0
-            max_roll = 100 if c.rebirths >= 30 else 50 if c.rebirths >= 15 else 20
-            if crit_mod != 0:
-                mod = round(crit_mod / 10)
-            if c.rebirths < 15 < mod:
-                mod = 15
-                max_roll = 20
-            elif (mod + 1) > 45:
-                mod = 45
-            roll = max(session.rng.randint((1 + mod), max_roll), 1)
-            if c.heroclass.get("pet", {}).get("bonuses", {}).get("crit", False):
-                pet_crit = c.heroclass.get("pet", {}).get("bonuses", {}).get("crit", 0)
-                pet_crit = session.rng.randint(pet_crit, 100)
-                if pet_crit == 100:
-                    roll = max_roll
-                elif roll <= 25 and pet_crit >= 95:
-                    roll = session.rng.randint(max_roll - 5, max_roll)
-                elif roll > 25 and pet_crit >= 95:
-                    roll = session.rng.randint(roll, max_roll)
-            roll_perc = roll / max_roll
-            int_value = c.total_int
-            rebirths = c.rebirths * (3 if c.hc is HeroClasses.wizard else 1)
-            if roll_perc < 0.10:
+        for result in outcome.rolls_for(Action.magic):
+            user = result.player
+            if result.fumble:
                 msg += _("{}{} almost set themselves on fire.\n").format(failed_emoji, bold(user.display_name))
-                fumblelist.append(user)
                 fumble_count += 1
-                if c.hc is HeroClasses.wizard and c.heroclass["ability"]:
-                    bonus_roll = session.rng.randint(5, 15)
-                    bonus_multi = session.rng.choice([0.2, 0.3, 0.4, 0.5])
-                    bonus = max(bonus_roll, int((roll + int_value + rebirths) * bonus_multi))
-                    magic += int((roll - bonus + int_value) / mdef)
+                if result.kind is RollKind.saved:
                     report += (
                         f"{bold(user.display_name)}: "
-                        f"{self.emojis.dice}({roll}) + "
-                        f"{self.emojis.magic_crit}{humanize_number(bonus)} + "
-                        f"{self.emojis.magic}{str(humanize_number(int_value))}\n"
+                        f"{self.emojis.dice}({result.roll}) + "
+                        f"{self.emojis.magic_crit}{humanize_number(result.bonus)} + "
+                        f"{self.emojis.magic}{str(humanize_number(result.stat))}\n"
                     )
-            elif roll_perc > 0.95 or (c.hc is HeroClasses.wizard):
+            elif result.kind is RollKind.boosted:
                 crit_str = ""
-                crit_bonus = 0
-                base_bonus = session.rng.randint(5, 10) + rebirths
-                base_str = f"{self.emojis.magic_crit}️ {humanize_number(base_bonus)}"
-                if roll_perc > 0.95:
+                if result.crit:
                     msg += _("{} had a surge of energy.\n").format(bold(user.display_name))
-                    critlist.append(user)
-                    crit_bonus = (session.rng.randint(5, 20)) + (rebirths * 2)
-                    crit_str = f"{self.emojis.crit} {humanize_number(crit_bonus)}"
-                if c.hc is HeroClasses.wizard and c.heroclass["ability"]:
-                    base_bonus = (session.rng.randint(1, 10) + 5) * (rebirths // 2)
-                    base_str = f"{self.emojis.magic_crit}️ {humanize_number(base_bonus)}"
-                magic += int((roll + base_bonus + crit_bonus + int_value) / mdef)
+                    crit_str = f"{self.emojis.crit} {humanize_number(result.crit_bonus)}"
+                base_str = f"{self.emojis.magic_crit}️ {humanize_number(result.bonus)}"
                 bonus = base_str + crit_str
                 report += (
                     f"{bold(user.display_name)}: "
-                    f"{self.emojis.dice}({roll}) + "
+                    f"{self.emojis.dice}({result.roll}) + "
                     f"{bonus} + "
-                    f"{self.emojis.magic}{humanize_number(int_value)}\n"
+                    f"{self.emojis.magic}{humanize_number(result.stat)}\n"
                 )
             else:
-                magic += int((roll + int_value) / mdef) + c.rebirths // 5
                 report += (
                     f"{bold(user.display_name)}: "
-                    f"{self.emojis.dice}({roll}) + "
-                    f"{self.emojis.magic}{humanize_number(int_value)}\n"
+                    f"{self.emojis.dice}({result.roll}) + "
+                    f"{self.emojis.magic}{humanize_number(result.stat)}\n"
                 )
-            if session.insight[0] == 1 and user.id != session.insight[1].user.id:
-                attack += int(session.insight[1].total_int * 0.2)
         if fumble_count == len(attack_list):
             report += _("No one!")
         msg += report + "\n"
-        for user in fumblelist:
-            if user in session.fight:
-                if session.insight[0] == 1 and user.id != session.insight[1].user.id:
-                    attack -= int(session.insight[1].total_att * 0.2)
-                session.fight.remove(user)
-            elif user in session.magic:
-                if session.insight[0] == 1 and user.id != session.insight[1].user.id:
-                    attack -= int(session.insight[1].total_int * 0.2)
-                session.magic.remove(user)
-        return (fumblelist, critlist, attack, magic, msg)
-
-    async def handle_pray(self, guild_id, fumblelist, attack, diplomacy, magic):
-        session = self._sessions[guild_id]
-        ctx = session.ctx
-        talk_list = list(set(session.talk))
-        pray_list = list(set(session.pray))
-        fight_list = list(set(session.fight))
-        magic_list = list(set(session.magic))
+        return msg
+
+    async def handle_pray(self, guild_id, outcome: Outcome) -> str:
         god = await self.config.god_name()
         guild_god_name = await self.config.guild(self.bot.get_guild(guild_id)).god_name()
         if guild_god_name:
             god = guild_god_name
         msg = ""
         failed_emoji = self.emojis.fumble
-        for user in pray_list:
-            try:
-                c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
-            except Exception as exc:
-                log.exception("Error with the new character sheet", exc_info=exc)
-                continue
-            rebirths = c.rebirths * (2 if c.hc is HeroClasses.cleric else 1)
-            if c.hc is HeroClasses.cleric:
-                crit_mod = max(max(c.dex, c.luck // 2) + (c.total_int // 20), 0)
-                mod = 0
-                max_roll = 100 if c.rebirths >= 30 else 50 if c.rebirths >= 15 else 20
-                if crit_mod != 0:
-                    mod = round(crit_mod / 10)
-                if c.rebirths < 15 < mod:
-                    mod = 15
-                    max_roll = 20
-                elif (mod + 1) > 45:
-                    mod = 45
-                roll = max(session.rng.randint((1 + mod), max_roll), 1)
-                roll_perc = roll / max_roll
-                if len(fight_list + talk_list + magic_list) == 0:
+        for result in outcome.rolls_for(Action.pray):
+            user = result.player
+            if outcome.party.profiles[user].hc is HeroClasses.cleric:
+                if result.alone:
                     msg += _("{} blessed like a madman but nobody was there to receive it.\n").format(
                         bold(user.display_name)
                     )
-                if roll_perc < 0.15:
-                    pray_att_bonus = 0
-                    pray_diplo_bonus = 0
-                    pray_magic_bonus = 0
-                    if fight_list:
-                        pray_att_bonus = (5 * len(fight_list)) - ((5 * len(fight_list)) * max(rebirths * 0.01, 1.5))
-                    if talk_list:
-                        pray_diplo_bonus = (5 * len(talk_list)) - ((5 * len(talk_list)) * max(rebirths * 0.01, 1.5))
-                    if magic_list:
-                        pray_magic_bonus = (5 * len(magic_list)) - ((5 * len(magic_list)) * max(rebirths * 0.01, 1.5))
-                    attack -= pray_att_bonus
-                    diplomacy -= pray_diplo_bonus
-                    magic -= pray_magic_bonus
-                    fumblelist.append(user)
+                if result.fumble:
                     msg += _(
                         "{user}'s sermon offended the mighty {god}. {failed_emoji}"
                         "({len_f_list}{attack}/{len_t_list}{talk}/{len_m_list}{magic}) {roll_emoji}({roll})\n"
@@ -2225,34 +2095,14 @@ class Adventure(
                         attack=self.emojis.attack,
                         talk=self.emojis.talk,
                         magic=self.emojis.magic,
-                        len_f_list=humanize_number(pray_att_bonus),
-                        len_t_list=humanize_number(pray_diplo_bonus),
-                        len_m_list=humanize_number(pray_magic_bonus),
+                        len_f_list=humanize_number(result.attack),
+                        len_t_list=humanize_number(result.diplomacy),
+                        len_m_list=humanize_number(result.magic),
                         roll_emoji=self.emojis.dice,
-                        roll=roll,
+                        roll=result.roll,
                     )
                 else:
-                    mod = roll // 3 if not c.heroclass["ability"] else roll
-                    pray_att_bonus = 0
-                    pray_diplo_bonus = 0
-                    pray_magic_bonus = 0
-
-                    if fight_list:
-                        pray_att_bonus = int(
-                            (mod * len(fight_list)) + ((mod * len(fight_list)) * max(rebirths * 0.05, 1.5))
-                        )
-                    if talk_list:
-                        pray_diplo_bonus = int(
-                            (mod * len(talk_list)) + ((mod * len(talk_list)) * max(rebirths * 0.05, 1.5))
-                        )
-                    if magic_list:
-                        pray_magic_bonus = int(
-                            (mod * len(magic_list)) + ((mod * len(magic_list)) * max(rebirths * 0.05, 1.5))
-                        )
-                    attack += pray_att_bonus
-                    magic += pray_magic_bonus
-                    diplomacy += pray_diplo_bonus
-                    if roll == 50:
+                    if result.roll == 50:
                         roll_msg = _(
                             "{user} turned into an avatar of mighty {god}. "
                             "(+{len_f_list}{attack}/+{len_t_list}{talk}/+{len_m_list}{magic}) {roll_emoji}({roll})\n"
@@ -2268,182 +2118,87 @@ class Adventure(
                         attack=self.emojis.attack,
                         talk=self.emojis.talk,
                         magic=self.emojis.magic,
-                        len_f_list=humanize_number(pray_att_bonus),
-                        len_t_list=humanize_number(pray_diplo_bonus),
-                        len_m_list=humanize_number(pray_magic_bonus),
+                        len_f_list=humanize_number(result.attack),
+                        len_t_list=humanize_number(result.diplomacy),
+                        len_m_list=humanize_number(result.magic),
                         roll_emoji=self.emojis.dice,
-                        roll=roll,
+                        roll=result.roll,
                     )
+            elif result.alone:
+                msg += _("{} prayed like a madman but nobody else helped them.\n").format(bold(user.display_name))
+            elif result.kind is RollKind.blessed:
+                msg += _(
+                    "{user}'s prayer called upon the mighty {god} to help you. "
+                    "(+{len_f_list}{attack}/+{len_t_list}{talk}/+{len_m_list}{magic}) {roll_emoji}({roll})\n"
+                ).format(
+                    user=bold(user.display_name),
+                    god=god,
+                    attack=self.emojis.attack,
+                    talk=self.emojis.talk,
+                    magic=self.emojis.magic,
+                    len_f_list=humanize_number(result.attack),
+                    len_t_list=humanize_number(result.diplomacy),
+                    len_m_list=humanize_number(result.magic),
+                    roll_emoji=self.emojis.dice,
+                    roll=result.roll,
+                )
             else:
-                roll = session.rng.randint(1, 10)
-                if len(fight_list + talk_list + magic_list) == 0:
-                    msg += _("{} prayed like a madman but nobody else helped them.\n").format(bold(user.display_name))
-
-                elif roll == 5:
-                    attack_buff = 0
-                    talk_buff = 0
-                    magic_buff = 0
-                    if fight_list:
-                        attack_buff = 10 * (len(fight_list) + rebirths // 15)
-                    if talk_list:
-                        talk_buff = 10 * (len(talk_list) + rebirths // 15)
-                    if magic_list:
-                        magic_buff = 10 * (len(magic_list) + rebirths // 15)
-
-                    attack += attack_buff
-                    magic += magic_buff
-                    diplomacy += talk_buff
-                    msg += _(
-                        "{user}'s prayer called upon the mighty {god} to help you. "
-                        "(+{len_f_list}{attack}/+{len_t_list}{talk}/+{len_m_list}{magic}) {roll_emoji}({roll})\n"
-                    ).format(
-                        user=bold(user.display_name),
-                        god=god,
-                        attack=self.emojis.attack,
-                        talk=self.emojis.talk,
-                        magic=self.emojis.magic,
-                        len_f_list=humanize_number(attack_buff),
-                        len_t_list=humanize_number(talk_buff),
-                        len_m_list=humanize_number(magic_buff),
-                        roll_emoji=self.emojis.dice,
-                        roll=roll,
-                    )
-                else:
-                    fumblelist.append(user)
-                    msg += _("{}{}'s prayers went unanswered.\n").format(failed_emoji, bold(user.display_name))
-        for user in fumblelist:
-            if user in pray_list:
-                pray_list.remove(user)
-        return (fumblelist, attack, diplomacy, magic, msg)
+                msg += _("{}{}'s prayers went unanswered.\n").format(failed_emoji, bold(user.display_name))
+        return msg
 
-    async def handle_talk(self, guild_id, fumblelist, critlist, diplomacy):
-        session = self._sessions[guild_id]
-        ctx = session.ctx
-        cdef = max(session.monster_modified_stats["cdef"], 0.5)
-        talk_list = list(set(session.talk))
+    async def handle_talk(self, guild_id, outcome: Outcome) -> str:
+        talk_list = outcome.party.talk
         if len(talk_list) >= 1:
             report = _("Talking Party: \n\n")
             msg = ""
             fumble_count = 0
         else:
-            return (fumblelist, critlist, diplomacy, "")
+            return ""
         failed_emoji = self.emojis.fumble
-        for user in talk_list:
-            try:
-                c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
-            except Exception as exc:
-                log.exception("Error with the new character sheet", exc_info=exc)
-                continue
-            crit_mod = max(max(c.dex, c.luck // 2) + (c.total_int // 50) + (c.total_cha // 20), 0)
-            mod = 0
-            max_roll = 100 if c.rebirths >= 30 else 50 if c.rebirths >= 15 else 20
-            if crit_mod != 0:
-                mod = round(crit_mod / 10)
-            if c.rebirths < 15 < mod:
-                mod = 15
-            elif (mod + 1) > 45:
-                mod = 45
-            roll = max(session.rng.randint((1 + mod), max_roll), 1)
-            dipl_value = c.total_cha
-            rebirths = c.rebirths * (3 if c.hc is HeroClasses.bard else 1)
-            roll_perc = roll / max_roll
-            if roll_perc < 0.10:
-                if c.hc is HeroClasses.bard and c.heroclass["ability"]:
-                    bonus = session.rng.randint(5, 15)
-                    diplomacy += int((roll - bonus + dipl_value + rebirths) / cdef)
-                    report += f"{bold(user.display_name)} " f"🎲({roll}) +💥{bonus} +🗨{humanize_number(dipl_value)} | "
-                else:
-                    msg += _("{}{} accidentally offended the enemy.\n").format(failed_emoji, bold(user.display_name))
-                    fumblelist.append(user)
-                    fumble_count += 1
-            elif roll_perc > 0.95 or c.hc is HeroClasses.bard:
+        for result in outcome.rolls_for(Action.talk):
+            user = result.player
+            if result.kind is RollKind.saved:
+                report += (
+                    f"{bold(user.display_name)} "
+                    f"🎲({result.roll}) +💥{result.bonus} +🗨{humanize_number(result.stat)} | "
+                )
+            elif result.fumble:
+                msg += _("{}{} accidentally offended the enemy.\n").format(failed_emoji, bold(user.display_name))
+                fumble_count += 1
+            elif result.kind is RollKind.boosted:
                 crit_str = ""
-                crit_bonus = 0
-                base_bonus = session.rng.randint(5, 10) + rebirths
-                if roll_perc > 0.95:
+                if result.crit:
                     msg += _("{} made a compelling argument.\n").format(bold(user.display_name))
-                    critlist.append(user)
-                    crit_bonus = (session.rng.randint(5, 20)) + (rebirths * 2)
-                    crit_str = f"{self.emojis.crit} {crit_bonus}"
-
-                if c.hc is HeroClasses.bard and c.heroclass["ability"]:
-                    base_bonus = (session.rng.randint(1, 10) + 5) * (rebirths // 2)
-                base_str = f"🎵 {humanize_number(base_bonus)}"
-                diplomacy += int((roll + base_bonus + crit_bonus + dipl_value) / cdef)
+                    crit_str = f"{self.emojis.crit} {result.crit_bonus}"
+                base_str = f"🎵 {humanize_number(result.bonus)}"
                 bonus = base_str + crit_str
                 report += (
                     f"{bold(user.display_name)} "
-                    f"{self.emojis.dice}({roll}) + "
+                    f"{self.emojis.dice}({result.roll}) + "
                     f"{bonus} + "
-                    f"{self.emojis.talk}{humanize_number(dipl_value)}\n"
+                    f"{self.emojis.talk}{humanize_number(result.stat)}\n"
                 )
             else:
-                diplomacy += int((roll + dipl_value + c.rebirths // 5) / cdef)
                 report += (
                     f"{bold(user.display_name)} "
-                    f"{self.emojis.dice}({roll}) + "
-                    f"{self.emojis.talk}{humanize_number(dipl_value)}\n"
+                    f"{self.emojis.dice}({result.roll}) + "
+                    f"{self.emojis.talk}{humanize_number(result.stat)}\n"
                 )
-            if session.insight[0] == 1 and user.id != session.insight[1].user.id:
-                diplomacy += int(session.insight[1].total_cha * 0.2)
         if fumble_count == len(talk_list):
             report += _("No one!")
         msg = msg + report + "\n"
-        for user in fumblelist:
-            if user in talk_list:
-                if session.insight[0] == 1 and user.id != session.insight[1].user.id:
-                    diplomacy -= int(session.insight[1].total_cha * 0.2)
-                session.talk.remove(user)
-        return (fumblelist, critlist, diplomacy, msg)
-
-    async def handle_basilisk(self, ctx: commands.Context):
-        session = self._sessions[ctx.guild.id]
-        ctx = session.ctx
-        fight_list = list(set(session.fight))
-        talk_list = list(set(session.talk))
-        pray_list = list(set(session.pray))
-        magic_list = list(set(session.magic))
-        participants = list(set(fight_list + talk_list + pray_list + magic_list))
-        if session.miniboss:
-            failed = True
-            req_item, key = session.miniboss["requirements"]
-            if req_item == "members":
-                if len(participants) > int(key):
-                    failed = False
-            elif req_item == "emoji" and session.reacted:
-                failed = False
-            elif req_item == "item":
-                for user in participants:  # check if any fighter has an equipped mirror shield to give them a chance.
-                    try:
-                        c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
-                    except Exception as exc:
-                        log.exception("Error with the new character sheet", exc_info=exc)
-                        continue
-                    if any(x in c.sets for x in ["The Supreme One", "Ainz Ooal Gown"]):
-                        failed = False
-                        break
-                    with contextlib.suppress(KeyError):
-                        current_equipment = c.get_current_equipment()
-                        for item in current_equipment:
-                            item_name = str(item)
-                            if item.rarity is not Rarities.forged and key in item_name.lower():
-                                failed = False
-                                break
-                            if key == "shiny" and str(item) == ".mirror_shield":
-                                # special case for anyone who happens to still have the
-                                # impossible to acquire mirror shield
-                                failed = False
-                                break
-        else:
-            failed = False
-        return failed
+        return msg
 
     async def _add_rewards(
         self, ctx: commands.Context, user: Union[discord.Member, discord.User], exp: int, cp: int, special: Treasure
     ) -> Optional[str]:
         async with self.get_lock(user):
+            # Sheets held by an adventure are written back by the adventure itself.
+            c = self.get_cached_character(user)
+            write_back = c is None
             try:
-                c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                if c is None:
+                    c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -2507,30 +2262,28 @@ class Adventure(
                         special.legendary += 1
             if special:
                 c.treasure += special
-            await self.config.user(user).set(await c.to_json(ctx, self.config))
+            if write_back:
+                await c.save(ctx, self.config)
             return rebirth_text
 
-    async def _adv_countdown(self, ctx: commands.Context, seconds, title) -> asyncio.Task:
+    async def _adv_countdown(self, ctx: commands.Context, seconds, title) -> asyncio.Future:
         await self._data_check(ctx)
+        adv_end = await _get_epoch(int(seconds))
+        message_adv = await ctx.send(f"⏳ [{title}] <t:{int(adv_end)}:R>")
+        self._adventure_countdown[ctx.guild.id] = adv_end
+        done = ctx.bot.loop.create_future()
+
+        async def end_countdown():
+            try:
+                with contextlib.suppress(discord.HTTPException):
+                    await message_adv.delete()
+            finally:
+                if not done.done():
+                    done.set_result(None)
+                log.debug("Timer countdown done.")
 
-        async def adv_countdown():
-            secondint = int(seconds)
-            adv_end = await _get_epoch(secondint)
-            timer, done, sremain = await _remaining(adv_end)
-            timer = f"<t:{int(adv_end)}:R>"
-            message_adv = await ctx.send(f"⏳ [{title}] {timer}")
-            deleted = False
-            while not done:
-                timer, done, sremain = await _remaining(adv_end)
-                self._adventure_countdown[ctx.guild.id] = (timer, done, sremain)
-                if done:
-                    if not deleted:
-                        await message_adv.delete()
-                    break
-                await asyncio.sleep(1)
-            log.debug("Timer countdown done.")
-
-        return ctx.bot.loop.create_task(adv_countdown())
+        self._scheduler.schedule(("countdown", ctx.guild.id), int(seconds), end_countdown)
+        return done
 
     async def _data_check(self, ctx: commands.Context):
         try:
@@ -2548,18 +2301,13 @@ class Adventure(
 
     @commands.Cog.listener()
     async def on_message_without_command(self, message):
+        # this runs for every message so anything outside a cart channel is let go right away
+        if message.guild is None or message.channel.id not in self._cart_channels:
+            return
         await self._ready_event.wait()
         if self.red_340_or_newer:
-            if message.guild is not None:
-                if await self.bot.cog_disabled_in_guild(self, message.guild):
-                    return
-            else:
+            if await self.bot.cog_disabled_in_guild(self, message.guild):
                 return
-        channels = await self.config.guild(message.guild).cart_channels()
-        if not channels:
-            return
-        if message.channel.id not in channels:
-            return
         if not message.author.bot and message.guild.id not in self._sessions:
             roll = random.randint(1, 20)
             if roll == 20:
@@ -2573,9 +2321,10 @@ class Adventure(
                 timeout = await self.config.guild(ctx.guild).cart_timeout()
                 trader = Trader(timeout, ctx, self)
                 await trader.start(ctx)
-                await asyncio.sleep(timeout)
-                trader.stop()
-                await trader.on_timeout()
+                if trader.message is None:
+                    trader.stop()
+                    return
+                self._scheduler.schedule(("cart", trader.message.id), timeout, trader.expire)
 
     async def _roll_chest(self, chest_type: Rarities, c: Character) -> Item:
         # set rarity to chest by default
@@ -2666,12 +2415,15 @@ class Adventure(
             session_bonus = 0 if session.easy_mode else 1
         else:
             session_bonus = 0
+        if session:
+            await session.load_characters(userlist)
+            characters = session.characters
+        else:
+            characters = await Character.from_json_many(ctx, self.config, userlist, self._daily_bonus)
         async for user in AsyncIter(userlist, steps=100):
             self._rewards[user.id] = {}
-            try:
-                c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
-            except Exception as exc:
-                log.exception("Error with the new character sheet", exc_info=exc)
+            c = characters.get(user.id)
+            if c is None:
                 continue
             userxp = int(xp + (xp * 0.5 * c.rebirths) + max((xp * 0.1 * min(250, c._int / 10)), 0))
             usercp = int(cp + max((cp * 0.1 * min(1000, (c._luck + c._att) / 10)), 0))
@@ -2756,12 +2508,18 @@ class Adventure(
         return phrase
 
     def cog_unload(self):
-        if self.cleanup_loop:
-            self.cleanup_loop.cancel()
         if self._init_task:
             self._init_task.cancel()
-        if self.gb_task:
-            self.gb_task.cancel()
+        self._scheduler.stop()
+        # the results are only written once they were read, otherwise they would be lost
+        if self._ready_event.is_set():
+            try:
+                self._write_adventure_results(self._adv_results.to_bytes())
+            except OSError:
+                log.exception("Error saving the adventure results")
+        self._replays.close()
+        if self._theme_task:
+            self._theme_task.cancel()
 
         for msg_id, task in self.tasks.items():
             task.cancel()
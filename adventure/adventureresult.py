@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import logging
+import struct
 from dataclasses import dataclass
-from typing import List, Literal, MutableMapping, TypedDict
+from typing import Iterator, List, Literal, MutableMapping, Optional, TypedDict
 
 import discord
 
@@ -35,12 +36,82 @@ class Raid(TypedDict):
     success: bool
 
 
+class RaidHistory:
+    """The latest raids of a guild along with their totals.
+
+    The raids are kept in a ring buffer and the totals are updated as raids
+    are added and pushed out of it, so they never need to be tallied again.
+    Amounts are whole numbers which keeps the totals exact.
+    """
+
+    # how much % to increase damage for solo raiders so that they
+    # can't just solo every monster based on their own average
+    # damage
+    SOLO_RAID_SCALE: float = 0.25
+
+    __slots__ = ("_raids", "_next", "num_attack", "dmg_amount", "num_talk", "talk_amount", "num_wins")
+
+    def __init__(self, size: int):
+        self._raids: List[Optional[Raid]] = [None] * max(size, 1)
+        # where the next raid goes, which is the oldest raid once the buffer is full
+        self._next = 0
+        self.num_attack = 0
+        self.dmg_amount = 0.0
+        self.num_talk = 0
+        self.talk_amount = 0.0
+        self.num_wins = 0
+
+    def __len__(self) -> int:
+        return self.num_attack + self.num_talk
+
+    def __iter__(self) -> Iterator[Raid]:
+        """Goes through the raids from the oldest to the latest."""
+        for raid in self._raids[self._next :] + self._raids[: self._next]:
+            if raid is not None:
+                yield raid
+
+    def add(self, raid: Raid):
+        oldest = self._raids[self._next]
+        if oldest is not None:
+            self._tally(oldest, -1)
+        self._raids[self._next] = raid
+        self._next = (self._next + 1) % len(self._raids)
+        self._tally(raid, 1)
+
+    def _tally(self, raid: Raid, sign: int):
+        amount = raid["amount"]
+        if raid["num_ppl"] == 1:
+            amount += raid["amount"] * self.SOLO_RAID_SCALE
+        if raid["main_action"] == "attack":
+            self.num_attack += sign
+            self.dmg_amount += sign * amount
+        else:
+            self.num_talk += sign
+            self.talk_amount += sign * amount
+        if raid["success"]:
+            self.num_wins += sign
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 class AdventureResults:
     """Object to store recent adventure results."""
 
+    # magic, version, raids kept per guild and number of guilds
+    _HEADER = struct.Struct("<4sBHI")
+    # guild id and number of raids
+    _GUILD = struct.Struct("<QH")
+    # amount, number of people and the flags below
+    _RAID = struct.Struct("<dHB")
+    _MAGIC = b"ADVR"
+    _VERSION = 1
+    _TALK = 1
+    _SUCCESS = 2
+
     def __init__(self, num_raids: int):
         self._num_raids: int = num_raids
-        self._last_raids: MutableMapping[int, List[Raid]] = {}
+        self._last_raids: MutableMapping[int, RaidHistory] = {}
 
     def add_result(self, guild: discord.Guild, main_action: str, amount: float, num_ppl: int, success: bool):
         """Add result to this object.
@@ -51,18 +122,7 @@ class AdventureResults:
         :num_ppl: Number of people in adventure.
         :success: Whether adventure was successful or not.
         """
-        if guild.id not in self._last_raids:
-            self._last_raids[guild.id] = []
-
-        if len(self._last_raids.get(guild.id, [])) >= self._num_raids:
-            try:
-                self._last_raids[guild.id].pop(0)
-            except IndexError:
-                pass
-
-        self._last_raids[guild.id].append(
-            Raid(main_action=main_action, amount=amount, num_ppl=num_ppl, success=success)
-        )
+        self._history(guild.id).add(Raid(main_action=main_action, amount=amount, num_ppl=num_ppl, success=success))
 
     def get_stat_range(self, guild: discord.Guild) -> StatRange:
         """Return reasonable stat range for monster pool to have based
@@ -70,62 +130,80 @@ class AdventureResults:
 
         :returns: Dict with stat_type, min_stat and max_stat.
         """
-        # how much % to increase damage for solo raiders so that they
-        # can't just solo every monster based on their own average
-        # damage
-        if guild.id not in self._last_raids:
-            self._last_raids[guild.id] = []
-        SOLO_RAID_SCALE: float = 0.25
         min_stat: float = 0.0
         max_stat: float = 0.0
         stat_type: str = "hp"
         win_percent: float = 0.0
-        if len(self._last_raids.get(guild.id, [])) == 0:
+        raids = self._last_raids.get(guild.id)
+        if not raids:
             return StatRange(stat_type=stat_type, min_stat=min_stat, max_stat=max_stat, win_percent=win_percent)
 
-        # tally up stats for raids
-        num_attack = 0
-        dmg_amount = 0
-        num_talk = 0
-        talk_amount = 0
-        num_wins = 0
-        stat_type = "hp"
         avg_amount = 0
-        raids = self._last_raids.get(guild.id, [])
-        raid_count = len(raids)
-        if raid_count == 0:
-            num_wins = self._num_raids // 2
-            raid_count = self._num_raids
-            win_percent = 0.5
-        else:
+        if raids.num_attack > 0:
+            avg_amount = raids.dmg_amount / raids.num_attack
+        if raids.dmg_amount < raids.talk_amount:
+            stat_type = "dipl"
+            avg_amount = raids.talk_amount / raids.num_talk
+        win_percent = raids.num_wins / len(raids)
+        min_stat = avg_amount * 0.75
+        max_stat = avg_amount * 2
+        # want win % to be at least 50%, even when solo
+        # if win % is below 50%, scale back min/max for easier mons
+        if win_percent < 0.5:
+            min_stat = avg_amount * win_percent
+            max_stat = avg_amount * 1.5
+        return StatRange(stat_type=stat_type, min_stat=min_stat, max_stat=max_stat, win_percent=win_percent)
+
+    def to_bytes(self) -> bytes:
+        """Packs the raids of every guild so they can be written to disk."""
+        histories = [(guild_id, list(raids)) for guild_id, raids in self._last_raids.items() if raids]
+        parts = [self._HEADER.pack(self._MAGIC, self._VERSION, self._num_raids, len(histories))]
+        for guild_id, raids in histories:
+            parts.append(self._GUILD.pack(guild_id, len(raids)))
             for raid in raids:
-                if raid["main_action"] == "attack":
-                    num_attack += 1
-                    dmg_amount += raid["amount"]
-                    if raid["num_ppl"] == 1:
-                        dmg_amount += raid["amount"] * SOLO_RAID_SCALE
-                else:
-                    num_talk += 1
-                    talk_amount += raid["amount"]
-                    if raid["num_ppl"] == 1:
-                        talk_amount += raid["amount"] * SOLO_RAID_SCALE
-                log.debug(f"raid dmg: {raid['amount']}")
+                flags = 0 if raid["main_action"] == "attack" else self._TALK
                 if raid["success"]:
-                    num_wins += 1
-            if num_attack > 0:
-                avg_amount = dmg_amount / num_attack
-            if dmg_amount < talk_amount:
-                stat_type = "dipl"
-                avg_amount = talk_amount / num_talk
-            win_percent = num_wins / raid_count
-            min_stat = avg_amount * 0.75
-            max_stat = avg_amount * 2
-            # want win % to be at least 50%, even when solo
-            # if win % is below 50%, scale back min/max for easier mons
-            if win_percent < 0.5:
-                min_stat = avg_amount * win_percent
-                max_stat = avg_amount * 1.5
-        return StatRange(stat_type=stat_type, min_stat=min_stat, max_stat=max_stat, win_percent=win_percent)
+                    flags |= self._SUCCESS
+                parts.append(self._RAID.pack(raid["amount"], min(raid["num_ppl"], 0xFFFF), flags))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, num_raids: int) -> AdventureResults:
+        """Unpacks the raids written by `to_bytes`.
+
+        Guilds keep their latest ``num_raids`` raids if fewer were kept when
+        they were written.
+
+        Raises
+        ------
+        ValueError
+            The data isn't raids written by `to_bytes`.
+        """
+        results = cls(num_raids)
+        try:
+            magic, version, _num_raids, num_guilds = cls._HEADER.unpack_from(data)
+            if magic != cls._MAGIC or version != cls._VERSION:
+                raise ValueError("Not a snapshot of adventure results.")
+            offset = cls._HEADER.size
+            for _ in range(num_guilds):
+                guild_id, num_guild_raids = cls._GUILD.unpack_from(data, offset)
+                offset += cls._GUILD.size
+                raids = results._history(guild_id)
+                for _ in range(num_guild_raids):
+                    amount, num_ppl, flags = cls._RAID.unpack_from(data, offset)
+                    offset += cls._RAID.size
+                    main_action = "talk" if flags & cls._TALK else "attack"
+                    success = bool(flags & cls._SUCCESS)
+                    raids.add(Raid(main_action=main_action, amount=amount, num_ppl=num_ppl, success=success))
+        except struct.error as exc:
+            raise ValueError("The snapshot of adventure results is cut short.") from exc
+        return results
+
+    def _history(self, guild_id: int) -> RaidHistory:
+        raids = self._last_raids.get(guild_id)
+        if raids is None:
+            raids = self._last_raids[guild_id] = RaidHistory(self._num_raids)
+        return raids
 
     def __str__(self):
         return str(self._last_raids)
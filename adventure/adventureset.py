@@ -18,6 +18,7 @@ from .charsheet import Character
 from .constants import Slot
 from .converters import DayConverter, PercentageConverter, parse_timedelta
 from .helpers import has_separated_economy, smart_embed
+from .theme import InvalidTheme
 
 _ = Translator("Adventure", __file__)
 
@@ -130,8 +131,7 @@ class AdventureSetCommands(AdventureMixin):
     @adventureset_locks.command(name="adventure")
     async def adventureset_locks_adventure(self, ctx: commands.Context):
         """[Admin] Reset the adventure game lock for the server."""
-        while ctx.guild.id in self._sessions:
-            del self._sessions[ctx.guild.id]
+        self.remove_session(ctx.guild.id)
         await ctx.tick()
 
     @adventureset.command()
@@ -282,6 +282,23 @@ class AdventureSetCommands(AdventureMixin):
             _("Adventure cooldown set to {cooldown} seconds.").format(cooldown=time_in_seconds),
         )
 
+    @adventureset.command(name="updateinterval")
+    @commands.is_owner()
+    async def update_interval(self, ctx: commands.Context, seconds: float):
+        """[Owner] Changes how often the buttons of an adventure update their counts.
+
+        Clicks made in between are shown together in the next update.
+        Default is 2 seconds.
+        """
+        if not 0 <= seconds <= 30:
+            return await smart_embed(ctx, _("The update interval must be between 0 and 30 seconds."))
+
+        await self.config.update_interval.set(seconds)
+        await smart_embed(
+            ctx,
+            _("Adventure buttons will update at most every {interval} seconds.").format(interval=seconds),
+        )
+
     @adventureset.command()
     async def version(self, ctx: commands.Context):
         """Display the version of adventure being used."""
@@ -357,6 +374,7 @@ class AdventureSetCommands(AdventureMixin):
         """[Owner] Lets you clear multiple users character sheets."""
         for user in users:
             await self.config.user(user).clear()
+            self._leaderboard_index.remove(user.id)
             await smart_embed(ctx, _("{user}'s character sheet has been erased.").format(user=user))
 
     @adventureset.command(name="remove")
@@ -393,7 +411,7 @@ class AdventureSetCommands(AdventureMixin):
                     )
             with contextlib.suppress(KeyError):
                 del c.backpack[item.name]
-            await self.config.user(user).set(await c.to_json(self.config))
+            await c.save(ctx, self.config)
         await ctx.send(_("{item} removed from {user}.").format(item=box(str(item), lang="ansi"), user=bold(user)))
 
     @adventureset.command()
@@ -412,9 +430,9 @@ class AdventureSetCommands(AdventureMixin):
         More info can be found at: <https://github.com/aikaterna/gobcog#make-your-own-adventure-theme>
         """
         if theme == "default":
+            await self.load_theme("default")
             await self.config.theme.set("default")
             await smart_embed(ctx, _("Going back to the default theme."))
-            await self.initialize()
             return
         if theme not in os.listdir(cog_data_path(self)):
             await smart_embed(ctx, _("That theme pack does not exist!"))
@@ -442,10 +460,17 @@ class AdventureSetCommands(AdventureMixin):
                 _("That theme pack is missing the following files: {}.").format(humanize_list(missing_files)),
             )
             return
-        else:
-            await self.config.theme.set(theme)
-            await ctx.tick()
-        await self.initialize()
+        try:
+            await self.load_theme(theme)
+        except InvalidTheme:
+            await smart_embed(ctx, _("That theme pack has files without any data in them."))
+            return
+        except Exception:
+            log.exception("Error loading the %s theme", theme)
+            await smart_embed(ctx, _("That theme pack could not be loaded, check your logs for details."))
+            return
+        await self.config.theme.set(theme)
+        await ctx.tick()
 
     @adventureset.command()
     @commands.admin_or_permissions(administrator=True)
@@ -471,14 +496,16 @@ class AdventureSetCommands(AdventureMixin):
                 msg += "\n".join(chan.name for chan in name_list)
             return await ctx.send(box(msg))
         elif channel.id in channel_list:
-            new_channels = channel_list.remove(channel.id)
+            channel_list.remove(channel.id)
+            self._cart_channels.discard(channel.id)
             await smart_embed(
                 ctx,
                 _("The {} channel has been removed from the cart delivery list.").format(channel),
             )
-            return await self.config.guild(ctx.guild).cart_channels.set(new_channels)
+            return await self.config.guild(ctx.guild).cart_channels.set(channel_list)
         else:
             channel_list.append(channel.id)
+            self._cart_channels.add(channel.id)
             await smart_embed(ctx, _("The {} channel has been added to the cart delivery list.").format(channel))
             await self.config.guild(ctx.guild).cart_channels.set(channel_list)
 
@@ -593,9 +620,12 @@ class AdventureSetCommands(AdventureMixin):
         msg += _("[Multi-adventure restriction]:          {single_adventure_restrict}\n").format(
             single_adventure_restrict=single_adventure_restrict
         )
-        msg += _("[Post-adventure cooldown (hh:mm:ss)]:   {time_after_adventure}\n\n").format(
+        msg += _("[Post-adventure cooldown (hh:mm:ss)]:   {time_after_adventure}\n").format(
             time_after_adventure=time_after_adventure
         )
+        msg += _("[Button update interval]:               {interval} seconds\n\n").format(
+            interval=global_data["update_interval"]
+        )
         msg += _("# Cart Settings\n")
         msg += _("[Cart trader name]:                     {cart_trader_name}\n").format(
             cart_trader_name=cart_trader_name
@@ -46,7 +46,7 @@ class BackpackSellView(discord.ui.View):
     async def final_message(self, msg: str, interaction: discord.Interaction, character: Character):
         character.last_known_currency = await bank.get_balance(self.ctx.author)
         character.last_currency_check = time.time()
-        await self.cog.config.user(self.ctx.author).set(await character.to_json(self.ctx, self.cog.config))
+        await character.save(self.ctx, self.cog.config)
         self.stop()
         pages = [page for page in pagify(msg, delims=["\n"], page_length=1900)]
         await BaseMenu(
@@ -73,7 +73,7 @@ class BackpackSellView(discord.ui.View):
         # sell one of the item
         async with self.cog.get_lock(self.author):
             try:
-                character = await Character.from_json(self.ctx, self.cog.config, self.author, self.cog._daily_bonus)
+                character = await self.cog.get_character(self.ctx, self.author)
             except Exception as exc:
                 self.ctx.command.reset_cooldown(self.ctx)
                 log.exception("Error with the new character sheet", exc_info=exc)
@@ -109,7 +109,7 @@ class BackpackSellView(discord.ui.View):
         self.ctx.command.reset_cooldown(self.ctx)
         async with self.cog.get_lock(self.author):
             try:
-                character = await Character.from_json(self.ctx, self.cog.config, self.author, self.cog._daily_bonus)
+                character = await self.cog.get_character(self.ctx, self.author)
             except Exception as exc:
                 self.ctx.command.reset_cooldown(self.ctx)
                 log.exception("Error with the new character sheet", exc_info=exc)
@@ -154,7 +154,7 @@ class BackpackSellView(discord.ui.View):
         )
         async with self.cog.get_lock(self.author):
             try:
-                character = await Character.from_json(self.ctx, self.cog.config, self.author, self.cog._daily_bonus)
+                character = await self.cog.get_character(self.ctx, self.author)
             except Exception as exc:
                 self.ctx.command.reset_cooldown(self.ctx)
                 log.exception("Error with the new character sheet", exc_info=exc)
@@ -283,7 +283,7 @@ class BackPackCommands(AdventureMixin):
                 equip_msg += f".\n{equip.table(c)}"
 
                 c = await c.equip_item(equip, True, is_dev(ctx.author))  # FIXME:
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
         await ctx.send(box(equip_msg, lang="ansi"))
 
     @_backpack.command(name="eset", cooldown_after_parsing=True)
@@ -322,7 +322,7 @@ class BackPackCommands(AdventureMixin):
                 )
             for piece in pieces:
                 character = await character.equip_item(piece, from_backpack=True)
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
             await smart_embed(
                 ctx,
                 _("I've equipped all pieces of `{set_name}` that you are able to equip.").format(set_name=set_name),
@@ -388,7 +388,7 @@ class BackPackCommands(AdventureMixin):
                         item.owned -= 1
                         if item.owned <= 0:
                             del character.backpack[item.name]
-                        await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                        await character.save(ctx, self.config)
                         return await smart_embed(
                             ctx,
                             _("Your attempt at disassembling `{}` failed and it has been destroyed.").format(item.name),
@@ -398,7 +398,7 @@ class BackPackCommands(AdventureMixin):
                         if item.owned <= 0:
                             del character.backpack[item.name]
                         character.treasure[index] += chests
-                        await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                        await character.save(ctx, self.config)
                         return await smart_embed(
                             ctx,
                             _("Your attempt at disassembling `{}` was successful and you have received {} {}.").format(
@@ -426,7 +426,7 @@ class BackPackCommands(AdventureMixin):
                                 del character.backpack[item.name]
                             character.treasure[index] += chests
                             success += 1
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
             return await smart_embed(
                 ctx,
                 _("You attempted to disassemble multiple items: {succ} were successful and {fail} failed.").format(
@@ -514,7 +514,7 @@ class BackPackCommands(AdventureMixin):
                         await bank.set_balance(ctx.author, e.max_balance)
                 c.last_known_currency = await bank.get_balance(ctx.author)
                 c.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
         msg_list = []
         new_msg = _("{author} sold all their{rarity} items for {price}.\n\n{items}").format(
             author=escape(ctx.author.display_name),
@@ -615,12 +615,12 @@ class BackPackCommands(AdventureMixin):
             return await ctx.send(_("You can't *sell* for less than 0..."), ephemeral=True)
         await ctx.defer()
         try:
-            c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
+            c = await self.get_character(ctx, ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             return
         try:
-            buy_user = await Character.from_json(ctx, self.config, buyer, self._daily_bonus)
+            buy_user = await self.get_character(ctx, buyer)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             return
@@ -719,9 +719,9 @@ class BackPackCommands(AdventureMixin):
                                 else:
                                     item.owned = 1
                                     buy_user.backpack[item.name] = item
-                                await self.config.user(buyer).set(await buy_user.to_json(ctx, self.config))
+                                await buy_user.save(ctx, self.config)
                                 item.owned = newly_owned
-                                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                                await c.save(ctx, self.config)
 
                             await trade_msg.edit(
                                 content=(
@@ -916,7 +916,7 @@ class BackPackCommands(AdventureMixin):
                 _("No items matched your query.").format(),
             )
         else:
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
             return await smart_embed(
                 ctx,
                 _("You attempted to disassemble multiple items: {succ} were successful and {fail} failed.").format(
@@ -986,7 +986,7 @@ class BackPackCommands(AdventureMixin):
                         await bank.set_balance(ctx.author, e.max_balance)
                 character.last_known_currency = await bank.get_balance(ctx.author)
                 character.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                await character.save(ctx, self.config)
             if total_price == 0:
                 return await smart_embed(
                     ctx,
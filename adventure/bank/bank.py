@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import datetime
 from functools import wraps
-from typing import TYPE_CHECKING, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
 import discord
 from redbot.core import Config, bank, commands, errors
@@ -13,6 +13,8 @@ from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import humanize_number
 
+from ..ranking import SortedList
+
 if TYPE_CHECKING:
     from redbot.core.bot import Red
 
@@ -57,6 +59,12 @@ _DEFAULT_MEMBER = {"balance": 0, "next_payday": 0}
 
 _config: Config = None
 _bot: Red = None
+# In-memory ledger of the separate economy accounts, keyed by user ID.
+# Every write to ``_config`` goes through this ledger so it never goes stale.
+_ledger: Dict[int, AdventureAccount] = {}
+# Balances ranked by ``(balance, user_id)``, built the first time a position is requested.
+_ranking: Optional[SortedList[Tuple[int, int]]] = None
+_ranking_keys: Dict[int, Tuple[int, int]] = {}
 
 
 def _init(bot: Red):
@@ -76,6 +84,68 @@ class AdventureAccount:
         self.next_payday = next_payday
 
 
+def _invalidate(user_id: Optional[int] = None) -> None:
+    """Drop cached accounts from the ledger.
+
+    Parameters
+    ----------
+    user_id : Optional[int]
+        The ID of the user whose account to drop.
+        If not supplied every cached account is dropped.
+    """
+    global _ranking
+    if user_id is None:
+        _ledger.clear()
+        _ranking = None
+        _ranking_keys.clear()
+    else:
+        _ledger.pop(user_id, None)
+        _update_ranking(user_id, None)
+
+
+def _update_ranking(user_id: int, balance: Optional[int]) -> None:
+    """Move a user to their new place in the balance ranking.
+
+    Parameters
+    ----------
+    user_id : int
+        The ID of the user whose balance changed.
+    balance : Optional[int]
+        The new balance, or ``None`` to remove the user from the ranking.
+    """
+    if _ranking is None:
+        return
+    old = _ranking_keys.pop(user_id, None)
+    if old is not None:
+        _ranking.remove(old)
+    if balance is not None:
+        _ranking_keys[user_id] = (balance, user_id)
+        _ranking.add(_ranking_keys[user_id])
+
+
+async def _get_ranking() -> SortedList[Tuple[int, int]]:
+    """Get the balance ranking of the separate economy, building it if needed.
+
+    Returns
+    -------
+    SortedList
+        Every account as :code:`(balance, user_id)` in ascending order.
+    """
+    global _ranking
+    if _ranking is None:
+        raw_accounts = await _config.all_users()
+        if _ranking is None:
+            keys = {}
+            for user_id, data in raw_accounts.items():
+                # the ledger is written through so it is never older than what we just read
+                acc = _ledger.get(user_id)
+                keys[user_id] = (acc.balance if acc is not None else data["balance"], user_id)
+            _ranking_keys.clear()
+            _ranking_keys.update(keys)
+            _ranking = SortedList(keys.values())
+    return _ranking
+
+
 def _encoded_current_time() -> int:
     """Get the current UTC time as a timestamp.
 
@@ -171,8 +241,9 @@ async def set_next_payday(member: Union[discord.Member, discord.User], amount: i
     if (cog := _bot.get_cog("Adventure")) is None or not cog._separate_economy:
         return 0
 
-    group = _config.user(member)
-    await group.next_payday.set(amount)
+    acc = await get_account(member)
+    await _config.user(member).next_payday.set(amount)
+    acc.next_payday = amount
     return amount
 
 
@@ -225,8 +296,10 @@ async def set_balance(member: Union[discord.Member, discord.User], amount: int,
     if amount > max_bal:
         currency = await get_currency_name(guild)
         raise errors.BalanceTooHigh(user=member.display_name, max_balance=max_bal, currency_name=currency)
-    group = _config.user(member)
-    await group.balance.set(amount)
+    acc = await get_account(member)
+    await _config.user(member).balance.set(amount)
+    acc.balance = amount
+    _update_ranking(member.id, amount)
     return amount
 
 
@@ -357,6 +430,7 @@ async def wipe_bank(guild: Optional[discord.Guild] = None) -> None:
     if (cog := _bot.get_cog("Adventure")) is None or not cog._separate_economy:
         return await bank.wipe_bank(guild=guild)
     await _config.clear_all_users()
+    _invalidate()
 
 
 async def bank_prune(bot: Red, guild: discord.Guild = None, user_id: int = None) -> None:
@@ -402,7 +476,9 @@ async def bank_prune(bot: Red, guild: discord.Guild = None, user_id: int = None)
             for acc in tmp:
                 if acc not in user_list:
                     del bank_data[acc]
+                    _invalidate(int(acc))
         else:
+            _invalidate(user_id)
             user_id = str(user_id)
             if user_id in bank_data:
                 del bank_data[user_id]
@@ -460,6 +536,12 @@ async def get_leaderboard_position(
     TypeError
         If the bank is currently guild-specific and a `discord.User` object was passed in
     """
+    if not _forced and (cog := _bot.get_cog("Adventure")) is not None and cog._separate_economy:
+        ranking = await _get_ranking()
+        key = _ranking_keys.get(member.id)
+        if key is None:
+            return None
+        return len(ranking) - ranking.bisect_left(key)
     if await is_global():
         guild = None
     else:
@@ -493,12 +575,15 @@ async def get_account(
     if _forced or (cog := _bot.get_cog("Adventure")) is None or not cog._separate_economy:
         return await bank.get_account(member)
 
-    all_accounts = await _config.all_users()
-    if member.id not in all_accounts:
+    if (acc := _ledger.get(member.id)) is not None:
+        return acc
+    group = _config.user(member)
+    balance = await group.balance(default=None)
+    if balance is None:
         acc_data = {"balance": 250, "next_payday": 0}
     else:
-        acc_data = all_accounts[member.id]
-    return AdventureAccount(**acc_data)
+        acc_data = {"balance": balance, "next_payday": await group.next_payday()}
+    return _ledger.setdefault(member.id, AdventureAccount(**acc_data))
 
 
 async def is_global(_forced: bool = False) -> bool:
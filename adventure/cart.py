@@ -13,7 +13,7 @@ from redbot.core.i18n import Translator
 from redbot.core.utils.chat_formatting import box, humanize_number, pagify
 
 from .bank import bank
-from .charsheet import Character, Item
+from .charsheet import Item
 from .constants import ANSIBackgroundColours, ANSIBackgroundTextColours, ANSITextColours, Rarities
 from .helpers import escape, is_dev, smart_embed
 
@@ -74,7 +74,7 @@ class TraderModal(discord.ui.Modal):
             await bank.withdraw_credits(spender, price)
             async with self.cog.get_lock(spender):
                 try:
-                    c = await Character.from_json(self.ctx, self.cog.config, spender, self.cog._daily_bonus)
+                    c = await self.cog.get_character(self.ctx, spender)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     return
@@ -87,7 +87,7 @@ class TraderModal(discord.ui.Modal):
                 item = self.item
                 item.owned = number
                 await c.add_to_backpack(item, number=number)
-                await self.cog.config.user(spender).set(await c.to_json(self.ctx, self.cog.config))
+                await c.save(self.ctx, self.cog.config)
                 await interaction.response.send_message(
                     box(
                         _(
@@ -170,6 +170,11 @@ class Trader(discord.ui.View):
             new_content = _("{cart_name} left {time}.").format(time=timestamp, cart_name=self.cart_name)
             await self.message.edit(content=new_content, view=None)
 
+    async def expire(self):
+        """Sends the trader away, called by the cog's scheduler once the cart times out."""
+        self.stop()
+        await self.on_timeout()
+
     async def edit_timestamp(self):
         if self.timeout is None:
             return
@@ -94,7 +94,7 @@ class CharacterCommands(AdventureMixin):
                     c.skill["att"] = 0
                     c.skill["cha"] = 0
                     c.skill["int"] = 0
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     await self.config.user(ctx.author).last_skill_reset.set(int(time.time()))
                     await bank.withdraw_credits(ctx.author, offering)
                     await smart_embed(
@@ -164,7 +164,7 @@ class CharacterCommands(AdventureMixin):
                     c.skill["pool"] -= amount
                     c.skill["int"] += amount
                     spend = "intelligence"
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
                 await smart_embed(
                     ctx,
                     _("{author}, you permanently raised your {spend} value by {amount}.").format(
@@ -253,9 +253,7 @@ class CharacterCommands(AdventureMixin):
             msg_list.append(box(stats_msg, lang="ini"))
 
         dummy_items = []
-        for name, data in self.TR_GEAR_SET.items():
-            if data["set"] != title_cased_set_name:
-                continue
+        for name, data in self.GEAR_SETS.pieces.get(title_cased_set_name, {}).items():
             dummy_items.append(Item.from_json(ctx, {name: data}))
 
         loadout_display = await c.make_backpack_tables(
@@ -387,7 +385,7 @@ class CharacterCommands(AdventureMixin):
                         break
             if msg:
                 await ctx.send(box(msg, lang="ansi"))
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
             else:
                 await smart_embed(
                     ctx,
@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import asyncio
 import logging
 import random
 import time
-from copy import copy
+from copy import deepcopy
 from datetime import date, datetime
-from typing import Any, Dict, List, MutableMapping, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Set, Tuple, Union
 
 import discord
 from beautifultable import ALIGN_CENTER, BeautifulTable
@@ -16,8 +17,9 @@ from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import box, escape, humanize_list, humanize_number, pagify
 
+from . import progression
 from .bank import bank
-from .constants import DEV_LIST, REBIRTH_LVL, REBIRTH_STEP, ANSITextColours, HeroClasses, Rarities, Slot, Treasure
+from .constants import DEV_LIST, ANSITextColours, HeroClasses, Rarities, Slot, Treasure
 
 log = logging.getLogger("red.cogs.adventure")
 
@@ -25,6 +27,34 @@ _ = Translator("Adventure", __file__)
 
 COLUMN_WIDTHS = [5, 5, 5, 5, 6]
 
+# Every partial write is its own call to the config driver (and a full file write on the JSON driver)
+# so past this many changed keys they are all applied in a single write instead.
+MAX_PARTIAL_WRITES = 5
+# The parts of a sheet that are flat dicts changed in place, copying the dict is enough to keep what they held.
+# Loadouts are only ever added or replaced whole, never changed in place.
+_SHALLOW_KEYS = ("adventures", "nega", "weekly_score", "skill", "loadouts")
+
+
+def _snapshot(data: dict) -> dict:
+    """Returns what `Character.save` compares a sheet against to find the parts that changed.
+
+    Only what the sheet changes in place is copied. Items and backpack
+    entries are built fresh every time the sheet is turned into json, so
+    they are kept as they are rather than copied.
+    """
+    snapshot = {k: v for k, v in data.items() if k not in ("items", "backpack")}
+    for key in _SHALLOW_KEYS:
+        if isinstance(snapshot.get(key), dict):
+            snapshot[key] = dict(snapshot[key])
+    if isinstance(snapshot.get("treasure"), list):
+        snapshot["treasure"] = list(snapshot["treasure"])
+    if "heroclass" in snapshot:
+        # small, but the pet in it is a nested dict
+        snapshot["heroclass"] = deepcopy(snapshot["heroclass"])
+    snapshot["items"] = {k: v for k, v in data.get("items", {}).items() if k != "backpack"}
+    snapshot["backpack"] = dict(data.get("backpack", {}))
+    return snapshot
+
 
 class BackpackTable:
     def __init__(self, table: str, items: List[Item]):
@@ -364,6 +394,90 @@ class Item:
         return data
 
 
+class Backpack(MutableMapping[str, Item]):
+    """A character's backpack.
+
+    Entries are kept as the raw data loaded from config and are only turned
+    into :class:`Item` objects when they're accessed, so loading a character
+    doesn't depend on the size of their backpack. Entries that were never
+    accessed are saved back exactly as they were loaded.
+
+    The number of set pieces is counted once for the raw entries and then
+    kept up to date as entries are built, added and removed.
+    """
+
+    def __init__(self, ctx: commands.Context, items: Optional[Mapping[str, Union[Item, dict]]] = None):
+        self._ctx = ctx
+        self._items: Dict[str, Union[Item, dict]] = {}
+        self._set_items: Dict[str, Item] = {}
+        self._raw_set_pieces: Optional[int] = None
+        for name, value in (items or {}).items():
+            self._items[name] = value
+            if isinstance(value, Item) and value.rarity is Rarities.set:
+                self._set_items[name] = value
+
+    def __getitem__(self, name: str) -> Item:
+        value = self._items[name]
+        if not isinstance(value, Item):
+            item = Item.from_json(self._ctx, {name: value})
+            self._forget(name)
+            self._track(name, item)
+            value = item
+        return value
+
+    def __setitem__(self, name: str, item: Item) -> None:
+        if name in self._items:
+            self._forget(name)
+        self._track(name, item)
+
+    def __delitem__(self, name: str) -> None:
+        self._forget(name)
+        del self._items[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._items
+
+    def _track(self, name: str, item: Item) -> None:
+        self._items[name] = item
+        if item.rarity is Rarities.set:
+            self._set_items[name] = item
+
+    def _forget(self, name: str) -> None:
+        """Stop counting the set pieces of an entry that is about to be replaced or removed."""
+        value = self._items[name]
+        if isinstance(value, Item):
+            self._set_items.pop(name, None)
+        elif self._raw_set_pieces is not None and value.get("rarity") == "set":
+            self._raw_set_pieces -= value.get("owned", 1)
+
+    @property
+    def set_pieces(self) -> int:
+        """The number of set pieces in the backpack."""
+        if self._raw_set_pieces is None:
+            self._raw_set_pieces = sum(
+                value.get("owned", 1)
+                for value in self._items.values()
+                if not isinstance(value, Item) and value.get("rarity") == "set"
+            )
+        # built items are counted live since their owned count is changed in place
+        return self._raw_set_pieces + sum(item.owned for item in self._set_items.values())
+
+    def to_json(self) -> Dict[str, dict]:
+        backpack = {}
+        for name, value in self._items.items():
+            if isinstance(value, Item):
+                backpack.update(value.to_json())
+            else:
+                backpack[name] = value
+        return backpack
+
+
 class Character:
     """An class to represent the characters stats."""
 
@@ -383,12 +497,13 @@ class Character:
         self.right: Item = kwargs.pop("right")
         self.ring: Item = kwargs.pop("ring")
         self.charm: Item = kwargs.pop("charm")
-        self.backpack: dict = kwargs.pop("backpack")
+        self.backpack: Backpack = kwargs.pop("backpack")
         self.loadouts: dict = kwargs.pop("loadouts")
         self.heroclass: dict = kwargs.pop("heroclass")
         self.skill: dict = kwargs.pop("skill")
         self.bal: int = kwargs.pop("bal")
         self.user: discord.Member = kwargs.pop("user")
+        self._saved: Optional[dict] = kwargs.pop("saved_data", None)
         self.sets = []
         self.rebirths = kwargs.pop("rebirths", 0)
         self.last_known_currency = kwargs.get("last_known_currency")
@@ -397,7 +512,6 @@ class Character:
         self.get_set_bonus()
         self.maxlevel = self.get_max_level()
         self.lvl = self.lvl if self.lvl < self.maxlevel else self.maxlevel
-        self.set_items = self.get_set_item_count()
         self.att, self._att = self.get_stat_value("att")
         self.cha, self._cha = self.get_stat_value("cha")
         self.int, self._int = self.get_stat_value("int")
@@ -492,24 +606,7 @@ class Character:
 
     def get_stat_value(self, stat: str):
         """Calculates the stats dynamically for each slot of equipment."""
-        extrapoints = 0
-        rebirths = copy(self.rebirths)
-        extrapoints += rebirths // 10 * 5
-
-        for _loop_counter in range(rebirths):
-            if rebirths >= 30:
-                extrapoints += 3
-            elif rebirths >= 20:
-                extrapoints += 5
-            elif rebirths >= 10:
-                extrapoints += 1
-            elif rebirths < 10:
-                extrapoints += 2
-            rebirths -= 1
-
-        extrapoints = int(extrapoints)
-
-        stats = 0 + extrapoints
+        stats = progression.stat_points(self.rebirths)
         for slot in Slot:
             if slot is Slot.two_handed:
                 continue
@@ -549,13 +646,10 @@ class Character:
                 set_names[item.set] = (parts, count + 1)
         if return_items:
             return returnable_items
-        for set_name in self._ctx.bot.get_cog("Adventure").SET_BONUSES:
+        for set_name, max_parts in self._ctx.bot.get_cog("Adventure").GEAR_SETS.max_parts.items():
             if set_name in set_names:
                 continue
-            set_names[set_name] = (
-                max(bonus["parts"] for bonus in self._ctx.bot.get_cog("Adventure").SET_BONUSES[set_name]),
-                0,
-            )
+            set_names[set_name] = (max_parts, 0)
         return set_names
 
     def get_set_bonus(self):
@@ -583,32 +677,18 @@ class Character:
                 continue
             if item.set and item.set not in set_names:
                 added.append(item.name)
-                set_names.update(
-                    {item.set: (item.parts, 1, self._ctx.bot.get_cog("Adventure").SET_BONUSES.get(item.set, []))}
-                )
+                set_names.update({item.set: (item.parts, 1)})
             elif item.set and item.set in set_names:
                 added.append(item.name)
-                parts, count, bonus = set_names[item.set]
-                set_names[item.set] = (parts, count + 1, bonus)
+                parts, count = set_names[item.set]
+                set_names[item.set] = (parts, count + 1)
         full_sets = [(s, v[1]) for s, v in set_names.items() if v[1] >= v[0]]
         partial_sets = [(s, v[1]) for s, v in set_names.items()]
         self.sets = [s for s, _ in full_sets if s]
+        gear_sets = self._ctx.bot.get_cog("Adventure").GEAR_SETS
         for _set, parts in partial_sets:
-            set_bonuses = self._ctx.bot.get_cog("Adventure").SET_BONUSES.get(_set, [])
-            for bonus in set_bonuses:
-                required_parts = bonus.get("parts", 100)
-                if required_parts > parts:
-                    continue
-                for key, value in bonus.items():
-                    if key == "parts":
-                        continue
-                    if key not in ["cpmult", "xpmult", "statmult"]:
-                        base[key] += value
-                    elif key in ["cpmult", "xpmult", "statmult"]:
-                        if value > 1:
-                            base[key] += value - 1
-                        elif value >= 0:
-                            base[key] -= 1 - value
+            for key, value in gear_sets.get_bonus(_set, parts).items():
+                base[key] += value
         self.gear_set_bonus = base
         self.gear_set_bonus["cpmult"] = max(0, self.gear_set_bonus["cpmult"])
         self.gear_set_bonus["xpmult"] = max(0, self.gear_set_bonus["xpmult"])
@@ -759,22 +839,7 @@ class Character:
         return form_string + "\n"
 
     def get_max_level(self) -> int:
-        rebirths = max(self.rebirths, 0)
-
-        if rebirths == 0:
-            maxlevel = 5
-        else:
-            maxlevel = REBIRTH_LVL
-
-        for _loop_counter in range(rebirths):
-            if rebirths >= 20:
-                maxlevel += REBIRTH_STEP
-            elif rebirths > 10:
-                maxlevel += 10
-            elif rebirths <= 10:
-                maxlevel += 5
-            rebirths -= 1
-        return min(maxlevel, 10000)
+        return progression.max_level(self.rebirths)
 
     @staticmethod
     def get_slot_index(slot: Slot):
@@ -1297,12 +1362,12 @@ class Character:
         if is_dev:
             return "N/A"
         else:
-            return humanize_number((50 + (self.rebirths * 5)))
+            return humanize_number(progression.backpack_slots(self.rebirths))
 
     def is_backpack_full(self, is_dev: bool = False):
         if is_dev:
             return False
-        return len(self.backpack) > (50 + (self.rebirths * 5))
+        return len(self.backpack) > progression.backpack_slots(self.rebirths)
 
     async def add_to_backpack(self, item: Item, number: int = 1):
         if item:
@@ -1391,6 +1456,8 @@ class Character:
     ):
         """Return a Character object from config and user."""
         data = await config.user(user).all()
+        # What is stored so that save() can tell which parts of the sheet changed
+        saved_data = _snapshot(data)
         try:
             balance = await bank.get_balance(user)
         except Exception:
@@ -1416,12 +1483,12 @@ class Character:
             heroclass = data["heroclass"]
         if "backpack" not in data:
             # helps move old data to new format
-            backpack = {}
+            backpack = Backpack(ctx)
             for n, i in data["items"]["backpack"].items():
                 item = Item.from_json(ctx, {n: i})
                 backpack[item.name] = item
         else:
-            backpack = {n: Item.from_json(ctx, {n: i}) for n, i in data["backpack"].items()}
+            backpack = Backpack(ctx, data["backpack"])
         while len(data["treasure"]) < 5:
             data["treasure"].append(0)
 
@@ -1488,7 +1555,35 @@ class Character:
         hero_data["last_skill_reset"] = data.get("last_skill_reset", 0)
         hero_data["last_known_currency"] = data.get("last_known_currency", 0)
         hero_data["last_currency_check"] = data.get("last_currency_check", 0)
-        return cls(**hero_data, ctx=ctx, daily_bonus_mapping=daily_bonus_mapping)
+        return cls(**hero_data, ctx=ctx, daily_bonus_mapping=daily_bonus_mapping, saved_data=saved_data)
+
+    @classmethod
+    async def from_json_many(
+        cls,
+        ctx: commands.Context,
+        config: Config,
+        users: Iterable[Union[discord.Member, discord.User]],
+        daily_bonus_mapping: Dict[str, float],
+    ) -> Dict[int, Character]:
+        """Return the Character objects of several users keyed by user ID.
+
+        The sheets and balances are all loaded at the same time instead of one
+        user after the other. Users whose sheet fails to load are logged and left out.
+        """
+        users = list({user.id: user for user in users}.values())
+        results = await asyncio.gather(
+            *(cls.from_json(ctx, config, user, daily_bonus_mapping) for user in users), return_exceptions=True
+        )
+        characters = {}
+        for user, result in zip(users, results):
+            if isinstance(result, Exception):
+                log.exception("Error with the new character sheet", exc_info=result)
+                continue
+            if isinstance(result, BaseException):
+                # a cancellation isn't a broken sheet, it's passed on
+                raise result
+            characters[user.id] = result
+        return characters
 
     def get_set_item_count(self):
         count_set = 0
@@ -1504,17 +1599,15 @@ class Character:
                 continue
             if item.rarity in [Rarities.set]:
                 count_set += 1
-        for k, v in self.backpack.items():
-            for n, i in v.to_json().items():
-                if i.get("rarity", False) in ["set"]:
-                    count_set += v.owned
+        count_set += self.backpack.set_pieces
         return count_set
 
+    @property
+    def set_items(self) -> int:
+        return self.get_set_item_count()
+
     async def to_json(self, ctx: commands.Context, config: Config) -> dict:
-        backpack = {}
-        for k, v in self.backpack.items():
-            for n, i in v.to_json().items():
-                backpack[n] = i
+        backpack = self.backpack.to_json()
 
         if self.hc is HeroClasses.ranger and self.heroclass.get("pet"):
             theme = await config.theme()
@@ -1523,7 +1616,7 @@ class Character:
             pet_list = {**ctx.bot.get_cog("Adventure").PETS, **extra_pets}
             self.heroclass["pet"] = pet_list.get(self.heroclass["pet"]["name"], self.heroclass["pet"])
 
-        return {
+        data = {
             "adventures": self.adventures,
             "nega": self.nega,
             "weekly_score": self.weekly_score,
@@ -1555,6 +1648,57 @@ class Character:
             "last_skill_reset": self.last_skill_reset,
             "last_known_currency": self.last_known_currency,
         }
+        self._update_leaderboards(data)
+        return data
+
+    async def save(self, ctx: commands.Context, config: Config) -> None:
+        """Save the character sheet, only writing the parts that changed since it was loaded.
+
+        Past a few changed parts they are all applied to what is stored in a
+        single write. Either way the rest of what is stored is left alone, so
+        nothing saved for the user since this sheet was loaded is undone.
+        """
+        data = await self.to_json(ctx, config)
+        group = config.user(self.user)
+        changes = self._get_changes(data) if self._saved is not None else None
+        if changes is None:
+            await group.set(data)
+        elif len(changes) > MAX_PARTIAL_WRITES:
+            async with group.all() as current:
+                for path, value in changes:
+                    *parents, key = path
+                    target = current
+                    for parent in parents:
+                        target = target.setdefault(parent, {})
+                    if value is None:
+                        target.pop(key, None)
+                    else:
+                        target[key] = value
+        else:
+            for path, value in changes:
+                if value is None:
+                    await group.clear_raw(*path)
+                else:
+                    await group.set_raw(*path, value=value)
+        self._saved = _snapshot(data)
+
+    def _get_changes(self, data: dict) -> List[Tuple[Tuple[str, ...], Any]]:
+        """Return the config paths whose value differs from what was last saved.
+
+        A value of ``None`` means the path should be cleared.
+        """
+        changes = []
+        for key, value in data.items():
+            if key == "items":
+                saved_items = self._saved["items"]
+                changes.extend(((key, slot), item) for slot, item in value.items() if saved_items.get(slot) != item)
+            elif key == "backpack":
+                saved_backpack = self._saved["backpack"]
+                changes.extend(((key, name), item) for name, item in value.items() if saved_backpack.get(name) != item)
+                changes.extend(((key, name), None) for name in saved_backpack.keys() - value.keys())
+            elif self._saved.get(key) != value:
+                changes.append(((key,), value))
+        return changes
 
     async def rebirth(self, dev_val: int = None) -> dict:
         if dev_val is None:
@@ -1614,7 +1758,7 @@ class Character:
 
         self.weekly_score.update({"rebirths": self.weekly_score.get("rebirths", 0) + 1})
         self.heroclass["cooldown"] = time.time() + 60  # Set skill cooldown to 60s from rebirth
-        return {
+        data = {
             "adventures": self.adventures,
             "nega": self.nega,
             "weekly_score": self.weekly_score,
@@ -1646,6 +1790,14 @@ class Character:
             "last_known_currency": 0,
             "last_currency_check": 0,
         }
+        self._update_leaderboards(data)
+        return data
+
+    def _update_leaderboards(self, data: dict) -> None:
+        # Every save goes through to_json or rebirth so this keeps the leaderboards current
+        cog = self._ctx.bot.get_cog("Adventure")
+        if cog is not None:
+            cog._leaderboard_index.update(self.user.id, data)
 
     def keep_equipped(self):
         items_to_keep = {}
@@ -1668,16 +1820,7 @@ class Character:
 
 
 async def calculate_sp(lvl_end: int, c: Character):
-    points_300 = lvl_end - 300 if lvl_end >= 300 else 0
-    points_200 = (lvl_end - 200) - points_300 if lvl_end >= 200 else 0
-    points_100 = (lvl_end - 100) - points_300 - points_200 if lvl_end >= 100 else 0
-    points_0 = lvl_end - points_100 - points_300 - points_200
-    if 200 <= lvl_end < 300:
-        points_200 += 1
-        points_0 -= 1
-    points = (c.rebirths * 10) + (points_300 * 1) + (points_200 * 5) + (points_100 * 1) + (points_0 * 0.5)
-
-    return int(points)
+    return progression.skill_points(lvl_end, c.rebirths)
 
 
 def has_funds_check(cost):
@@ -16,6 +16,7 @@ from redbot.core.utils.predicates import MessagePredicate
 from .abc import AdventureMixin
 from .bank import bank
 from .charsheet import Character, Item
+from .combat import CombatProfile
 from .constants import HeroClasses, Rarities, Slot
 from .converters import HeroClassConverter, ItemConverter
 from .helpers import ConfirmView, escape, is_dev, smart_embed
@@ -176,7 +177,7 @@ class ClassAbilities(AdventureMixin):
                             for item in tinker_wep:
                                 del c.backpack[item.name]
                             if current_class is HeroClasses.tinkerer:
-                                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                                await c.save(ctx, self.config)
                                 if tinker_wep:
                                     await class_msg.edit(
                                         content=box(
@@ -193,7 +194,7 @@ class ClassAbilities(AdventureMixin):
                                 c.heroclass["pet"] = {}
                                 c.heroclass = clz.to_json()
 
-                                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                                await c.save(ctx, self.config)
                                 await self._clear_react(class_msg)
                                 await class_msg.edit(
                                     content=box(
@@ -236,7 +237,7 @@ class ClassAbilities(AdventureMixin):
                         c.heroclass["cooldown"] = max(900, (3600 - max((c.luck + c.total_int) * 2, 0))) + time.time()
                     elif c.hc is HeroClasses.psychic:
                         c.heroclass["cooldown"] = max(300, (900 - max((c.luck - c.total_cha) * 2, 0))) + time.time()
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     await self._clear_react(class_msg)
                     await class_msg.edit(content=box(now_class_msg, lang="ansi"), view=None)
                     try:
@@ -387,7 +388,7 @@ class ClassAbilities(AdventureMixin):
                             await user_msg.edit(content=f"{pet_msg}\n{pet_msg2}\n{pet_msg3}")
                             c.heroclass["pet"] = pet_list[pet]
                             c.heroclass["catch_cooldown"] = time.time() + cooldown_time
-                            await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                            await c.save(ctx, self.config)
                         elif roll == 1:
                             bonus = _("But they stepped on a twig and scared it away.")
                             pet_msg3 = box(
@@ -439,7 +440,7 @@ class ClassAbilities(AdventureMixin):
             if c.heroclass["cooldown"] <= time.time():
                 await self._open_chest(ctx, ctx.author, Rarities.pet, character=c)
                 c.heroclass["cooldown"] = time.time() + cooldown_time
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
             else:
                 cooldown_time = int(c.heroclass["cooldown"])
                 return await smart_embed(
@@ -465,7 +466,7 @@ class ClassAbilities(AdventureMixin):
                 )
             if c.heroclass["pet"]:
                 c.heroclass["pet"] = {}
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
                 return await smart_embed(
                     ctx,
                     _("{user} released their pet into the wild..").format(user=bold(ctx.author.display_name)),
@@ -481,7 +482,7 @@ class ClassAbilities(AdventureMixin):
         """
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx, ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -503,7 +504,8 @@ class ClassAbilities(AdventureMixin):
                 if c.heroclass["cooldown"] <= time.time():
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    self.record_ability(c)
+                    await c.save(ctx, self.config)
 
                     await smart_embed(
                         ctx,
@@ -530,7 +532,7 @@ class ClassAbilities(AdventureMixin):
         This allows a Psychic to expose the current enemy's weakeness to the party.
         """
         try:
-            c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
+            c = await self.get_character(ctx, ctx.author)
         except Exception:
             log.exception("Error with the new character sheet")
             ctx.command.reset_cooldown(ctx)
@@ -563,15 +565,16 @@ class ClassAbilities(AdventureMixin):
                 max_roll = 100 if c.rebirths >= 30 else 50 if c.rebirths >= 15 else 20
                 roll = random.randint(min(c.rebirths - 25 // 2, (max_roll // 2)), max_roll) / max_roll
                 if ctx.guild.id in self._sessions and self._sessions[ctx.guild.id].insight[0] < roll:
-                    self._sessions[ctx.guild.id].insight = roll, c
+                    self._sessions[ctx.guild.id].insight = roll, CombatProfile.from_character(c)
                     good = True
                 else:
                     good = False
                     await smart_embed(ctx, _("Another hero has already done a better job than you."))
                 c.heroclass["ability"] = True
                 c.heroclass["cooldown"] = time.time() + cooldown_time
+                self.record_ability(c, roll)
                 async with self.get_lock(c.user):
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     if good:
                         await smart_embed(
                             ctx,
@@ -727,7 +730,7 @@ class ClassAbilities(AdventureMixin):
         """
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx, ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -749,7 +752,8 @@ class ClassAbilities(AdventureMixin):
                 if c.heroclass["cooldown"] <= time.time():
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    self.record_ability(c)
+                    await c.save(ctx, self.config)
                     await smart_embed(
                         ctx,
                         _("{skill} {c} is starting to froth at the mouth... {skill}").format(
@@ -776,7 +780,7 @@ class ClassAbilities(AdventureMixin):
         """
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx, ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -798,8 +802,9 @@ class ClassAbilities(AdventureMixin):
                 if c.heroclass["cooldown"] <= time.time():
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
+                    self.record_ability(c)
 
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     await smart_embed(
                         ctx,
                         _("{skill} {c} is focusing all of their energy... {skill}").format(
@@ -825,7 +830,7 @@ class ClassAbilities(AdventureMixin):
         """
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx, ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -847,7 +852,8 @@ class ClassAbilities(AdventureMixin):
                 if c.heroclass["cooldown"] <= time.time():
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    self.record_ability(c)
+                    await c.save(ctx, self.config)
                     await smart_embed(
                         ctx,
                         _("{skill} {c} is whipping up a performance... {skill}").format(
@@ -951,7 +957,7 @@ class ClassAbilities(AdventureMixin):
                     c.backpack[x.name].owned -= 1
                     if c.backpack[x.name].owned <= 0:
                         del c.backpack[x.name]
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                 # save so the items are eaten up already
                 for item in c.get_current_equipment():
                     if item.rarity is Rarities.forged:
@@ -989,10 +995,10 @@ class ClassAbilities(AdventureMixin):
                             del c.backpack[item.name]
                         await view.message.edit(content=created_item, view=None)
                         c.backpack[newitem.name] = newitem
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        await c.save(ctx, self.config)
                     else:
                         c.heroclass["cooldown"] = time.time() + cooldown_time
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        await c.save(ctx, self.config)
                         mad_forge = box(
                             _("{author}, {newitem} got mad at your rejection and blew itself up.").format(
                                 author=escape(ctx.author.display_name), newitem=newitem.as_ansi()
@@ -1010,7 +1016,7 @@ class ClassAbilities(AdventureMixin):
                     if view.confirmed:
                         c.heroclass["cooldown"] = time.time() + cooldown_time
                         c.backpack[newitem.name] = newitem
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        await c.save(ctx, self.config)
                         forged_item = box(
                             _("{author}, your new {newitem} is lurking in your backpack.").format(
                                 author=escape(ctx.author.display_name), newitem=newitem.as_ansi()
@@ -1020,7 +1026,7 @@ class ClassAbilities(AdventureMixin):
                         await view.message.edit(content=forged_item, view=None)
                     else:
                         c.heroclass["cooldown"] = time.time() + cooldown_time
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        await c.save(ctx, self.config)
                         mad_forge = box(
                             _("{author}, {newitem} got mad at your rejection and blew itself up.").format(
                                 author=escape(ctx.author.display_name), newitem=newitem.as_ansi()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import contextlib
+from enum import Enum
+from typing import TYPE_CHECKING, Dict, Generic, Hashable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+from .constants import HeroClasses, Rarities
+
+if TYPE_CHECKING:
+    from .charsheet import Character
+
+# whatever tells the participants apart, members in the cog and user ids in replays
+P = TypeVar("P", bound=Hashable)
+
+
+class Action(Enum):
+    fight = 0
+    talk = 1
+    pray = 2
+    magic = 3
+    run = 4
+
+    @property
+    def emoji(self):
+        return {
+            Action.fight: "\N{DAGGER KNIFE}\N{VARIATION SELECTOR-16}",
+            Action.talk: "\N{LEFT SPEECH BUBBLE}\N{VARIATION SELECTOR-16}",
+            Action.pray: "\N{PERSON WITH FOLDED HANDS}",
+            Action.magic: "\N{SPARKLES}",
+            Action.run: "\N{RUNNER}\N{ZERO WIDTH JOINER}\N{MALE SIGN}\N{VARIATION SELECTOR-16}",
+        }[self]
+
+
+class CombatProfile(NamedTuple):
+    """The numbers a participant's rolls are made from.
+
+    This is taken from the character sheet when the user picks an action so
+    resolving the adventure doesn't need the sheet at all. It only changes
+    when the user uses their class ability, which retakes it.
+    """
+
+    user_id: int
+    hc: HeroClasses
+    ability: bool
+    total_att: int
+    total_int: int
+    total_cha: int
+    dex: int
+    luck: int
+    rebirths: int
+    # the crit chance of the ranger's pet, 0 without one
+    pet_crit: int
+    # what minibosses that ask for an item look at
+    sets: Tuple[str, ...] = ()
+    gear: Tuple[str, ...] = ()
+    mirror_shield: bool = False
+
+    @classmethod
+    def from_character(cls, c: Character) -> CombatProfile:
+        # the lowercase names of the equipped items that aren't forged
+        gear = []
+        mirror_shield = False
+        with contextlib.suppress(KeyError):
+            for item in c.get_current_equipment():
+                if item.rarity is not Rarities.forged:
+                    gear.append(str(item).lower())
+                # anyone who still has the impossible to acquire mirror shield
+                mirror_shield = mirror_shield or str(item) == ".mirror_shield"
+        return cls(
+            user_id=c.user.id,
+            hc=c.hc,
+            ability=bool(c.heroclass.get("ability", False)),
+            total_att=c.total_att,
+            total_int=c.total_int,
+            total_cha=c.total_cha,
+            dex=c.dex,
+            luck=c.luck,
+            rebirths=c.rebirths,
+            pet_crit=c.heroclass.get("pet", {}).get("bonuses", {}).get("crit", 0) or 0,
+            sets=tuple(c.sets),
+            gear=tuple(gear),
+            mirror_shield=mirror_shield,
+        )
+
+
+class ActionRegistry(Generic[P]):
+    """The action each participant of an adventure picked.
+
+    Every user has at most one action, so joining, switching and looking up
+    a user doesn't need to go through every action's list. Users are kept in
+    the order they picked their action so the seeded rolls made over them
+    are the same every time.
+    """
+
+    def __init__(self):
+        self._actions: Dict[P, Action] = {}
+        # dicts keep their insertion order and give O(1) removal unlike lists
+        self._members: Dict[Action, Dict[P, None]] = {action: {} for action in Action}
+
+    def __contains__(self, user: P) -> bool:
+        return user in self._actions
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def __iter__(self) -> Iterator[P]:
+        return iter(self._actions)
+
+    def get(self, user: P) -> Optional[Action]:
+        """Returns the action the user picked or `None` if they haven't picked one."""
+        return self._actions.get(user)
+
+    def set(self, user: P, action: Action) -> Optional[Action]:
+        """Puts the user on the given action and returns the one they had before.
+
+        Switching action moves the user to the end of their new action.
+        """
+        current = self._actions.get(user)
+        if current is action:
+            return current
+        if current is not None:
+            del self._members[current][user]
+        self._actions[user] = action
+        self._members[action][user] = None
+        return current
+
+    def remove(self, user: P) -> Optional[Action]:
+        """Takes the user off their action and returns it."""
+        current = self._actions.pop(user, None)
+        if current is not None:
+            del self._members[current][user]
+        return current
+
+    def members(self, action: Action) -> List[P]:
+        """Returns the users who picked the action in the order they picked it."""
+        return list(self._members[action])
+
+    def count(self, action: Action) -> int:
+        return len(self._members[action])
@@ -18,6 +18,7 @@ from .constants import DEV_LIST, Rarities, Slot
 from .converters import RarityConverter, SlotConverter
 from .helpers import escape, is_dev
 from .menus import BaseMenu, SimpleSource
+from .replay import replay
 from .rng import GameSeed, Random
 
 _ = Translator("Adventure", __file__)
@@ -73,9 +74,7 @@ class DevCommands(AdventureMixin):
             return
         trader = Trader(60, ctx, self)
         await trader.start(ctx, bypass=True, stockcount=stockcount)
-        await asyncio.sleep(60)
-        trader.stop()
-        await trader.on_timeout()
+        self._scheduler.schedule(("cart", trader.message.id), 60, trader.expire)
 
     @commands.command()
     @commands.is_owner()
@@ -99,7 +98,7 @@ class DevCommands(AdventureMixin):
                 return
             for _loop_counter in range(num):
                 await c.add_to_backpack(await self._genitem(ctx, rarity, slot))
-            await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+            await c.save(ctx, self.config)
         await ctx.invoke(self._backpack)
 
     @commands.command()
@@ -112,6 +111,7 @@ class DevCommands(AdventureMixin):
         """
         user_data = await self.config.user_from_id(user_id).all()
         await self.config.user(ctx.author).set(user_data)
+        self._leaderboard_index.update(ctx.author.id, user_data)
         await ctx.tick()
 
     @commands.command()
@@ -183,7 +183,7 @@ class DevCommands(AdventureMixin):
                 c.heroclass["cooldown"] = 0
                 if "catch_cooldown" in c.heroclass:
                     c.heroclass["catch_cooldown"] = 0
-                await self.config.user(target).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
         await ctx.tick()
 
     @commands.command(name="adventureseed")
@@ -259,6 +259,27 @@ class DevCommands(AdventureMixin):
             embed.set_image(url=monster["image"])
         await ctx.send(embed=embed)
 
+    @commands.command(name="adventurereplay")
+    @commands.is_owner()
+    async def _adventurereplay(self, ctx: commands.Context, seed: str):
+        """[Owner] Works out the result of a recorded adventure again"""
+        try:
+            seed = int(seed, 16)
+        except ValueError:
+            return await ctx.send(_("That isn't an adventure seed."))
+        record = await self.bot.loop.run_in_executor(None, self._replays.find, seed)
+        if record is None:
+            return await ctx.send(_("There is no replay of an adventure with this seed."))
+        outcome = replay(record)
+        msg = (
+            f"{record.challenge}\n"
+            f"Damage: {humanize_number(outcome.damage)}/{humanize_number(record.monster.hp)}\n"
+            f"Diplomacy: {humanize_number(int(outcome.diplomacy))}/{humanize_number(record.monster.dipl)}\n"
+            f"Success: {outcome.success}\n"
+            f"Same as recorded: {record.matches(outcome)}"
+        )
+        await ctx.send(box(msg))
+
     @commands.command(name="adventurestats")
     @commands.bot_has_permissions(add_reactions=True, embed_links=True)
     @commands.is_owner()
@@ -302,3 +323,16 @@ class DevCommands(AdventureMixin):
             clear_reactions_after=True,
             timeout=60,
         ).start(ctx=ctx)
+
+    @commands.command(name="adventureregistries")
+    @commands.is_owner()
+    async def _adventureregistries(self, ctx: commands.Context):
+        """[Owner] Show how much state the cog holds for users, guilds and messages."""
+        msg = f"{'Registry':<20} {'Size':>8} {'Max':>8} {'Evicted':>8} {'Expired':>8}\n"
+        for name, stats in self.registry_stats().items():
+            maxsize = humanize_number(stats.maxsize) if stats.maxsize is not None else "-"
+            msg += (
+                f"{name:<20} {humanize_number(stats.size):>8} {maxsize:>8} "
+                f"{humanize_number(stats.evictions):>8} {humanize_number(stats.expirations):>8}\n"
+            )
+        await ctx.send(box(msg))
@@ -77,14 +77,14 @@ class EconomyCommands(AdventureMixin):
             ),
         )
         try:
-            character = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
+            character = await self.get_character(ctx, ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
         else:
             if character.last_currency_check + 600 < time.time() or character.bal > character.last_known_currency:
                 character.last_known_currency = await bank.get_balance(ctx.author)
                 character.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                await character.save(ctx, self.config)
 
     @commands_atransfer.command(name="withdraw", cooldown_after_parsing=True)
     @commands.guild_only()
@@ -323,14 +323,14 @@ class EconomyCommands(AdventureMixin):
                 ),
             )
         try:
-            character = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
+            character = await self.get_character(ctx, ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
         else:
             if character.last_currency_check + 600 < time.time() or character.bal > character.last_known_currency:
                 character.last_known_currency = await bank.get_balance(ctx.author)
                 character.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                await character.save(ctx, self.config)
 
     # in economy since it affects the loot economy, might move later
     @commands.group()
@@ -376,12 +376,12 @@ class EconomyCommands(AdventureMixin):
         item = Item.from_json(ctx, new_item)
         async with self.get_lock(user):
             try:
-                c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                c = await self.get_character(ctx, user)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
             await c.add_to_backpack(item)
-            await self.config.user(user).set(await c.to_json(ctx, self.config))
+            await c.save(ctx, self.config)
         item_table = item.table(c)
         msg = box(
             _("An item named {item} has been created and placed in {author}'s backpack.").format(
@@ -430,7 +430,7 @@ class EconomyCommands(AdventureMixin):
         for user in users:
             async with self.get_lock(user):
                 try:
-                    c = await Character.from_json(ctx, self.config, user, self._daily_bonus)
+                    c = await self.get_character(ctx, user)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
@@ -446,7 +446,7 @@ class EconomyCommands(AdventureMixin):
                     c.treasure.set += number
                 else:
                     c.treasure.normal += number
-                await self.config.user(user).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
                 chests = c.treasure.ansi
                 await ctx.send(
                     box(
@@ -0,0 +1,651 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import TYPE_CHECKING, Hashable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .combat import Action, CombatProfile
+from .constants import HeroClasses
+
+if TYPE_CHECKING:
+    from .rng import Random
+    from .types import Monster
+
+# Anything that tells participants apart, the cog uses members
+Player = Hashable
+# The roll of the best insight used on the adventure and the psychic who made it
+Insight = Tuple[float, Optional[CombatProfile]]
+
+
+class MonsterStats(NamedTuple):
+    """The stats of the monster a party is up against."""
+
+    hp: int
+    dipl: int
+    pdef: float = 1.0
+    mdef: float = 1.0
+    cdef: float = 1.0
+
+    @classmethod
+    def scaled(
+        cls, stats: Mapping, attribute_stats: Sequence[float] = (1.0, 1.0), multiplier: float = 1
+    ) -> MonsterStats:
+        """Builds the stats of a monster from its modified stats and the multipliers of its attribute."""
+        return cls(
+            hp=max(int(stats.get("hp", 0) * attribute_stats[0] * multiplier), 1),
+            dipl=max(int(stats.get("dipl", 0) * attribute_stats[1] * multiplier), 1),
+            pdef=stats.get("pdef", 1.0),
+            mdef=stats.get("mdef", 1.0),
+            cdef=stats.get("cdef", 1.0),
+        )
+
+
+class Party(NamedTuple):
+    """The participants of an adventure on each action, in the order they joined it.
+
+    Participants without a profile are counted as being there but make no rolls.
+    """
+
+    fight: Sequence[Player] = ()
+    talk: Sequence[Player] = ()
+    pray: Sequence[Player] = ()
+    magic: Sequence[Player] = ()
+    run: Sequence[Player] = ()
+    profiles: Mapping[Player, CombatProfile] = {}
+
+
+class RollKind(Enum):
+    # the roll and the stat of the participant and nothing more
+    normal = 0
+    # a crit or the bonus of the participant's class
+    boosted = 1
+    fumbled = 2
+    # a fumble the participant's class ability made up for
+    saved = 3
+    # a prayer that was answered
+    blessed = 4
+
+
+class PlayerRoll(NamedTuple):
+    """What a participant rolled and what it did."""
+
+    player: Player
+    action: Action
+    kind: RollKind
+    roll: int
+    max_roll: int
+    # the attribute added to the roll
+    stat: int = 0
+    # the bonus of their class, or what their ability took off a fumble
+    bonus: int = 0
+    crit_bonus: int = 0
+    crit: bool = False
+    fumble: bool = False
+    # a prayer made with nobody else on the adventure
+    alone: bool = False
+    # what a prayer added to, or took off, each of the party's totals
+    attack: float = 0
+    diplomacy: float = 0
+    magic: float = 0
+
+
+class Outcome(NamedTuple):
+    """Everything that happened when an adventure was resolved."""
+
+    monster: MonsterStats
+    party: Party
+    attack: float
+    diplomacy: float
+    magic: float
+    # every roll made, prayers first then talkers, fighters and wizards
+    rolls: Tuple[PlayerRoll, ...]
+    crits: Tuple[Player, ...]
+    fumbles: Tuple[Player, ...]
+    # the party didn't meet the requirements of the miniboss
+    failed: bool = False
+
+    @property
+    def damage(self) -> int:
+        return int(self.attack + self.magic)
+
+    @property
+    def slain(self) -> bool:
+        return self.damage >= int(self.monster.hp)
+
+    @property
+    def persuaded(self) -> bool:
+        return int(self.diplomacy) >= int(self.monster.dipl)
+
+    @property
+    def success(self) -> bool:
+        return (self.slain or self.persuaded) and not self.failed
+
+    def rolls_for(self, *actions: Action) -> List[PlayerRoll]:
+        return [roll for roll in self.rolls if roll.action in actions]
+
+
+def resolve(
+    monster: MonsterStats,
+    party: Party,
+    rng: Random,
+    *,
+    insight: Insight = (0, None),
+    requirements: Optional[Sequence[str]] = None,
+    reacted: bool = False,
+) -> Outcome:
+    """Resolves an adventure.
+
+    The rolls are made in the same order as they always have been, so an
+    adventure with the same seed, participants and profiles always has the
+    same outcome.
+
+    Parameters
+    ----------
+    monster : MonsterStats
+        The monster the party is up against.
+    party : Party
+        Who is on which action and their profiles.
+    rng : Random
+        The random number generator the result is rolled with.
+    insight : Insight
+        The best insight used on the adventure, it helps everyone but the
+        psychic who made it when its roll is perfect.
+    requirements : Optional[Sequence[str]]
+        The requirement of the miniboss, if the monster is one.
+    reacted : bool
+        Whether someone reacted with the emoji a miniboss may ask for.
+    """
+    failed = basilisk(party, requirements, reacted=reacted)
+    attack, diplomacy, magic, rolls, fumbles = pray(party, rng, 0, 0, 0)
+    diplomacy, talk_rolls, crits, talk_fumbles = talk(monster, party, rng, diplomacy, insight=insight)
+    attack, magic, fight_rolls, fight_crits, fight_fumbles = fight(monster, party, rng, attack, magic, insight=insight)
+    return Outcome(
+        monster=monster,
+        party=party,
+        attack=attack,
+        diplomacy=diplomacy,
+        magic=magic,
+        rolls=tuple(rolls + talk_rolls + fight_rolls),
+        crits=tuple(crits + fight_crits),
+        fumbles=tuple(fumbles + talk_fumbles + fight_fumbles),
+        failed=failed,
+    )
+
+
+def monster_scaling(transcended_chance: int, rebirths: Optional[int] = None) -> Tuple[float, bool]:
+    """Returns how much the stats of an adventure's monster are multiplied by and whether it's transcended.
+
+    Parameters
+    ----------
+    transcended_chance : int
+        A roll from 0 to 10, the monster is transcended on a 5.
+    rebirths : Optional[int]
+        The rebirths of who started the adventure, ``None`` to use the base
+        stats like when a bot owner picks the adventure.
+    """
+    transcended = False
+    # set our default return values first
+    monster_stats = 1.0
+    if transcended_chance == 5:
+        monster_stats = 2.0
+
+    # if this is a normal adventure start e.g. not a bot owner
+    # picking the adventure, then we can randomly adjust the stats
+    if rebirths is not None:
+        if transcended_chance == 5:
+            monster_stats = 2 + max((rebirths // 10) - 1, 0)
+            transcended = True
+        elif rebirths >= 10:
+            monster_stats = 1 + max((rebirths // 10) - 1, 0) / 2
+    return monster_stats, transcended
+
+
+def dynamic_monster_stats(choice: Monster, rng: Random) -> Monster:
+    """Scales a monster's stats up or down by how often adventures have been won lately.
+
+    The monster is changed in place, pass a copy of the roster's.
+    """
+    stat_range = rng.internal_seed.stat_range
+    win_percentage = stat_range.win_percent
+    choice["cdef"] = choice.get("cdef", 1.0)
+    if win_percentage >= 0.90:
+        # more than 90% win rate
+        monster_hp_min = int(choice["hp"] * 2)
+        monster_hp_max = int(choice["hp"] * 3)
+        # hp 2-3x base
+        monster_diplo_min = int(choice["dipl"] * 2)
+        monster_diplo_max = int(choice["dipl"] * 3)
+        # dipl 2-3x base
+        percent_pdef = rng.randrange(25, 30) / 100
+        monster_pdef = choice["pdef"] * percent_pdef
+        percent_mdef = rng.randrange(25, 30) / 100
+        monster_mdef = choice["mdef"] * percent_mdef
+        percent_cdef = rng.randrange(25, 30) / 100
+        monster_cdef = choice["cdef"] * percent_cdef
+    elif win_percentage >= 0.75:
+        # less than 90% win rate but more than 75%
+        monster_hp_min = int(choice["hp"] * 1.5)
+        monster_hp_max = int(choice["hp"] * 2)
+        # hp 1.5-2x base
+        monster_diplo_min = int(choice["dipl"] * 1.5)
+        monster_diplo_max = int(choice["dipl"] * 2)
+        # dipl 1.5-2x base
+        percent_pdef = rng.randrange(15, 25) / 100
+        monster_pdef = choice["pdef"] * percent_pdef
+        percent_mdef = rng.randrange(15, 25) / 100
+        monster_mdef = choice["mdef"] * percent_mdef
+        percent_cdef = rng.randrange(15, 25) / 100
+        monster_cdef = choice["cdef"] * percent_cdef
+    elif win_percentage >= 0.50:
+        # less than 75% win rate but more than 50%
+        monster_hp_min = int(choice["hp"])
+        monster_hp_max = int(choice["hp"] * 1.5)
+        # hp 1-1.5x base
+        monster_diplo_min = int(choice["dipl"])
+        monster_diplo_max = int(choice["dipl"] * 1.5)
+        # dipl 1-1.5x base
+        percent_pdef = rng.randrange(1, 15) / 100
+        monster_pdef = choice["pdef"] * percent_pdef
+        percent_mdef = rng.randrange(1, 15) / 100
+        monster_mdef = choice["mdef"] * percent_mdef
+        percent_cdef = rng.randrange(1, 15) / 100
+        monster_cdef = choice["cdef"] * percent_cdef
+    elif win_percentage >= 0.35:
+        # less than 50% win rate but more than 35%
+        monster_hp_min = int(choice["hp"] * 0.9)
+        monster_hp_max = int(choice["hp"])
+        # hp 0.9-1x base
+        monster_diplo_min = int(choice["dipl"] * 0.9)
+        monster_diplo_max = int(choice["dipl"])
+        # dipl 0.9-1x base
+        percent_pdef = rng.randrange(1, 15) / 100
+        monster_pdef = choice["pdef"] * percent_pdef * -1
+        percent_mdef = rng.randrange(1, 15) / 100
+        monster_mdef = choice["mdef"] * percent_mdef * -1
+        percent_cdef = rng.randrange(1, 15) / 100
+        monster_cdef = choice["cdef"] * percent_cdef * -1
+    elif win_percentage >= 0.15:
+        # less than 35% win rate but more than 15%
+        monster_hp_min = int(choice["hp"] * 0.8)
+        monster_hp_max = int(choice["hp"] * 0.9)
+        # hp 0.8-0.9x base
+        monster_diplo_min = int(choice["dipl"] * 0.8)
+        monster_diplo_max = int(choice["dipl"] * 0.9)
+        # dipl 0.8-0.9x base
+        percent_pdef = rng.randrange(15, 25) / 100
+        monster_pdef = choice["pdef"] * percent_pdef * -1
+        percent_mdef = rng.randrange(15, 25) / 100
+        monster_mdef = choice["mdef"] * percent_mdef * -1
+        percent_cdef = rng.randrange(15, 25) / 100
+        monster_cdef = choice["cdef"] * percent_cdef * -1
+    else:
+        # less than 15% win rate
+        monster_hp_min = int(choice["hp"] * 0.6)
+        monster_hp_max = int(choice["hp"] * 0.8)
+        # hp 0.6-0.8x base
+        monster_diplo_min = int(choice["dipl"] * 0.6)
+        monster_diplo_max = int(choice["dipl"] * 0.8)
+        # dipl 0.6-0.8x base
+        percent_pdef = rng.randrange(25, 30) / 100
+        monster_pdef = choice["pdef"] * percent_pdef * -1
+        percent_mdef = rng.randrange(25, 30) / 100
+        monster_mdef = choice["mdef"] * percent_mdef * -1
+        percent_cdef = rng.randrange(25, 30) / 100
+        monster_cdef = choice["cdef"] * percent_cdef * -1
+
+    if monster_hp_min < monster_hp_max:
+        new_hp = rng.randrange(monster_hp_min, monster_hp_max)
+    elif monster_hp_max < monster_hp_min:
+        new_hp = rng.randrange(monster_hp_max, monster_hp_min)
+    else:
+        new_hp = max(monster_hp_max, monster_hp_min)
+    if monster_diplo_min < monster_diplo_max:
+        new_diplo = rng.randrange(monster_diplo_min, monster_diplo_max)
+    elif monster_diplo_max < monster_diplo_min:
+        new_diplo = rng.randrange(monster_diplo_max, monster_diplo_min)
+    else:
+        new_diplo = max(monster_diplo_max, monster_diplo_min)
+
+    new_pdef = choice["pdef"] + monster_pdef
+    new_mdef = choice["mdef"] + monster_mdef
+    new_cdef = choice["cdef"] + monster_cdef
+    choice["hp"] = new_hp
+    choice["dipl"] = new_diplo
+    choice["pdef"] = new_pdef
+    choice["mdef"] = new_mdef
+    choice["cdef"] = new_cdef
+    return choice
+
+
+def reward_amount(outcome: Outcome, multiplier: float, people: int) -> float:
+    """Returns the experience and credits the winners of an adventure share, before their own bonuses."""
+    amount = 1 * multiplier
+    hp, dipl = outcome.monster.hp, outcome.monster.dipl
+    amount *= (hp + dipl) if outcome.slain and outcome.persuaded else hp if outcome.slain else dipl
+    amount += int(amount * (0.25 * people))
+    return amount
+
+
+def basilisk(party: Party, requirements: Optional[Sequence[str]], *, reacted: bool = False) -> bool:
+    """Returns whether the party fails to meet the requirements of a miniboss."""
+    if not requirements:
+        return False
+    req_item, key = requirements
+    participants = [*party.fight, *party.talk, *party.pray, *party.magic]
+    if req_item == "members":
+        return not len(participants) > int(key)
+    if req_item == "emoji":
+        return not reacted
+    if req_item == "item":
+        for player in participants:
+            p = party.profiles.get(player)
+            if p is None:
+                continue
+            if any(x in p.sets for x in ["The Supreme One", "Ainz Ooal Gown"]):
+                return False
+            if any(key in name for name in p.gear) or (key == "shiny" and p.mirror_shield):
+                return False
+    return True
+
+
+def _roll(rng: Random, p: CombatProfile, stat_mod: int) -> Tuple[int, int]:
+    crit_mod = max(max(p.dex, p.luck // 2) + stat_mod, 0)
+    mod = 0
+    max_roll = 100 if p.rebirths >= 30 else 50 if p.rebirths >= 15 else 20
+    if crit_mod != 0:
+        mod = round(crit_mod / 10)
+    if p.rebirths < 15 < mod:
+        mod = 15
+        max_roll = 20
+    elif (mod + 1) > 45:
+        mod = 45
+    return max(rng.randint((1 + mod), max_roll), 1), max_roll
+
+
+def _pet_roll(rng: Random, p: CombatProfile, roll: int, max_roll: int) -> int:
+    if p.pet_crit:
+        pet_crit = rng.randint(p.pet_crit, 100)
+        if pet_crit == 100:
+            roll = max_roll
+        elif roll <= 25 and pet_crit >= 95:
+            roll = rng.randint(max_roll - 5, max_roll)
+        elif roll > 25 and pet_crit >= 95:
+            roll = rng.randint(roll, max_roll)
+    return roll
+
+
+def _helped(insight: Insight, p: CombatProfile) -> bool:
+    return insight[0] == 1 and p.user_id != insight[1].user_id
+
+
+def pray(
+    party: Party, rng: Random, attack: float, diplomacy: float, magic: float
+) -> Tuple[float, float, float, List[PlayerRoll], List[Player]]:
+    """Rolls for everyone praying, returns the new totals, the rolls and who fumbled."""
+    fighters, talkers, wizards = len(party.fight), len(party.talk), len(party.magic)
+    alone = fighters + talkers + wizards == 0
+    rolls = []
+    fumbles = []
+    for player in party.pray:
+        p = party.profiles.get(player)
+        if p is None:
+            continue
+        rebirths = p.rebirths * (2 if p.hc is HeroClasses.cleric else 1)
+        if p.hc is HeroClasses.cleric:
+            roll, max_roll = _roll(rng, p, p.total_int // 20)
+            roll_perc = roll / max_roll
+            pray_att_bonus = 0
+            pray_diplo_bonus = 0
+            pray_magic_bonus = 0
+            if roll_perc < 0.15:
+                if fighters:
+                    pray_att_bonus = (5 * fighters) - ((5 * fighters) * max(rebirths * 0.01, 1.5))
+                if talkers:
+                    pray_diplo_bonus = (5 * talkers) - ((5 * talkers) * max(rebirths * 0.01, 1.5))
+                if wizards:
+                    pray_magic_bonus = (5 * wizards) - ((5 * wizards) * max(rebirths * 0.01, 1.5))
+                attack -= pray_att_bonus
+                diplomacy -= pray_diplo_bonus
+                magic -= pray_magic_bonus
+                fumbles.append(player)
+                kind = RollKind.fumbled
+            else:
+                mod = roll // 3 if not p.ability else roll
+                if fighters:
+                    pray_att_bonus = int((mod * fighters) + ((mod * fighters) * max(rebirths * 0.05, 1.5)))
+                if talkers:
+                    pray_diplo_bonus = int((mod * talkers) + ((mod * talkers) * max(rebirths * 0.05, 1.5)))
+                if wizards:
+                    pray_magic_bonus = int((mod * wizards) + ((mod * wizards) * max(rebirths * 0.05, 1.5)))
+                attack += pray_att_bonus
+                magic += pray_magic_bonus
+                diplomacy += pray_diplo_bonus
+                kind = RollKind.blessed
+            rolls.append(
+                PlayerRoll(
+                    player,
+                    Action.pray,
+                    kind,
+                    roll,
+                    max_roll,
+                    fumble=kind is RollKind.fumbled,
+                    alone=alone,
+                    attack=pray_att_bonus,
+                    diplomacy=pray_diplo_bonus,
+                    magic=pray_magic_bonus,
+                )
+            )
+            continue
+        roll = rng.randint(1, 10)
+        if alone:
+            rolls.append(PlayerRoll(player, Action.pray, RollKind.normal, roll, 10, alone=True))
+        elif roll == 5:
+            attack_buff = 0
+            talk_buff = 0
+            magic_buff = 0
+            if fighters:
+                attack_buff = 10 * (fighters + rebirths // 15)
+            if talkers:
+                talk_buff = 10 * (talkers + rebirths // 15)
+            if wizards:
+                magic_buff = 10 * (wizards + rebirths // 15)
+            attack += attack_buff
+            magic += magic_buff
+            diplomacy += talk_buff
+            rolls.append(
+                PlayerRoll(
+                    player,
+                    Action.pray,
+                    RollKind.blessed,
+                    roll,
+                    10,
+                    attack=attack_buff,
+                    diplomacy=talk_buff,
+                    magic=magic_buff,
+                )
+            )
+        else:
+            fumbles.append(player)
+            rolls.append(PlayerRoll(player, Action.pray, RollKind.fumbled, roll, 10, fumble=True))
+    return attack, diplomacy, magic, rolls, fumbles
+
+
+def talk(
+    monster: MonsterStats, party: Party, rng: Random, diplomacy: float, *, insight: Insight = (0, None)
+) -> Tuple[float, List[PlayerRoll], List[Player], List[Player]]:
+    """Rolls for everyone talking, returns the new diplomacy, the rolls, who crit and who fumbled."""
+    cdef = max(monster.cdef, 0.5)
+    rolls = []
+    crits = []
+    fumbles = []
+    for player in party.talk:
+        p = party.profiles.get(player)
+        if p is None:
+            continue
+        roll, max_roll = _roll(rng, p, (p.total_int // 50) + (p.total_cha // 20))
+        dipl_value = p.total_cha
+        rebirths = p.rebirths * (3 if p.hc is HeroClasses.bard else 1)
+        roll_perc = roll / max_roll
+        if roll_perc < 0.10:
+            if p.hc is HeroClasses.bard and p.ability:
+                bonus = rng.randint(5, 15)
+                diplomacy += int((roll - bonus + dipl_value + rebirths) / cdef)
+                rolls.append(PlayerRoll(player, Action.talk, RollKind.saved, roll, max_roll, dipl_value, bonus))
+            else:
+                fumbles.append(player)
+                rolls.append(PlayerRoll(player, Action.talk, RollKind.fumbled, roll, max_roll, fumble=True))
+        elif roll_perc > 0.95 or p.hc is HeroClasses.bard:
+            crit_bonus = 0
+            base_bonus = rng.randint(5, 10) + rebirths
+            crit = roll_perc > 0.95
+            if crit:
+                crits.append(player)
+                crit_bonus = (rng.randint(5, 20)) + (rebirths * 2)
+            if p.hc is HeroClasses.bard and p.ability:
+                base_bonus = (rng.randint(1, 10) + 5) * (rebirths // 2)
+            diplomacy += int((roll + base_bonus + crit_bonus + dipl_value) / cdef)
+            rolls.append(
+                PlayerRoll(
+                    player,
+                    Action.talk,
+                    RollKind.boosted,
+                    roll,
+                    max_roll,
+                    dipl_value,
+                    base_bonus,
+                    crit_bonus,
+                    crit,
+                )
+            )
+        else:
+            diplomacy += int((roll + dipl_value + p.rebirths // 5) / cdef)
+            rolls.append(PlayerRoll(player, Action.talk, RollKind.normal, roll, max_roll, dipl_value))
+        if _helped(insight, p):
+            diplomacy += int(insight[1].total_cha * 0.2)
+    # fumbles don't get the insight bonus
+    for player in fumbles:
+        if _helped(insight, party.profiles[player]):
+            diplomacy -= int(insight[1].total_cha * 0.2)
+    return diplomacy, rolls, crits, fumbles
+
+
+def fight(
+    monster: MonsterStats,
+    party: Party,
+    rng: Random,
+    attack: float,
+    magic: float,
+    *,
+    insight: Insight = (0, None),
+) -> Tuple[float, float, List[PlayerRoll], List[Player], List[Player]]:
+    """Rolls for everyone fighting and casting, returns the new totals, the rolls, who crit and who fumbled."""
+    pdef = max(monster.pdef, 0.5)
+    mdef = max(monster.mdef, 0.5)
+    rolls = []
+    crits = []
+    fumbles = []
+    for player in party.fight:
+        p = party.profiles.get(player)
+        if p is None:
+            continue
+        roll, max_roll = _roll(rng, p, p.total_att // 20)  # Thanks GoaFan77
+        roll = _pet_roll(rng, p, roll, max_roll)
+        roll_perc = roll / max_roll
+        att_value = p.total_att
+        rebirths = p.rebirths * (3 if p.hc is not HeroClasses.berserker else 1)
+        if roll_perc < 0.10:
+            if p.hc is HeroClasses.berserker and p.ability:
+                bonus_roll = rng.randint(5, 15)
+                bonus_multi = rng.choice([0.2, 0.3, 0.4, 0.5])
+                bonus = max(bonus_roll, int((roll + att_value + rebirths) * bonus_multi))
+                attack += int((roll - bonus + att_value) / pdef)
+                rolls.append(PlayerRoll(player, Action.fight, RollKind.saved, roll, max_roll, att_value, bonus))
+            else:
+                fumbles.append(player)
+                rolls.append(PlayerRoll(player, Action.fight, RollKind.fumbled, roll, max_roll, fumble=True))
+        elif roll_perc > 0.95 or p.hc is HeroClasses.berserker:
+            crit_bonus = 0
+            base_bonus = rng.randint(5, 10) + rebirths
+            crit = roll_perc > 0.95
+            if crit:
+                crits.append(player)
+                crit_bonus = (rng.randint(5, 20)) + (rebirths * 2)
+            if p.hc is HeroClasses.berserker and p.ability:
+                base_bonus = (rng.randint(1, 10) + 5) * (rebirths // 2)
+            attack += int((roll + base_bonus + crit_bonus + att_value) / pdef)
+            rolls.append(
+                PlayerRoll(
+                    player,
+                    Action.fight,
+                    RollKind.boosted,
+                    roll,
+                    max_roll,
+                    att_value,
+                    base_bonus,
+                    crit_bonus,
+                    crit,
+                )
+            )
+        else:
+            attack += int((roll + att_value) / pdef) + rebirths
+            rolls.append(PlayerRoll(player, Action.fight, RollKind.normal, roll, max_roll, att_value))
+        if _helped(insight, p):
+            attack += int(insight[1].total_att * 0.2)
+    for player in party.magic:
+        p = party.profiles.get(player)
+        if p is None:
+            continue
+        roll, max_roll = _roll(rng, p, p.total_int // 20)
+        roll = _pet_roll(rng, p, roll, max_roll)
+        roll_perc = roll / max_roll
+        int_value = p.total_int
+        rebirths = p.rebirths * (3 if p.hc is HeroClasses.wizard else 1)
+        if roll_perc < 0.10:
+            # a focused wizard still fumbles, but their spell goes off anyway
+            fumbles.append(player)
+            if p.hc is HeroClasses.wizard and p.ability:
+                bonus_roll = rng.randint(5, 15)
+                bonus_multi = rng.choice([0.2, 0.3, 0.4, 0.5])
+                bonus = max(bonus_roll, int((roll + int_value + rebirths) * bonus_multi))
+                magic += int((roll - bonus + int_value) / mdef)
+                kind = RollKind.saved
+            else:
+                bonus = 0
+                kind = RollKind.fumbled
+            rolls.append(PlayerRoll(player, Action.magic, kind, roll, max_roll, int_value, bonus, fumble=True))
+        elif roll_perc > 0.95 or p.hc is HeroClasses.wizard:
+            crit_bonus = 0
+            base_bonus = rng.randint(5, 10) + rebirths
+            crit = roll_perc > 0.95
+            if crit:
+                crits.append(player)
+                crit_bonus = (rng.randint(5, 20)) + (rebirths * 2)
+            if p.hc is HeroClasses.wizard and p.ability:
+                base_bonus = (rng.randint(1, 10) + 5) * (rebirths // 2)
+            magic += int((roll + base_bonus + crit_bonus + int_value) / mdef)
+            rolls.append(
+                PlayerRoll(
+                    player,
+                    Action.magic,
+                    RollKind.boosted,
+                    roll,
+                    max_roll,
+                    int_value,
+                    base_bonus,
+                    crit_bonus,
+                    crit,
+                )
+            )
+        else:
+            magic += int((roll + int_value) / mdef) + p.rebirths // 5
+            rolls.append(PlayerRoll(player, Action.magic, RollKind.normal, roll, max_roll, int_value))
+        if _helped(insight, p):
+            attack += int(insight[1].total_int * 0.2)
+    # fumbles don't get the insight bonus
+    fighters = set(party.fight)
+    for player in fumbles:
+        if _helped(insight, party.profiles[player]):
+            if player in fighters:
+                attack -= int(insight[1].total_att * 0.2)
+            else:
+                attack -= int(insight[1].total_int * 0.2)
+    return attack, magic, rolls, crits, fumbles
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from datetime import datetime
-from enum import Enum
-from typing import Dict, List, Mapping, MutableMapping, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple
 
 import discord
 from redbot.core.commands import Context
@@ -12,9 +12,13 @@ from redbot.core.i18n import Translator, set_contextual_locales_from_guild
 from redbot.core.utils.chat_formatting import box, humanize_list, humanize_number
 
 from .abc import AdventureMixin
+from .bank import bank
 from .charsheet import Character, has_funds
+from .combat import Action, ActionRegistry, CombatProfile
 from .constants import HeroClasses
+from .engine import MonsterStats, Party
 from .helpers import escape, smart_embed
+from .replay import AbilityUse, Join
 from .rng import Random
 
 # This is split into its own file for future buttons usage
@@ -25,24 +29,6 @@ _ = Translator("Adventure", __file__)
 log = logging.getLogger("red.cogs.adventure")
 
 
-class Action(Enum):
-    fight = 0
-    talk = 1
-    pray = 2
-    magic = 3
-    run = 4
-
-    @property
-    def emoji(self):
-        return {
-            Action.fight: "\N{DAGGER KNIFE}\N{VARIATION SELECTOR-16}",
-            Action.talk: "\N{LEFT SPEECH BUBBLE}\N{VARIATION SELECTOR-16}",
-            Action.pray: "\N{PERSON WITH FOLDED HANDS}",
-            Action.magic: "\N{SPARKLES}",
-            Action.run: "\N{RUNNER}\N{ZERO WIDTH JOINER}\N{MALE SIGN}\N{VARIATION SELECTOR-16}",
-        }[self]
-
-
 class ActionButton(discord.ui.Button):
     def __init__(self, action: Action):
         self.action = action
@@ -51,7 +37,7 @@ class ActionButton(discord.ui.Button):
     async def send_response(self, interaction: discord.Interaction):
         user = interaction.user
         try:
-            c = await Character.from_json(self.view.ctx, self.view.cog.config, user, self.view.cog._daily_bonus)
+            c = await self.view.get_character(user)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             pass
@@ -75,13 +61,8 @@ class ActionButton(discord.ui.Button):
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer()
         user = interaction.user
-        for action in Action:
-            if action is self.action:
-                continue
-            if user in getattr(self.view, action.name, []):
-                getattr(self.view, action.name).remove(user)
-        if user not in getattr(self.view, self.action.name):
-            getattr(self.view, self.action.name).append(user)
+        if self.view.join(user, self.action):
+            await self.view.take_profile(user)
             await self.send_response(interaction)
             await self.view.update()
         else:
@@ -130,7 +111,8 @@ class SpecialActionButton(discord.ui.Button):
             if c.heroclass["cooldown"] <= time.time():
                 c.heroclass["ability"] = True
                 c.heroclass["cooldown"] = time.time() + cooldown_time
-                await self.view.cog.config.user(user).set(await c.to_json(self.view.ctx, self.view.cog.config))
+                self.view.record_ability(c)
+                await c.save(self.view.ctx, self.view.cog.config)
                 msg = _("{bless} **{c}** is starting an inspiring sermon. {bless}").format(
                     c=escape(user.display_name), bless=self.view.cog.emojis.skills.bless
                 )
@@ -150,7 +132,7 @@ class SpecialActionButton(discord.ui.Button):
             max_roll = 100 if c.rebirths >= 30 else 50 if c.rebirths >= 15 else 20
             roll = self.view.rng.randint(min(c.rebirths - 25 // 2, (max_roll // 2)), max_roll) / max_roll
             if self.view.insight[0] < roll:
-                self.view.insight = roll, c
+                self.view.insight = roll, CombatProfile.from_character(c)
                 good = True
             else:
                 good = False
@@ -163,8 +145,9 @@ class SpecialActionButton(discord.ui.Button):
                 )
             c.heroclass["ability"] = True
             c.heroclass["cooldown"] = time.time() + cooldown_time
+            self.view.record_ability(c, roll)
 
-            await self.view.cog.config.user(user).set(await c.to_json(self.view.ctx, self.view.cog.config))
+            await c.save(self.view.ctx, self.view.cog.config)
             if good:
                 msg = _("{skill} **{c}** is focusing on the monster ahead...{skill}").format(
                     c=escape(user.display_name),
@@ -310,7 +293,8 @@ class SpecialActionButton(discord.ui.Button):
         if c.heroclass["cooldown"] <= time.time():
             c.heroclass["ability"] = True
             c.heroclass["cooldown"] = time.time() + cooldown_time
-            await self.view.cog.config.user(user).set(await c.to_json(self.view.ctx, self.view.cog.config))
+            self.view.record_ability(c)
+            await c.save(self.view.ctx, self.view.cog.config)
             await smart_embed(
                 None,
                 _("{skill} **{c}** is starting to froth at the mouth... {skill}").format(
@@ -334,8 +318,9 @@ class SpecialActionButton(discord.ui.Button):
         if c.heroclass["cooldown"] <= time.time():
             c.heroclass["ability"] = True
             c.heroclass["cooldown"] = time.time() + cooldown_time
+            self.view.record_ability(c)
 
-            await self.view.cog.config.user(user).set(await c.to_json(self.view.ctx, self.view.cog.config))
+            await c.save(self.view.ctx, self.view.cog.config)
             await smart_embed(
                 None,
                 _("{skill} **{c}** is focusing all of their energy... {skill}").format(
@@ -359,7 +344,8 @@ class SpecialActionButton(discord.ui.Button):
         if c.heroclass["cooldown"] <= time.time():
             c.heroclass["ability"] = True
             c.heroclass["cooldown"] = time.time() + cooldown_time
-            await self.view.cog.config.user(user).set(await c.to_json(self.view.ctx, self.view.cog.config))
+            self.view.record_ability(c)
+            await c.save(self.view.ctx, self.view.cog.config)
             await smart_embed(
                 None,
                 _("{skill} **{c}** is whipping up a performance... {skill}").format(
@@ -386,7 +372,7 @@ class SpecialActionButton(discord.ui.Button):
             return
         async with self.view.cog.get_lock(user):
             try:
-                c = await Character.from_json(self.view.ctx, self.view.cog.config, user, self.view.cog._daily_bonus)
+                c = await self.view.get_character(user)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 await smart_embed(
@@ -429,14 +415,10 @@ class GameSession(discord.ui.View):
     reacted: bool = False
     participants: Set[discord.Member] = set()
     monster_modified_stats: MutableMapping = {}
-    fight: List[discord.Member] = []
-    magic: List[discord.Member] = []
-    talk: List[discord.Member] = []
-    pray: List[discord.Member] = []
-    run: List[discord.Member] = []
+    actions: ActionRegistry[discord.Member]
     message: discord.Message = None
     transcended: bool = False
-    insight: Tuple[float, Character] = (0, None)
+    insight: Tuple[float, CombatProfile] = (0, None)
     start_time: datetime = datetime.now()
     easy_mode: bool = False
     insight = (0, None)
@@ -444,7 +426,13 @@ class GameSession(discord.ui.View):
     exposed: bool = False
     finished: bool = False
     rng: Random
+    characters: Dict[int, Character]
+    profiles: Dict[int, CombatProfile]
+    joins: List[Join]
+    abilities: List[AbilityUse]
+    update_interval: float
     _last_update: Dict[Action, int]
+    _indexed: Set[int]
 
     def __init__(self, **kwargs):
         self.ctx: Context = kwargs.pop("ctx")
@@ -465,13 +453,17 @@ class GameSession(discord.ui.View):
         self.message_id: int = 0
         self.reacted = False
         self.participants: Set[discord.Member] = set()
-        self.fight: List[discord.Member] = []
-        self.magic: List[discord.Member] = []
-        self.talk: List[discord.Member] = []
-        self.pray: List[discord.Member] = []
-        self.run: List[discord.Member] = []
+        self.actions: ActionRegistry[discord.Member] = ActionRegistry()
         self.transcended: bool = kwargs.pop("transcended", False)
-        self.insight: Tuple[float, Character] = (0, None)
+        self.insight: Tuple[float, CombatProfile] = (0, None)
+        # Character sheets are loaded once per participant and written back
+        # once the adventure has been resolved.
+        self.characters: Dict[int, Character] = {}
+        # What each participant's rolls are made from, taken when they pick an action
+        self.profiles: Dict[int, CombatProfile] = {}
+        # what the result is worked out from besides the profiles, kept for its replay
+        self.joins: List[Join] = []
+        self.abilities: List[AbilityUse] = []
         self.start_time = datetime.now()
         self.easy_mode = kwargs.get("easy_mode", False)
         self.no_monster = kwargs.get("no_monster", False)
@@ -479,6 +471,8 @@ class GameSession(discord.ui.View):
         self.immortal = self.attribute == "n immortal"
         self.ascended = "Ascended" in self.challenge
         self.rng = kwargs["rng"]
+        # The shortest time in seconds between two edits of the adventure message
+        self.update_interval: float = kwargs.pop("update_interval", 2.0)
         super().__init__(timeout=self.timer)
         self.attack_button = ActionButton(Action.fight)
         self.talk_button = ActionButton(Action.talk)
@@ -493,14 +487,170 @@ class GameSession(discord.ui.View):
         self.add_item(self.run_button)
         self.add_item(self.special_button)
         self._last_update: Dict[Action, int] = {a: 0 for a in Action}
+        self._last_edit: float = 0
+        self._dirty = False
+        self._update_task: Optional[asyncio.Task] = None
+        # Users this session added to the cog's index, they stay in it until the
+        # session is removed even if they fumble and are dropped from their action.
+        self._indexed: Set[int] = set()
+
+    def combat_stats(self) -> MonsterStats:
+        return MonsterStats.scaled(self.monster_modified_stats, self.attribute_stats, self.monster_stats)
 
     def monster_hp(self) -> int:
-        return max(int(self.monster_modified_stats.get("hp", 0) * self.attribute_stats[0] * self.monster_stats), 1)
+        return self.combat_stats().hp
 
     def monster_dipl(self) -> int:
-        return max(int(self.monster_modified_stats.get("dipl", 0) * self.attribute_stats[1] * self.monster_stats), 1)
+        return self.combat_stats().dipl
+
+    def party(self) -> Party:
+        """Returns who is on which action along with their combat profiles."""
+        profiles = {user: self.profiles[user.id] for user in self.actions if user.id in self.profiles}
+        return Party(self.fight, self.talk, self.pray, self.magic, self.run, profiles)
+
+    @property
+    def fight(self) -> List[discord.Member]:
+        return self.actions.members(Action.fight)
+
+    @property
+    def magic(self) -> List[discord.Member]:
+        return self.actions.members(Action.magic)
+
+    @property
+    def talk(self) -> List[discord.Member]:
+        return self.actions.members(Action.talk)
+
+    @property
+    def pray(self) -> List[discord.Member]:
+        return self.actions.members(Action.pray)
+
+    @property
+    def run(self) -> List[discord.Member]:
+        return self.actions.members(Action.run)
+
+    async def get_character(self, user: discord.Member, *, refresh_balance: bool = False) -> Character:
+        """Returns the character sheet for this adventure, loading it on first access.
+
+        The same instance is shared for the whole adventure so changes made to it
+        are kept until the session writes it back.
+        """
+        c = self.characters.get(user.id)
+        if c is None:
+            c = await Character.from_json(self.ctx, self.cog.config, user, self.cog._daily_bonus)
+            c = self.characters.setdefault(user.id, c)
+        elif refresh_balance:
+            c.bal = await bank.get_balance(user)
+        return c
+
+    async def load_characters(self, users: Iterable[discord.Member], *, refresh_balance: bool = False):
+        """Loads the character sheets of all of these users at once.
+
+        Sheets already loaded are kept, `get_character` then returns them
+        without going back to config for each user.
+        """
+        users = list(users)
+        missing = [user for user in users if user.id not in self.characters]
+        loaded = await Character.from_json_many(self.ctx, self.cog.config, missing, self.cog._daily_bonus)
+        for user_id, c in loaded.items():
+            self.characters.setdefault(user_id, c)
+        if not refresh_balance:
+            return
+        # sheets that were just loaded already have the current balance
+        cached = [user for user in users if user.id in self.characters and user.id not in loaded]
+        balances = await asyncio.gather(*(bank.get_balance(user) for user in cached), return_exceptions=True)
+        for user, balance in zip(cached, balances):
+            if isinstance(balance, Exception):
+                # the balance loaded with the sheet is kept
+                continue
+            if isinstance(balance, BaseException):
+                raise balance
+            self.characters[user.id].bal = balance
+
+    async def take_profile(self, user: discord.Member) -> Optional[CombatProfile]:
+        """Takes the combat profile of the user from their character sheet.
+
+        Returns `None` if their sheet couldn't be loaded, they are then left
+        without a profile and skipped when the adventure is resolved.
+        """
+        try:
+            c = await self.get_character(user)
+        except Exception as exc:
+            log.exception("Error with the new character sheet", exc_info=exc)
+            return None
+        return self.refresh_profile(c)
+
+    def refresh_profile(self, c: Character) -> CombatProfile:
+        """Retakes the combat profile of a character whose sheet was changed during the adventure."""
+        profile = self.profiles[c.user.id] = CombatProfile.from_character(c)
+        return profile
+
+    def record_ability(self, c: Character, roll: Optional[float] = None) -> CombatProfile:
+        """Notes that the character used their class ability and retakes their combat profile.
+
+        Parameters
+        ----------
+        roll : Optional[float]
+            What a psychic's insight rolled.
+        """
+        self.abilities.append(AbilityUse(c.user.id, c.hc, roll))
+        return self.refresh_profile(c)
+
+    async def load_profiles(self, users: Iterable[discord.Member]):
+        """Takes the combat profile of the users who don't have one yet.
+
+        Users who pick an action with the buttons already have one, this is
+        for those who joined some other way.
+        """
+        missing = [user for user in users if user.id not in self.profiles]
+        if not missing:
+            return
+        await self.load_characters(missing)
+        for user in missing:
+            c = self.characters.get(user.id)
+            if c is not None:
+                self.refresh_profile(c)
 
     async def update(self):
+        """Updates the buttons of the adventure message with the number of users on each action.
+
+        Clicks that come in quick succession are put in a single edit made at most
+        once every `update_interval` seconds.
+        """
+        self._dirty = True
+        if self._update_task is None or self._update_task.done():
+            self._update_task = asyncio.create_task(self._delayed_update())
+
+    async def _delayed_update(self):
+        # clicks made while the message is being edited are sent in the next edit
+        while self._dirty:
+            delay = self._last_edit + self.update_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                await self._edit()
+            except discord.HTTPException:
+                log.exception("Error updating the adventure message")
+                return
+
+    async def flush(self, *, remove_view: bool = False):
+        """Makes any update that is still waiting right away.
+
+        Parameters
+        ----------
+        remove_view : bool
+            Remove the buttons from the message instead, this is the final
+            edit of the adventure so nothing waiting is sent after it.
+        """
+        if self._update_task is not None and not self._update_task.done():
+            self._update_task.cancel()
+        self._update_task = None
+        if remove_view:
+            await self.message.edit(view=None)
+        elif self._dirty:
+            await self._edit()
+
+    async def _edit(self):
+        self._dirty = False
         buttons = {
             Action.fight: self.attack_button,
             Action.talk: self.talk_button,
@@ -509,27 +659,53 @@ class GameSession(discord.ui.View):
             Action.run: self.run_button,
         }
         for action in Action:
-            if len(getattr(self, action.name, [])) != self._last_update[action]:
-                new_number = len(getattr(self, action.name, []))
+            if self.actions.count(action) != self._last_update[action]:
+                new_number = self.actions.count(action)
                 self._last_update[action] = new_number
                 if new_number != 0:
                     buttons[action].label = buttons[action].action.name.title() + f" ({new_number})"
                 else:
                     buttons[action].label = buttons[action].action.name.title()
+        self._last_edit = time.monotonic()
         await self.message.edit(view=self)
 
+    def join(self, user: discord.Member, action: Action) -> bool:
+        """Puts the user on the given action, taking them off the one they picked before.
+
+        Returns `False` if the user had already picked this action.
+        """
+        if self.actions.set(user, action) is action:
+            return False
+        self.joins.append(Join(user.id, action))
+        self.cog._user_sessions.setdefault(user.id, {})[self.guild.id] = self
+        self._indexed.add(user.id)
+        return True
+
+    def leave(self, user: discord.Member):
+        """Takes the user out of this adventure."""
+        if self.actions.remove(user) is not None:
+            self.joins.append(Join(user.id, None))
+        self.profiles.pop(user.id, None)
+        self._forget(user.id)
+
+    def close(self):
+        """Takes every participant out of the cog's index of who is in an adventure."""
+        if self._update_task is not None:
+            self._update_task.cancel()
+        for user_id in list(self._indexed):
+            self._forget(user_id)
+
+    def _forget(self, user_id: int):
+        self._indexed.discard(user_id)
+        sessions = self.cog._user_sessions.get(user_id)
+        if sessions is None or sessions.get(self.guild.id) is not self:
+            return
+        del sessions[self.guild.id]
+        if not sessions:
+            del self.cog._user_sessions[user_id]
+
     def in_adventure(self, user: discord.Member) -> bool:
-        participants_ids = set(
-            p.id
-            for p in [
-                *self.fight,
-                *self.magic,
-                *self.pray,
-                *self.talk,
-                *self.run,
-            ]
-        )
-        return bool(user.id in participants_ids)
+        return self.cog._user_sessions.get(user.id, {}).get(self.guild.id) is self
 
     def challenge_name(self):
         if self.easy_mode:
@@ -563,16 +739,10 @@ class GameSession(discord.ui.View):
             return False
         if await self.cog.config.restrict():
             user = interaction.user
-            all_users = []
-            in_adventure = False
-            for guild_session in self.cog._sessions.values():
-                if guild_session.ctx.message.id == self.ctx.message.id:
-                    continue
-                if guild_session.in_adventure(user):
-                    in_adventure = True
+            sessions = self.cog._user_sessions.get(user.id, {})
+            in_adventure = any(session is not self for session in sessions.values())
 
             if in_adventure:
-                user_id = f"{user.id}-{user.guild.id}"
                 # iterating through reactions here and removing them seems to be expensive
                 # so they can just keep their react on the adventures they can't join
                 await interaction.response.send_message(
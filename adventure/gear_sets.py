@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Tuple
+
+MULTIPLIERS = ("cpmult", "xpmult", "statmult")
+
+
+class GearSetIndex:
+    """Lookups built once from a theme's set bonuses and set items.
+
+    Parameters
+    ----------
+    set_bonuses : dict
+        The theme's ``set_bonuses.json``, mapping each set to its list of bonuses.
+    gear_sets : dict
+        The theme's ``tr_set.json``, mapping each set item to its data.
+    """
+
+    def __init__(self, set_bonuses: Mapping[str, List[dict]], gear_sets: Mapping[str, dict]):
+        # (set name, pieces owned) -> the sum of every bonus unlocked by that many pieces
+        self._bonuses: Dict[Tuple[str, int], Dict[str, float]] = {}
+        self._most_parts: Dict[str, int] = {}
+        self.max_parts: Dict[str, int] = {}
+        self.pieces: Dict[str, Dict[str, dict]] = {}
+        for set_name, bonuses in set_bonuses.items():
+            self.max_parts[set_name] = max((bonus.get("parts", 0) for bonus in bonuses), default=0)
+            # bonuses without parts can never be unlocked
+            most_parts = max((bonus.get("parts", 100) for bonus in bonuses), default=0)
+            self._most_parts[set_name] = most_parts
+            for parts in range(most_parts + 1):
+                self._bonuses[(set_name, parts)] = self._total_bonus(bonuses, parts)
+        for name, data in gear_sets.items():
+            self.pieces.setdefault(data.get("set"), {})[name] = data
+
+    @staticmethod
+    def _total_bonus(bonuses: List[dict], parts: int) -> Dict[str, float]:
+        total = {}
+        for bonus in bonuses:
+            if bonus.get("parts", 100) > parts:
+                continue
+            for key, value in bonus.items():
+                if key == "parts":
+                    continue
+                if key in MULTIPLIERS:
+                    # multipliers stack by adding how far each one is from 1
+                    if value < 0:
+                        continue
+                    value -= 1
+                total[key] = total.get(key, 0) + value
+        return total
+
+    def get_bonus(self, set_name: str, parts: int) -> Mapping[str, float]:
+        """Return the combined bonus for owning this many pieces of a set."""
+        most_parts = self._most_parts.get(set_name)
+        if most_parts is None:
+            return {}
+        return self._bonuses[(set_name, max(min(parts, most_parts), 0))]
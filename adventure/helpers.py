@@ -95,14 +95,7 @@ async def smart_embed(
 
 
 def check_running_adventure(ctx):
-    for guild_id, session in ctx.bot.get_cog("Adventure")._sessions.items():
-        user_ids: list = []
-        options = ["fight", "magic", "talk", "pray", "run"]
-        for i in options:
-            user_ids += [u.id for u in getattr(session, i)]
-        if ctx.author.id in user_ids:
-            return False
-    return True
+    return ctx.author.id not in ctx.bot.get_cog("Adventure")._user_sessions
 
 
 async def _title_case(phrase: str):
@@ -6,9 +6,10 @@ from typing import List
 import discord
 from redbot.core import commands
 from redbot.core.i18n import Translator
-from redbot.core.utils import AsyncIter
+from redbot.core.utils.chat_formatting import bold, humanize_number
 
 from .abc import AdventureMixin
+from .bank import bank
 from .helpers import smart_embed
 from .menus import (
     BaseMenu,
@@ -44,34 +45,7 @@ class LeaderboardCommands(AdventureMixin):
         `list` of `tuple`
             The sorted leaderboard in the form of :code:`(user_id, raw_account)`
         """
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=100):
-            user_data = {}
-            for item in ["lvl", "rebirths", "set_items"]:
-                if item not in v:
-                    v.update({item: 0})
-            for (vk, vi) in v.items():
-                if vk in ["lvl", "rebirths", "set_items"]:
-                    user_data.update({vk: vi})
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-        sorted_acc = sorted(
-            raw_accounts_new.items(),
-            key=lambda x: (x[1].get("rebirths", 0), x[1].get("lvl", 1), x[1].get("set_items", 0)),
-            reverse=True,
-        )
-        if positions is None:
-            return sorted_acc
-        else:
-            return sorted_acc[:positions]
+        return await self._leaderboard_index.get("rebirths", positions=positions, guild=guild)
 
     @commands.hybrid_command()
     @commands.bot_has_permissions(add_reactions=True, embed_links=True)
@@ -117,43 +91,7 @@ class LeaderboardCommands(AdventureMixin):
         """
         if keyword is None:
             keyword = "wins"
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=200):
-            user_data = {}
-            for item in ["adventures", "rebirths"]:
-                if item not in v:
-                    if item == "adventures":
-                        v.update({item: {keyword: 0}})
-                    else:
-                        v.update({item: 0})
-
-            for (vk, vi) in v.items():
-                if vk in ["rebirths"]:
-                    user_data.update({vk: vi})
-                elif vk in ["adventures"]:
-                    for (s, sv) in vi.items():
-                        if s == keyword:
-                            user_data.update(vi)
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-
-        sorted_acc = sorted(
-            raw_accounts_new.items(),
-            key=lambda x: (x[1].get(keyword, 0), x[1].get("rebirths", 0)),
-            reverse=True,
-        )
-        if positions is None:
-            return sorted_acc
-        else:
-            return sorted_acc[:positions]
+        return await self._leaderboard_index.get(keyword, positions=positions, guild=guild)
 
     async def get_global_negaverse_scoreboard(self, positions: int = None, guild: discord.Guild = None) -> List[tuple]:
         """Gets the bank's leaderboard.
@@ -176,33 +114,7 @@ class LeaderboardCommands(AdventureMixin):
         TypeError
             If the bank is guild-specific and no guild was specified
         """
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=200):
-            user_data = {}
-            for (vk, vi) in v.items():
-                if vk in ["nega"]:
-                    for (s, sv) in vi.items():
-                        user_data.update(vi)
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-
-        sorted_acc = sorted(
-            raw_accounts_new.items(),
-            key=lambda x: (x[1].get("wins", 0), x[1].get("loses", 0)),
-            reverse=True,
-        )
-        if positions is None:
-            return sorted_acc
-        else:
-            return sorted_acc[:positions]
+        return await self._leaderboard_index.get("nega", positions=positions, guild=guild)
 
     @commands.hybrid_command()
     @commands.bot_has_permissions(add_reactions=True, embed_links=True)
@@ -281,38 +193,25 @@ class LeaderboardCommands(AdventureMixin):
             If the bank is guild-specific and no guild was specified
         """
         current_week = date.today().isocalendar()[1]
-        keyword = "adventures"
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=200):
-            user_data = {}
-            for item in ["weekly_score"]:
-                if item not in v:
-                    if item == "weekly_score":
-                        v.update({item: {keyword: 0, "rebirths": 0}})
-
-            for (vk, vi) in v.items():
-                if vk in ["weekly_score"]:
-                    if vi.get("week", -1) == current_week:
-                        for (s, sv) in vi.items():
-                            if s in [keyword]:
-                                user_data.update(vi)
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
+        return await self._leaderboard_index.get("weekly", positions=positions, guild=guild, scope=(current_week,))
 
-        sorted_acc = sorted(
-            raw_accounts_new.items(),
-            key=lambda x: (x[1].get(keyword, 0), x[1].get("rebirths", 0)),
-            reverse=True,
+    @commands.hybrid_command()
+    @commands.bot_has_permissions(embed_links=True)
+    @commands.guild_only()
+    async def myrank(self, ctx: commands.Context, show_global: bool = False):
+        """Show your position on the leaderboards."""
+        guild = ctx.guild if not show_global else None
+        current_week = date.today().isocalendar()[1]
+        index = self._leaderboard_index
+        positions = {
+            _("Leaderboard"): await index.get_rank("rebirths", ctx.author.id, guild=guild),
+            _("Wins"): await index.get_rank("wins", ctx.author.id, guild=guild),
+            _("Negaverse"): await index.get_rank("nega", ctx.author.id, guild=guild),
+            _("This week"): await index.get_rank("weekly", ctx.author.id, guild=guild, scope=(current_week,)),
+            _("Economy"): await bank.get_leaderboard_position(ctx.author),
+        }
+        msg = "\n".join(
+            f"{name}: {bold('#' + humanize_number(pos)) if pos is not None else _('Unranked')}"
+            for name, pos in positions.items()
         )
-        if positions is None:
-            return sorted_acc
-        else:
-            return sorted_acc[:positions]
+        await smart_embed(ctx, msg)
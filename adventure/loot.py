@@ -94,7 +94,7 @@ class LootCommands(AdventureMixin):
                         # atomically save reduced loot count then lock again when saving inside
                         # open chests
                         c.treasure[redux] -= number
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        await c.save(ctx, self.config)
                         items = await self._open_chests(ctx, box_type, number, character=c)
                         msg = _("{}, you've opened the following items:\n\n").format(escape(ctx.author.display_name))
                         rows = []
@@ -107,7 +107,7 @@ class LootCommands(AdventureMixin):
                         # atomically save reduced loot count then lock again when saving inside
                         # open chests
                         c.treasure[redux] -= 1
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        await c.save(ctx, self.config)
                         await self._open_chest(ctx, ctx.author, box_type, character=c)
                         # returns item and msg
         if msgs:
@@ -153,16 +153,16 @@ class LootCommands(AdventureMixin):
         prefix_chance = rarity.prefix_chance()
         if prefix_chance is not None and random.random() <= prefix_chance:
             #  log.debug(f"Prefix %: {PREFIX_CHANCE[rarity]}")
-            prefix, prefix_stats = random.choice(list(self.PREFIXES.items()))
+            prefix, prefix_stats = random.choice(self._theme_data.prefixes)
             name += f"{prefix} "
             add_stats(prefix_stats)
 
-        material, material_stat = random.choice(list(self.MATERIALS[rarity.name].items()))
+        material, material_stat = random.choice(self._theme_data.materials[rarity.name])
         name += f"{material} "
         for stat in stats.keys():
             stats[stat] += material_stat
 
-        equipment, equipment_stats = random.choice(list(self.EQUIPMENT[slot.value].items()))
+        equipment, equipment_stats = random.choice(self._theme_data.equipment[slot.value])
         name += f"{equipment}"
         add_stats(equipment_stats)
 
@@ -170,7 +170,7 @@ class LootCommands(AdventureMixin):
         # only epic and above should have suffix with SUFFIX_CHANCE
         if suffix_chance is not None and random.random() <= suffix_chance:
             #  log.debug(f"Suffix %: {SUFFIX_CHANCE[rarity]}")
-            suffix, suffix_stats = random.choice(list(self.SUFFIXES.items()))
+            suffix, suffix_stats = random.choice(self._theme_data.suffixes)
             of_keyword = "of" if "the" not in suffix_stats else "of the"
             name += f" {of_keyword} {suffix}"
             add_stats(suffix_stats)
@@ -286,7 +286,7 @@ class LootCommands(AdventureMixin):
                         author=escape(ctx.author.display_name),
                         chests=c.treasure.ansi,
                     )
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                 else:
                     msg = failed_msg.format(author=escape(ctx.author.display_name), amount=converted)
             elif box_rarity is Rarities.rare and c.rebirths >= rebirth_rare:
@@ -304,7 +304,7 @@ class LootCommands(AdventureMixin):
                         author=escape(ctx.author.display_name),
                         chests=c.treasure.ansi,
                     )
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                 else:
                     msg = failed_msg.format(author=escape(ctx.author.display_name), amount=converted)
             elif box_rarity is Rarities.epic and c.rebirths >= rebirth_epic:
@@ -322,7 +322,7 @@ class LootCommands(AdventureMixin):
                         author=escape(ctx.author.display_name),
                         chests=c.treasure.ansi,
                     )
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                 else:
                     msg = failed_msg.format(author=escape(ctx.author.display_name), amount=converted)
             await ctx.send(box(msg, lang="ansi"))
@@ -343,7 +343,7 @@ class LootCommands(AdventureMixin):
             else:
                 items[item_name] = item
             await character.add_to_backpack(item)
-        await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+        await character.save(ctx, self.config)
         return items
 
     async def _open_chest(self, ctx: commands.Context, user: discord.User, chest_type: Rarities, character: Character):
@@ -411,7 +411,7 @@ class LootCommands(AdventureMixin):
                 ),
                 view=None,
             )
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
             return
         await self._clear_react(open_msg)
         if view.result.value == 2:
@@ -444,14 +444,14 @@ class LootCommands(AdventureMixin):
             await self._clear_react(open_msg)
             character.last_known_currency = await bank.get_balance(ctx.author)
             character.last_currency_check = time.time()
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
         elif view.result.value == 1:
             equiplevel = character.equip_level(item)
             if is_dev(ctx.author):
                 equiplevel = 0
             if not character.can_equip(item):
                 await character.add_to_backpack(item)
-                await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                await character.save(ctx, self.config)
                 return await smart_embed(
                     ctx=ctx,
                     message=_(
@@ -473,4 +473,4 @@ class LootCommands(AdventureMixin):
             equip_msg += f".\n{item.table(character)}"
             await open_msg.edit(content=box(equip_msg, lang="ansi"), view=None)
             character = await character.equip_item(item, False, is_dev(ctx.author))
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
@@ -888,9 +888,7 @@ class BackpackSelectEquip(discord.ui.Select):
                             put=getattr(c, equip.slot.char_slot).as_ansi(),
                         )
                     c = await c.equip_item(equip, True, is_dev(self.view.ctx.author))  # FIXME:
-                    await self.view.cog.config.user(self.view.ctx.author).set(
-                        await c.to_json(self.view.ctx, self.view.cog.config)
-                    )
+                    await c.save(self.view.ctx, self.view.cog.config)
                 equip_msg += ".\n\n"
         await smart_embed(message=box(equip_msg, lang="ansi"), interaction=interaction)
 
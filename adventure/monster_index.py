@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .rng import Random
+from .types import Monster
+
+
+class MonsterIndex:
+    """The monsters of a roster sorted by hp and by diplomacy.
+
+    Each stat keeps the monsters in order along with a running total of their
+    weights, so the monsters within a stat range are found with a bisect and
+    one of them is picked by weight with a single random number.
+
+    Parameters
+    ----------
+    monsters : Mapping[str, Monster]
+        The monster roster to index.
+    """
+
+    # The original selection added regular monsters to the pool 0 to 14 times
+    # and bosses once, these weights are the average of that.
+    MONSTER_WEIGHT = 7
+    BOSS_WEIGHT = 1
+
+    def __init__(self, monsters: Mapping[str, Monster]):
+        self.monsters = monsters
+        self.names: Tuple[str, ...] = tuple(monsters)
+        self._stats: Dict[str, Tuple[List[float], List[str], List[int]]] = {}
+        for stat in ("hp", "dipl"):
+            ordered = sorted(monsters.items(), key=lambda x: (x[1][stat], x[0]))
+            self._stats[stat] = (
+                [monster[stat] for _name, monster in ordered],
+                [name for name, _monster in ordered],
+                list(accumulate(self._weight(monster) for _name, monster in ordered)),
+            )
+
+    @classmethod
+    def _weight(cls, monster: Monster) -> int:
+        return cls.BOSS_WEIGHT if monster["boss"] or monster["miniboss"] else cls.MONSTER_WEIGHT
+
+    def choose(self, stat: str, low: float, high: float, rng: Random) -> Optional[str]:
+        """Pick a monster whose ``stat`` is between ``low`` and ``high``.
+
+        Returns
+        -------
+        Optional[str]
+            The name of the monster or ``None`` if no monster is in range.
+        """
+        values, names, totals = self._stats[stat]
+        start = bisect_left(values, low)
+        end = bisect_right(values, high)
+        if start >= end:
+            return None
+        offset = totals[start - 1] if start else 0
+        pick = offset + rng.randrange(totals[end - 1] - offset)
+        return names[bisect_right(totals, pick, start, end)]
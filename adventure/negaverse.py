@@ -196,7 +196,7 @@ class Negaverse(AdventureMixin):
                 )
                 if items:
                     item_string = "\n".join([f"{v} {i}" for v, i in items])
-                    await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                    await character.save(ctx, self.config)
                     looted_msg = _("{negachar} also stole the following items:\n\n{items}").format(
                         items=item_string, negachar=bold(negachar)
                     )
@@ -240,7 +240,7 @@ class Negaverse(AdventureMixin):
                 )
                 if items:
                     item_string = "\n".join([f"{v} {i}" for v, i in items])
-                    await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                    await character.save(ctx, self.config)
                     looted_msg = _("{negachar} also stole the following items:\n\n{items}").format(
                         items=item_string, negachar=bold(negachar)
                     )
@@ -351,7 +351,7 @@ class Negaverse(AdventureMixin):
                 )
                 if items:
                     item_string = "\n".join([f"{v} {i}" for v, i in items])
-                    await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                    await character.save(ctx, self.config)
                     looted_msg = _("{negachar} also stole the following items:\n\n{items}").format(
                         items=item_string, negachar=bold(negachar)
                     )
@@ -390,7 +390,7 @@ class Negaverse(AdventureMixin):
                     changed = True
 
                 if changed:
-                    await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                    await character.save(ctx, self.config)
 
     @_negaverse_command.error
     async def negaverse_error(self, ctx: commands.Context, error: Exception):
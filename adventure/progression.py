@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from .constants import REBIRTH_LVL, REBIRTH_STEP
+
+# The bonus each rebirth gives depends on which bracket the rebirth falls in.
+# Each bracket is (first rebirth, last rebirth or None if unbounded, bonus per rebirth).
+STAT_BRACKETS = ((1, 9, 2), (10, 19, 1), (20, 29, 5), (30, None, 3))
+MAX_LEVEL_BRACKETS = ((1, 10, 5), (11, 19, 10), (20, None, REBIRTH_STEP))
+MAX_LEVEL_CAP = 10000
+
+
+def _bracket_total(rebirths: int, brackets) -> int:
+    total = 0
+    for first, last, bonus in brackets:
+        top = rebirths if last is None else min(rebirths, last)
+        if top >= first:
+            total += (top - first + 1) * bonus
+    return total
+
+
+def stat_points(rebirths: int) -> int:
+    """Return the base stat points a character gets from their rebirths.
+
+    Every 10 rebirths give 5 points on top of the points given per rebirth.
+    """
+    return rebirths // 10 * 5 + _bracket_total(rebirths, STAT_BRACKETS)
+
+
+def max_level(rebirths: int) -> int:
+    """Return the highest level a character can reach with this many rebirths."""
+    rebirths = max(rebirths, 0)
+    if rebirths == 0:
+        return 5
+    return min(REBIRTH_LVL + _bracket_total(rebirths, MAX_LEVEL_BRACKETS), MAX_LEVEL_CAP)
+
+
+def skill_points(level: int, rebirths: int) -> int:
+    """Return the skill points a character has been given by their level and rebirths, spent or not."""
+    points_300 = level - 300 if level >= 300 else 0
+    points_200 = (level - 200) - points_300 if level >= 200 else 0
+    points_100 = (level - 100) - points_300 - points_200 if level >= 100 else 0
+    points_0 = level - points_100 - points_300 - points_200
+    if 200 <= level < 300:
+        points_200 += 1
+        points_0 -= 1
+    points = (rebirths * 10) + (points_300 * 1) + (points_200 * 5) + (points_100 * 1) + (points_0 * 0.5)
+    return int(points)
+
+
+def rebirth_cost(rebirths: int) -> int:
+    """Return how many credits a character needs to have to be able to rebirth."""
+    return 1000 * rebirths
+
+
+def backpack_slots(rebirths: int) -> int:
+    """Return how many different items a character can hold in their backpack."""
+    return 50 + (rebirths * 5)
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Generic, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple, TypeVar
+
+import discord
+from redbot.core import Config
+from redbot.core.utils import AsyncIter
+
+log = logging.getLogger("red.cogs.adventure")
+
+T = TypeVar("T")
+
+RankKey = Tuple[int, ...]
+
+
+class SortedList(Generic[T]):
+    """A list of unique values kept in ascending order.
+
+    Values are stored in small sorted buckets. A Fenwick tree over the bucket
+    sizes gives the number of values in front of any bucket, so inserting,
+    removing and ranking a value are all logarithmic in the number of buckets
+    plus a bisect inside a single bucket.
+    """
+
+    def __init__(self, iterable=(), load: int = 500):
+        self._load = load
+        self._lists: List[List[T]] = []
+        self._maxes: List[T] = []
+        self._tree: List[int] = []
+        self._len = 0
+        values = sorted(iterable)
+        for i in range(0, len(values), load):
+            self._lists.append(values[i : i + load])
+            self._maxes.append(values[min(i + load, len(values)) - 1])
+        self._len = len(values)
+        self._build_tree()
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[T]:
+        for bucket in self._lists:
+            yield from bucket
+
+    def __reversed__(self) -> Iterator[T]:
+        return self.irange_desc()
+
+    def _build_tree(self) -> None:
+        tree = [0] + [len(bucket) for bucket in self._lists]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, pos: int, delta: int) -> None:
+        i = pos + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _tree_prefix(self, pos: int) -> int:
+        """Number of values in the buckets before ``pos``."""
+        total = 0
+        i = pos
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def add(self, value: T) -> None:
+        if not self._maxes:
+            self._lists.append([value])
+            self._maxes.append(value)
+            self._len = 1
+            self._build_tree()
+            return
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            pos -= 1
+        bucket = self._lists[pos]
+        insort(bucket, value)
+        self._maxes[pos] = bucket[-1]
+        self._len += 1
+        if len(bucket) > self._load * 2:
+            self._lists.insert(pos + 1, bucket[self._load :])
+            del bucket[self._load :]
+            self._maxes[pos] = bucket[-1]
+            self._maxes.insert(pos + 1, self._lists[pos + 1][-1])
+            self._build_tree()
+        else:
+            self._tree_add(pos, 1)
+
+    def remove(self, value: T) -> None:
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            raise ValueError(f"{value!r} is not in the list")
+        bucket = self._lists[pos]
+        idx = bisect_left(bucket, value)
+        if idx == len(bucket) or bucket[idx] != value:
+            raise ValueError(f"{value!r} is not in the list")
+        del bucket[idx]
+        self._len -= 1
+        if not bucket:
+            del self._lists[pos]
+            del self._maxes[pos]
+            self._build_tree()
+        else:
+            self._maxes[pos] = bucket[-1]
+            self._tree_add(pos, -1)
+
+    def bisect_left(self, value: T) -> int:
+        """Number of values strictly smaller than ``value``."""
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._tree_prefix(pos) + bisect_left(self._lists[pos], value)
+
+    def irange_desc(self, upper: Optional[T] = None) -> Iterator[T]:
+        """Iterate over the values smaller than ``upper`` from the largest down."""
+        if upper is None:
+            pos, idx = len(self._lists) - 1, None
+        else:
+            pos = bisect_left(self._maxes, upper)
+            if pos == len(self._maxes):
+                pos, idx = pos - 1, None
+            else:
+                idx = bisect_left(self._lists[pos], upper)
+        if pos < 0:
+            return
+        bucket = self._lists[pos]
+        yield from reversed(bucket[:idx] if idx is not None else bucket)
+        for bucket in reversed(self._lists[:pos]):
+            yield from reversed(bucket)
+
+
+class LeaderboardEntry(NamedTuple):
+    """The subset of a user's data the leaderboards are ranked on."""
+
+    rebirths: int
+    lvl: int
+    set_items: int
+    adventures: Mapping[str, int]
+    nega: Mapping[str, int]
+    weekly_score: Mapping[str, int]
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> LeaderboardEntry:
+        return cls(
+            rebirths=data.get("rebirths", 0),
+            lvl=data.get("lvl", 0),
+            set_items=data.get("set_items", 0),
+            adventures=dict(data.get("adventures", {})),
+            nega=dict(data.get("nega", {})),
+            weekly_score=dict(data.get("weekly_score", {})),
+        )
+
+
+class Board(NamedTuple):
+    """How a leaderboard ranks and displays an entry.
+
+    ``key`` returns the sort key for an entry or ``None`` if the entry
+    is not part of this board, ``row`` returns the data shown for it.
+    """
+
+    key: Callable[[LeaderboardEntry], Optional[RankKey]]
+    row: Callable[[LeaderboardEntry], Dict[str, int]]
+
+
+def _adventure_board(keyword: str) -> Board:
+    return Board(
+        key=lambda e: (e.adventures.get(keyword, 0), e.rebirths),
+        row=lambda e: {keyword: 0, **e.adventures, "rebirths": e.rebirths},
+    )
+
+
+ADVENTURE_STATS = ("wins", "loses", "fight", "spell", "talk", "pray", "run", "fumbles")
+
+BOARDS: Dict[str, Board] = {
+    "rebirths": Board(
+        key=lambda e: (e.rebirths, e.lvl, e.set_items),
+        row=lambda e: {"lvl": e.lvl, "rebirths": e.rebirths, "set_items": e.set_items},
+    ),
+    **{stat: _adventure_board(stat) for stat in ADVENTURE_STATS},
+    "nega": Board(
+        key=lambda e: (e.nega.get("wins", 0), e.nega.get("loses", 0)) if e.nega else None,
+        row=lambda e: dict(e.nega),
+    ),
+    # The week leads the key so every week is its own contiguous range, see ``scope``
+    "weekly": Board(
+        key=lambda e: (
+            (e.weekly_score["week"], e.weekly_score.get("adventures", 0), e.weekly_score.get("rebirths", 0))
+            if "week" in e.weekly_score and "adventures" in e.weekly_score
+            else None
+        ),
+        row=lambda e: dict(e.weekly_score),
+    ),
+}
+
+
+class LeaderboardIndex:
+    """Keeps the ranking fields of every user in memory.
+
+    The index is filled from config the first time it is queried and is then
+    kept up to date by :meth:`update` whenever a character sheet is saved,
+    so the leaderboards never need to load full user documents.
+
+    Every board keeps a :class:`SortedList` of ``(*key, user_id)`` so that
+    top positions and a user's rank can be read without sorting.
+    """
+
+    def __init__(self, config: Config):
+        self._config = config
+        self._entries: Dict[int, LeaderboardEntry] = {}
+        self._keys: Dict[str, Dict[int, RankKey]] = {name: {} for name in BOARDS}
+        self._rankings: Dict[str, SortedList[RankKey]] = {name: SortedList() for name in BOARDS}
+        self._dropped: Set[int] = set()
+        self._ready = False
+        self._lock = asyncio.Lock()
+
+    def update(self, user_id: int, data: Mapping[str, Any]) -> None:
+        """Update the ranking fields of a user from their saved data."""
+        entry = LeaderboardEntry.from_json(data)
+        self._entries[user_id] = entry
+        self._dropped.discard(user_id)
+        for name, board in BOARDS.items():
+            key = board.key(entry)
+            old = self._keys[name].get(user_id)
+            new = None if key is None else (*key, user_id)
+            if old == new:
+                continue
+            if old is not None:
+                self._rankings[name].remove(old)
+                del self._keys[name][user_id]
+            if new is not None:
+                self._rankings[name].add(new)
+                self._keys[name][user_id] = new
+
+    def remove(self, user_id: int) -> None:
+        """Remove a user from every leaderboard."""
+        self._entries.pop(user_id, None)
+        for name in BOARDS:
+            old = self._keys[name].pop(user_id, None)
+            if old is not None:
+                self._rankings[name].remove(old)
+        if not self._ready:
+            self._dropped.add(user_id)
+
+    async def populate(self) -> None:
+        """Load the ranking fields of every user if this hasn't been done yet."""
+        if self._ready:
+            return
+        async with self._lock:
+            if self._ready:
+                return
+            raw_accounts = await self._config.all_users()
+            async for user_id, data in AsyncIter(raw_accounts.items(), steps=200):
+                # anything updated while we were loading is newer than what we read
+                if user_id in self._entries or user_id in self._dropped:
+                    continue
+                self._entries[user_id] = LeaderboardEntry.from_json(data)
+            for name, board in BOARDS.items():
+                keys = {}
+                for user_id, entry in self._entries.items():
+                    key = board.key(entry)
+                    if key is not None:
+                        keys[user_id] = (*key, user_id)
+                self._keys[name] = keys
+                self._rankings[name] = SortedList(keys.values())
+            self._dropped.clear()
+            self._ready = True
+            log.debug("Leaderboard index loaded with %s users", len(self._entries))
+
+    @staticmethod
+    def _upper(scope: RankKey) -> Optional[RankKey]:
+        # The smallest key that sorts after every key starting with ``scope``
+        if not scope:
+            return None
+        return (*scope[:-1], scope[-1] + 1)
+
+    async def get(
+        self,
+        name: str,
+        positions: Optional[int] = None,
+        guild: Optional[discord.Guild] = None,
+        scope: RankKey = (),
+    ) -> List[Tuple[int, Dict[str, int]]]:
+        """Gets the sorted entries of a leaderboard.
+
+        Parameters
+        ----------
+        name : str
+            The name of the leaderboard in :data:`BOARDS`.
+        positions : `int`
+            The number of positions to get
+        guild : discord.Guild
+            If this is provided, get only guild members on the leaderboard
+        scope : tuple
+            Only include entries whose key starts with these values.
+
+        Returns
+        -------
+        `list` of `tuple`
+            The sorted leaderboard in the form of :code:`(user_id, data)`
+        """
+        await self.populate()
+        board = BOARDS[name]
+        if guild is not None:
+            keys = self._keys[name]
+            ranked = [keys[m.id] for m in guild.members if m.id in keys and keys[m.id][: len(scope)] == scope]
+            ranked.sort(reverse=True)
+            if positions is not None:
+                ranked = ranked[:positions]
+        else:
+            ranked = []
+            for key in self._rankings[name].irange_desc(self._upper(scope)):
+                if key[: len(scope)] != scope or (positions is not None and len(ranked) >= positions):
+                    break
+                ranked.append(key)
+        return [(key[-1], board.row(self._entries[key[-1]])) for key in ranked]
+
+    async def get_rank(
+        self, name: str, user_id: int, guild: Optional[discord.Guild] = None, scope: RankKey = ()
+    ) -> Optional[int]:
+        """Get the position of a user on a leaderboard.
+
+        Parameters
+        ----------
+        name : str
+            The name of the leaderboard in :data:`BOARDS`.
+        user_id : int
+            The ID of the user to get the position of.
+        guild : discord.Guild
+            If this is provided, rank the user among guild members only.
+        scope : tuple
+            Only rank against entries whose key starts with these values.
+
+        Returns
+        -------
+        `int`
+            The position of the user, or ``None`` if they are not on the leaderboard.
+        """
+        await self.populate()
+        keys = self._keys[name]
+        key = keys.get(user_id)
+        if key is None or key[: len(scope)] != scope:
+            return None
+        if guild is not None:
+            return 1 + sum(
+                1 for m in guild.members if m.id in keys and keys[m.id] > key and keys[m.id][: len(scope)] == scope
+            )
+        ranking = self._rankings[name]
+        upper = self._upper(scope)
+        end = len(ranking) if upper is None else ranking.bisect_left(upper)
+        return end - ranking.bisect_left(key)
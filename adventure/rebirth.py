@@ -6,6 +6,7 @@ from redbot.core import commands
 from redbot.core.i18n import Translator
 from redbot.core.utils.chat_formatting import box, humanize_number
 
+from . import progression
 from .abc import AdventureMixin
 from .bank import bank
 from .charsheet import Character, has_funds
@@ -43,7 +44,7 @@ class RebirthCommands(AdventureMixin):
                 rebirth_cost = await self.config.guild(ctx.guild).rebirth_cost()
             else:
                 rebirth_cost = await self.config.rebirth_cost()
-            rebirthcost = 1000 * c.rebirths
+            rebirthcost = progression.rebirth_cost(c.rebirths)
             current_balance = c.bal
             last_known_currency = c.last_known_currency
             if last_known_currency and current_balance / last_known_currency < 0.25:
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Iterator, List, MutableMapping, NamedTuple, Optional, Tuple, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class RegistryStats(NamedTuple):
+    """How full a registry is and how many entries it has dropped."""
+
+    size: int
+    maxsize: Optional[int]
+    evictions: int
+    expirations: int
+
+
+class BoundedRegistry(MutableMapping[K, V]):
+    """A dict that forgets the entries nobody has used in a while.
+
+    Entries are kept in the order they were last read or written, so the
+    least recently used ones are always at the front. Writing a new entry
+    drops entries from the front that are older than ``ttl`` or that go over
+    ``maxsize``. An entry older than ``ttl`` is also treated as missing when
+    it's read.
+
+    Parameters
+    ----------
+    maxsize : Optional[int]
+        The most entries to keep, ``None`` for no limit.
+    ttl : Optional[float]
+        How many seconds an entry is kept after it was last used, ``None`` to
+        keep entries until they are pushed out by ``maxsize``.
+    can_evict : Optional[Callable[[V], bool]]
+        Returns whether a value can be dropped, values it refuses are kept
+        as if they were just used. Everything can be dropped if not given.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        can_evict: Optional[Callable[[V], bool]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._can_evict = can_evict
+        self._data: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+        # entries dropped to stay under maxsize and entries dropped for being older than ttl
+        self.evictions = 0
+        self.expirations = 0
+
+    def __getitem__(self, key: K) -> V:
+        value, last_used = self._data[key]
+        now = time.monotonic()
+        if self._expired(last_used, now) and self._evictable(value):
+            del self._data[key]
+            self.expirations += 1
+            raise KeyError(key)
+        self._data[key] = (value, now)
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        now = time.monotonic()
+        self._data[key] = (value, now)
+        self._data.move_to_end(key)
+        self._evict(now)
+
+    def __delitem__(self, key: K) -> None:
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[K]:
+        # a copy so expired entries can be dropped while iterating
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def values(self) -> List[V]:
+        """Returns every value held, without counting as a use of them."""
+        return [value for value, _last_used in self._data.values()]
+
+    def items(self) -> List[Tuple[K, V]]:
+        """Returns every entry held, without counting as a use of them."""
+        return [(key, value) for key, (value, _last_used) in self._data.items()]
+
+    def stats(self) -> RegistryStats:
+        return RegistryStats(len(self._data), self.maxsize, self.evictions, self.expirations)
+
+    def _expired(self, last_used: float, now: float) -> bool:
+        return self.ttl is not None and now - last_used > self.ttl
+
+    def _evictable(self, value: V) -> bool:
+        return self._can_evict is None or self._can_evict(value)
+
+    def _evict(self, now: float) -> None:
+        # every entry is looked at once at most, so entries that can't be dropped can't loop forever
+        for _ in range(len(self._data)):
+            key, (value, last_used) = next(iter(self._data.items()))
+            full = self.maxsize is not None and len(self._data) > self.maxsize
+            if not full and not self._expired(last_used, now):
+                return
+            if not self._evictable(value):
+                self._data[key] = (value, now)
+                self._data.move_to_end(key)
+                continue
+            del self._data[key]
+            if full:
+                self.evictions += 1
+            else:
+                self.expirations += 1
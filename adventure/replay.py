@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import json
+import logging
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+from . import engine
+from .combat import Action, ActionRegistry, CombatProfile
+from .constants import HeroClasses
+from .engine import Insight, MonsterStats, Outcome, Party
+from .rng import GameSeed, Random
+
+log = logging.getLogger("red.cogs.adventure")
+
+# the stream of the adventure's seed its result is rolled with
+RESULT_STREAM = "result"
+# bumped when the records are written differently
+REPLAY_VERSION = 1
+
+
+class Join(NamedTuple):
+    """A participant picking an action, or leaving the adventure when there is no action."""
+
+    user_id: int
+    action: Optional[Action]
+
+
+class AbilityUse(NamedTuple):
+    """A class ability used during the adventure."""
+
+    user_id: int
+    hc: HeroClasses
+    # what an insight rolled, out of 1
+    roll: Optional[float] = None
+
+
+class ReplayRecord(NamedTuple):
+    """Everything the result of an adventure is worked out from, and what it came to.
+
+    The monster is kept as the stats it ended up with rather than worked
+    out from the seed again, that would need the monsters of the theme the
+    adventure was played with.
+    """
+
+    seed: int
+    guild_id: int
+    challenge: str
+    monster: MonsterStats
+    # what the monster's stats and the rewards are multiplied by
+    monster_stats: float
+    joins: Tuple[Join, ...]
+    abilities: Tuple[AbilityUse, ...]
+    # the profiles the rolls were made with
+    profiles: Tuple[CombatProfile, ...]
+    insight: Insight = (0, None)
+    requirements: Optional[Tuple[str, ...]] = None
+    reacted: bool = False
+    # the outcome, to check a replay against
+    attack: float = 0
+    diplomacy: float = 0
+    magic: float = 0
+    crits: Tuple[int, ...] = ()
+    fumbles: Tuple[int, ...] = ()
+    reward: float = 0
+    version: int = REPLAY_VERSION
+
+    def party(self) -> Party:
+        """Puts the participants on their actions in the order they joined them."""
+        actions: ActionRegistry[int] = ActionRegistry()
+        for join in self.joins:
+            if join.action is None:
+                actions.remove(join.user_id)
+            else:
+                actions.set(join.user_id, join.action)
+        return Party(
+            actions.members(Action.fight),
+            actions.members(Action.talk),
+            actions.members(Action.pray),
+            actions.members(Action.magic),
+            actions.members(Action.run),
+            {profile.user_id: profile for profile in self.profiles if profile.user_id in actions},
+        )
+
+    def matches(self, outcome: Outcome) -> bool:
+        """Returns whether the outcome is exactly the one recorded."""
+        return (
+            outcome.attack == self.attack
+            and outcome.diplomacy == self.diplomacy
+            and outcome.magic == self.magic
+            and tuple(outcome.crits) == self.crits
+            and tuple(outcome.fumbles) == self.fumbles
+            and _reward(outcome, self.monster_stats) == self.reward
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        data = self._asdict()
+        data["monster"] = list(self.monster)
+        data["joins"] = [[join.user_id, join.action and join.action.name] for join in self.joins]
+        data["abilities"] = [[use.user_id, use.hc.value, use.roll] for use in self.abilities]
+        data["profiles"] = [_profile_to_json(profile) for profile in self.profiles]
+        roll, profile = self.insight
+        data["insight"] = [roll, profile and _profile_to_json(profile)]
+        return data
+
+    @classmethod
+    def from_outcome(
+        cls,
+        seed: int,
+        guild_id: int,
+        challenge: str,
+        monster_stats: float,
+        joins: Sequence[Join],
+        abilities: Sequence[AbilityUse],
+        outcome: Outcome,
+        *,
+        insight: Insight = (0, None),
+        requirements: Optional[Sequence[str]] = None,
+        reacted: bool = False,
+    ) -> ReplayRecord:
+        """Builds the record of an adventure that was just resolved."""
+        profiles = outcome.party.profiles
+        return cls(
+            seed=seed,
+            guild_id=guild_id,
+            challenge=challenge,
+            monster=outcome.monster,
+            monster_stats=monster_stats,
+            joins=tuple(joins),
+            abilities=tuple(abilities),
+            profiles=tuple(profiles.values()),
+            insight=insight,
+            requirements=None if requirements is None else tuple(requirements),
+            reacted=reacted,
+            attack=outcome.attack,
+            diplomacy=outcome.diplomacy,
+            magic=outcome.magic,
+            # everyone who crit or fumbled made a roll so they all have a profile
+            crits=tuple(profiles[player].user_id for player in outcome.crits),
+            fumbles=tuple(profiles[player].user_id for player in outcome.fumbles),
+            reward=_reward(outcome, monster_stats),
+        )
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> ReplayRecord:
+        roll, profile = data["insight"]
+        requirements = data["requirements"]
+        return cls(
+            seed=data["seed"],
+            guild_id=data["guild_id"],
+            challenge=data["challenge"],
+            monster=MonsterStats(*data["monster"]),
+            monster_stats=data["monster_stats"],
+            joins=tuple(Join(user_id, action and Action[action]) for user_id, action in data["joins"]),
+            abilities=tuple(AbilityUse(user_id, HeroClasses(hc), roll) for user_id, hc, roll in data["abilities"]),
+            profiles=tuple(_profile_from_json(profile) for profile in data["profiles"]),
+            insight=(roll, profile and _profile_from_json(profile)),
+            requirements=None if requirements is None else tuple(requirements),
+            reacted=data["reacted"],
+            attack=data["attack"],
+            diplomacy=data["diplomacy"],
+            magic=data["magic"],
+            crits=tuple(data["crits"]),
+            fumbles=tuple(data["fumbles"]),
+            reward=data["reward"],
+            version=data["version"],
+        )
+
+
+def result_rng(seed: int) -> Random:
+    """Returns the generator the result of the adventure with this seed is rolled with."""
+    return Random(GameSeed.from_int(seed), RESULT_STREAM)
+
+
+def replay(record: ReplayRecord) -> Outcome:
+    """Works out the result of a recorded adventure again.
+
+    Nothing but the record is needed, the participants are their user ids
+    in the outcome. It's the same as the recorded one unless the rules
+    changed since the adventure was played, see `ReplayRecord.matches`.
+    """
+    return engine.resolve(
+        record.monster,
+        record.party(),
+        result_rng(record.seed),
+        insight=record.insight,
+        requirements=record.requirements,
+        reacted=record.reacted,
+    )
+
+
+class ReplayLog:
+    """The replay records of the latest adventures, one JSON object per line.
+
+    The file is rotated once it gets bigger than ``max_bytes``, keeping
+    ``backups`` older files next to it.
+    """
+
+    def __init__(self, path: Path, *, max_bytes: int = 4 * 1024 * 1024, backups: int = 4):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._handler: Optional[RotatingFileHandler] = None
+
+    def append(self, record: ReplayRecord):
+        """Writes the record at the end of the log.
+
+        Records are a few hundred bytes, they are written right away rather
+        than in an executor.
+        """
+        line = json.dumps(record.to_json(), separators=(",", ":"))
+        try:
+            if self._handler is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._handler = RotatingFileHandler(
+                    self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8", delay=True
+                )
+            self._handler.handle(logging.makeLogRecord({"msg": line}))
+        except OSError:
+            log.exception("Error writing the replay of an adventure to %s", self.path)
+
+    def records(self) -> Iterator[ReplayRecord]:
+        """Reads every record still in the log, oldest first."""
+        paths = [self.path.with_name(f"{self.path.name}.{i}") for i in range(self.backups, 0, -1)]
+        for path in paths + [self.path]:
+            if not path.exists():
+                continue
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield ReplayRecord.from_json(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        log.warning("Skipping a replay record that couldn't be read in %s", path)
+
+    def find(self, seed: int) -> Optional[ReplayRecord]:
+        """Returns the latest record of the adventure with this seed."""
+        found = None
+        for replay_record in self.records():
+            if replay_record.seed == seed:
+                found = replay_record
+        return found
+
+    def close(self):
+        if self._handler is not None:
+            self._handler.close()
+            self._handler = None
+
+
+def _reward(outcome: Outcome, monster_stats: float) -> float:
+    if not outcome.success:
+        return 0
+    party = outcome.party
+    people = len(party.fight) + len(party.talk) + len(party.pray) + len(party.magic) + len(party.run)
+    return engine.reward_amount(outcome, monster_stats, people)
+
+
+def _profile_to_json(profile: CombatProfile) -> Dict[str, Any]:
+    data = profile._asdict()
+    data["hc"] = profile.hc.value
+    return data
+
+
+def _profile_from_json(data: Dict[str, Any]) -> CombatProfile:
+    data = dict(data)
+    data["hc"] = HeroClasses(data["hc"])
+    data["sets"] = tuple(data.get("sets", ()))
+    data["gear"] = tuple(data.get("gear", ()))
+    return CombatProfile(**data)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import random
+from typing import Optional
 
 from .adventureresult import StatRange
 
@@ -12,11 +13,19 @@ class Random(random.Random):
 
     This could later be used to adjust rng in some way if we want.
     For now we just want determinism and reproducability.
+
+    A stream name gives a generator of its own made from the same seed, so
+    one part of the game can be reproduced without the draws made before it.
     """
 
-    def __init__(self, seed: GameSeed):
+    def __init__(self, seed: GameSeed, stream: Optional[str] = None):
         self.internal_seed = seed
-        super().__init__(int(seed))
+        self.stream = stream
+        super().__init__(int(seed) if stream is None else f"{int(seed)}-{stream}")
+
+    def derive(self, stream: str) -> Random:
+        """Returns the generator of the given stream of this seed."""
+        return Random(self.internal_seed, stream)
 
 
 class GameSeed:
@@ -32,6 +41,8 @@ class GameSeed:
     The next 20 bits contain the min and max. These are limited to 16383 bits.
     Since the base monsters cap at 560 stat this should be good enough.
     Custom monsters with higher stats will break this if they go above 16383.
+    The win percentage takes the last 7 bits and the 2 bits above it hold
+    the version of the monster selection so that old seeds still give the same monster.
     """
 
     TIMESTAMP_SHIFT = 38
@@ -43,10 +54,15 @@ class GameSeed:
     # We want to encode the min and max stat within half of what is left
     # all of these variables are included to more easily adjust this
     # If any value is changed past adventure results RNG will differ
+    VERSION_SHIFT = 7
+    # Seeds made before versions were added have no version bits and are version 0
+    # Version 1 picks the monster from a MonsterIndex instead of building a list of names
+    LATEST_VERSION = 1
 
-    def __init__(self, message_id: int, stats: StatRange):
+    def __init__(self, message_id: int, stats: StatRange, version: int = LATEST_VERSION):
         self.stat_range = stats
         self.message_id = message_id
+        self.version = version
 
     def __int__(self):
         ret = self.timestamp() << self.TIMESTAMP_SHIFT
@@ -59,7 +75,8 @@ class GameSeed:
         win_pct = round(self.win_pct() * 100)
         # Python doesn't like converting some values to a float and casting to int
         # will cause it to round down even though it should round up
-        ret += hp + min_s + max_s + win_pct
+        version = self.version << self.VERSION_SHIFT
+        ret += hp + min_s + max_s + version + win_pct
         return ret
 
     def __index__(self):
@@ -100,8 +117,10 @@ class GameSeed:
         max_stat = number >> cls.MAX_STAT_SHIFT
 
         number ^= max_stat << cls.MAX_STAT_SHIFT
+        version = number >> cls.VERSION_SHIFT
+        number ^= version << cls.VERSION_SHIFT
         win_percent = number / 100
         # Leaving us with just the max stat as the last 10 bits of data
         stat_type = "hp" if hp_or_diplo else "dipl"
         stats = StatRange(stat_type=stat_type, min_stat=min_stat, max_stat=max_stat, win_percent=win_percent)
-        return cls(message_id, stats)
+        return cls(message_id, stats, version=version)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import inspect
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+log = logging.getLogger("red.cogs.adventure")
+
+Callback = Callable[[], Optional[Awaitable[Any]]]
+
+
+class Scheduler:
+    """Calls callbacks when they are due from a single task.
+
+    Timers are kept in a heap ordered by when they are due so the task only
+    wakes up for the earliest one, or when a timer earlier than it is added.
+    Every timer has a key, scheduling a key again replaces its timer.
+    Replaced and cancelled timers are left in the heap and skipped once
+    they reach the top of it.
+
+    Callbacks are called without arguments, if they return an awaitable
+    it's run in its own task so a slow callback doesn't hold up the others.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._timers: Dict[Hashable, Tuple[float, int, Callback]] = {}
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Future] = set()
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def start(self):
+        """Starts the task running the timers if it isn't running already."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    def stop(self):
+        """Stops running timers and cancels the callbacks that are still running."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._running:
+            task.cancel()
+        self._running.clear()
+        self._timers.clear()
+        self._heap.clear()
+
+    def schedule(self, key: Hashable, delay: float, callback: Callback) -> float:
+        """Calls ``callback`` in ``delay`` seconds, replacing the timer ``key`` had.
+
+        Returns
+        -------
+        float
+            The :func:`time.monotonic` time the callback is due at.
+        """
+        when = time.monotonic() + max(delay, 0)
+        seq = next(self._counter)
+        self._timers[key] = (when, seq, callback)
+        heapq.heappush(self._heap, (when, seq, key))
+        if len(self._heap) > 2 * len(self._timers) + 64:
+            # drop the timers that were replaced or cancelled so they don't pile up
+            self._heap = [(w, s, k) for w, s, k in self._heap if self._timers.get(k, (0, None))[1] == s]
+            heapq.heapify(self._heap)
+        if self._wakeup is not None and self._heap[0][1] == seq:
+            self._wakeup.set()
+        return when
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancels the timer of ``key``, returns `False` if it had none."""
+        return self._timers.pop(key, None) is not None
+
+    def remaining(self, key: Hashable) -> Optional[float]:
+        """Returns how many seconds are left before the timer of ``key`` is due, if it has one."""
+        timer = self._timers.get(key)
+        if timer is None:
+            return None
+        return max(timer[0] - time.monotonic(), 0)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            self._call_due()
+            timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    def _call_due(self):
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            when, seq, key = heapq.heappop(self._heap)
+            timer = self._timers.get(key)
+            if timer is None or timer[1] != seq:
+                continue
+            del self._timers[key]
+            try:
+                result = timer[2]()
+            except Exception as exc:
+                log.exception("Error running the timer %r", key, exc_info=exc)
+                continue
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._running.add(task)
+                task.add_done_callback(self._callback_done)
+
+    def _callback_done(self, task: asyncio.Future):
+        self._running.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.exception("Error running a timer", exc_info=task.exception())
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from beautifultable import ALIGN_LEFT, BeautifulTable
+
+from . import engine, progression
+from .adventureresult import AdventureResults
+from .combat import Action, CombatProfile
+from .constants import HeroClasses
+from .monster_index import MonsterIndex
+from .replay import RESULT_STREAM
+from .rng import GameSeed, Random
+from .theme import ThemeData
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_THEME = Path(__file__).parent / "data" / "default"
+DISCORD_EPOCH = 1420070400000
+# 2023-01-01, seeded runs start from a fixed time so their seeds are the same on every run
+START_TIME = 1672531200000
+# how far apart adventures are in a guild
+ADVENTURE_INTERVAL = 10 * 60 * 1000
+# the class each class usually picks, the others go with their best stat
+CLASS_ACTIONS = {
+    HeroClasses.berserker: Action.fight,
+    HeroClasses.wizard: Action.magic,
+    HeroClasses.bard: Action.talk,
+    HeroClasses.cleric: Action.pray,
+}
+
+
+class Settings(NamedTuple):
+    """What to simulate and how the synthetic characters are made."""
+
+    adventures: int = 1000
+    guilds: int = 4
+    party: Tuple[int, int] = (1, 5)
+    rebirths: Tuple[int, int] = (0, 40)
+    # the level of a character as a fraction of their max level
+    level: Tuple[float, float] = (0.3, 1.0)
+    # the most gear a character has per stat for each rebirth they have
+    gear: int = 8
+    # how often a character with a class ability has it active
+    ability_rate: float = 0.5
+    # how many recent adventures the stat range of the next monster is based on
+    num_raids: int = 20
+    seed: Optional[int] = None
+    theme: Path = DEFAULT_THEME
+
+
+class AdventureRecord(NamedTuple):
+    """The outcome of one simulated adventure."""
+
+    monster: str
+    attribute: str
+    win: bool
+    damage: int
+    diplomacy: int
+    reward: float
+
+
+class Distribution(NamedTuple):
+    count: int
+    mean: float
+    p10: float
+    p50: float
+    p90: float
+
+    @classmethod
+    def of(cls, values: Sequence[float]) -> Distribution:
+        if not values:
+            return cls(0, 0, 0, 0, 0)
+        if np is not None:
+            p10, p50, p90 = np.percentile(values, [10, 50, 90])
+            return cls(len(values), float(np.mean(values)), float(p10), float(p50), float(p90))
+        if len(values) == 1:
+            return cls(1, values[0], values[0], values[0], values[0])
+        deciles = statistics.quantiles(values, n=10, method="inclusive")
+        return cls(len(values), statistics.fmean(values), deciles[0], deciles[4], deciles[8])
+
+
+class CharacterSampler:
+    """Makes synthetic characters and parties.
+
+    Seeded runs use a :class:`random.Random` so they give the same parties
+    on every run. Otherwise characters are made in batches with NumPy when
+    it's installed.
+    """
+
+    BATCH = 4096
+
+    def __init__(self, settings: Settings, pets: Sequence[int], seed: Optional[str] = None):
+        self.settings = settings
+        # the crit bonus of each pet a ranger may have
+        self.pets = pets
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng() if np is not None and seed is None else None
+        self._batch: List[CombatProfile] = []
+
+    def party(self) -> List[Tuple[CombatProfile, Action]]:
+        size = self.rng.randint(*self.settings.party)
+        party = []
+        for user_id in range(size):
+            profile = self.character()._replace(user_id=user_id)
+            party.append((profile, self.action(profile)))
+        return party
+
+    def character(self) -> CombatProfile:
+        if self.np_rng is None:
+            rebirths = self.rng.randint(*self.settings.rebirths)
+            return self._build(rebirths, self.rng.uniform(*self.settings.level), *(self.rng.random() for _ in range(7)))
+        if not self._batch:
+            self._batch = self._sample_batch()
+        return self._batch.pop()
+
+    def action(self, p: CombatProfile) -> Action:
+        if p.hc in CLASS_ACTIONS:
+            return CLASS_ACTIONS[p.hc]
+        best = max(p.total_att, p.total_int, p.total_cha)
+        if best == p.total_att:
+            return Action.fight
+        return Action.magic if best == p.total_int else Action.talk
+
+    def _sample_batch(self) -> List[CombatProfile]:
+        low, high = self.settings.rebirths
+        rebirths = self.np_rng.integers(low, high, size=self.BATCH, endpoint=True)
+        levels = self.np_rng.uniform(*self.settings.level, size=self.BATCH)
+        rolls = self.np_rng.random(size=(self.BATCH, 7))
+        return [self._build(int(r), float(lvl), *row) for r, lvl, row in zip(rebirths, levels, rolls.tolist())]
+
+    def _build(
+        self,
+        rebirths: int,
+        level: float,
+        class_roll: float,
+        split_a: float,
+        split_b: float,
+        gear_roll: float,
+        luck_roll: float,
+        ability_roll: float,
+        pet_roll: float,
+    ) -> CombatProfile:
+        lvl = max(int(progression.max_level(rebirths) * level), 1)
+        classes = list(HeroClasses)
+        hc = classes[int(class_roll * len(classes))] if lvl >= 10 else HeroClasses.hero
+        # skill points are split at two random points between attack, intelligence and charisma
+        points = progression.skill_points(lvl, rebirths)
+        first, second = sorted((split_a, split_b))
+        skill_att = int(points * first)
+        skill_int = int(points * (second - first))
+        skill_cha = points - skill_att - skill_int
+        base = progression.stat_points(rebirths)
+        gear = int(self.settings.gear * (rebirths + 1) * gear_roll)
+        # characters are strongest in the stat their class acts with
+        stats = [base + gear // 2, base + gear // 2, base + gear // 2]
+        main = {Action.fight: 0, Action.magic: 1, Action.talk: 2}.get(CLASS_ACTIONS.get(hc), int(split_a * 3))
+        stats[main] = base + gear
+        pet_crit = 0
+        if hc is HeroClasses.ranger and self.pets:
+            pet_crit = self.pets[int(pet_roll * len(self.pets))]
+        return CombatProfile(
+            user_id=0,
+            hc=hc,
+            ability=hc.has_action and ability_roll < self.settings.ability_rate,
+            total_att=stats[0] + skill_att,
+            total_int=stats[1] + skill_int,
+            total_cha=stats[2] + skill_cha,
+            dex=int(gear * luck_roll) // 4,
+            luck=int(gear * (1 - luck_roll)) // 4,
+            rebirths=rebirths,
+            pet_crit=pet_crit,
+        )
+
+
+def simulate_guild(settings: Settings, guild_id: int) -> List[AdventureRecord]:
+    """Plays out the adventures of one guild, each one picks its monster from how the last ones went."""
+    theme = ThemeData.load(settings.theme.name, settings.theme, DEFAULT_THEME)
+    roster = dict(sorted(theme.monsters.items(), key=lambda x: x[0]))
+    index = MonsterIndex(roster)
+    attribs = theme.data["ATTRIBS"]
+    # pets that need a set are left out, the synthetic characters have no gear sets
+    bonuses = [pet.get("bonuses", {}) for pet in theme.data["PETS"].values()]
+    pets = [bonus.get("crit", 0) for bonus in bonuses if "req" not in bonus]
+    seed = None if settings.seed is None else f"{settings.seed}-{guild_id}"
+    sampler = CharacterSampler(settings, pets, seed)
+    results = AdventureResults(settings.num_raids)
+    guild = SimpleNamespace(id=guild_id)
+    message_id = (START_TIME - DISCORD_EPOCH) << 22
+    records = []
+    for _ in range(settings.adventures):
+        message_id += ADVENTURE_INTERVAL << 22
+        party = sampler.party()
+        leader = party[0][0]
+        # the same steps as starting an adventure, in the same order so the seed is used the same way
+        stat_range = results.get_stat_range(guild)
+        if stat_range.max_stat <= 0:
+            stat_range.max_stat = max(leader.total_att, leader.total_int, leader.total_cha) * 5
+        rng = Random(GameSeed(message_id, stat_range))
+        monster_stats, _transcended = engine.monster_scaling(rng.randint(0, 10), leader.rebirths)
+        challenge = index.choose(
+            stat_range.stat_type, int(stat_range.min_stat) * 0.5, int(stat_range.max_stat) * 1.2, rng
+        )
+        if challenge is None:
+            challenge = rng.choice(index.names)
+        attribute = rng.choice(list(attribs))
+        monster = engine.dynamic_monster_stats(dict(roster[challenge]), rng)
+        if leader.rebirths >= 30:
+            easy_mode = False
+        elif leader.rebirths >= 20:
+            easy_mode = bool(rng.getrandbits(1))
+        else:
+            easy_mode = True
+        if not easy_mode and rng.randint(0, 100) == 25:
+            # nothing to fight, there's no outcome to count
+            continue
+        members = {action: [] for action in Action}
+        for profile, action in party:
+            members[action].append(profile.user_id)
+        outcome = engine.resolve(
+            engine.MonsterStats.scaled(monster, attribs[attribute], monster_stats),
+            engine.Party(
+                members[Action.fight],
+                members[Action.talk],
+                members[Action.pray],
+                members[Action.magic],
+                members[Action.run],
+                {profile.user_id: profile for profile, _action in party},
+            ),
+            rng.derive(RESULT_STREAM),
+            requirements=roster[challenge]["miniboss"].get("requirements") if roster[challenge]["miniboss"] else None,
+        )
+        people = len(party)
+        diplomacy = int(outcome.diplomacy)
+        if outcome.damage >= diplomacy:
+            results.add_result(guild, "attack", outcome.damage, people, outcome.slain)
+        else:
+            results.add_result(guild, "talk", diplomacy, people, outcome.persuaded)
+        reward = engine.reward_amount(outcome, monster_stats, people) if outcome.success else 0
+        records.append(AdventureRecord(challenge, attribute, outcome.success, outcome.damage, diplomacy, reward))
+    return records
+
+
+def simulate(settings: Settings, workers: Optional[int] = None) -> List[AdventureRecord]:
+    """Simulates every guild, in a process pool when there is more than one worker.
+
+    The records are always in the same order so seeded runs give the same results.
+    """
+    workers = min(workers or os.cpu_count() or 1, settings.guilds)
+    guilds = range(settings.guilds)
+    if workers <= 1:
+        runs = [simulate_guild(settings, guild_id) for guild_id in guilds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            runs = list(executor.map(simulate_guild, [settings] * settings.guilds, guilds))
+    return [record for run in runs for record in run]
+
+
+def summarize(records: Sequence[AdventureRecord], key: str) -> Dict[str, Dict[str, object]]:
+    """Groups the records by monster or attribute and gets their win rate, damage and reward distributions."""
+    groups: Dict[str, List[AdventureRecord]] = {}
+    for record in records:
+        groups.setdefault(getattr(record, key), []).append(record)
+    summary = {}
+    for name, group in sorted(groups.items(), key=lambda x: -len(x[1])):
+        summary[name] = {
+            "adventures": len(group),
+            "win_rate": sum(record.win for record in group) / len(group),
+            "damage": Distribution.of([record.damage for record in group])._asdict(),
+            "diplomacy": Distribution.of([record.diplomacy for record in group])._asdict(),
+            "reward": Distribution.of([record.reward for record in group if record.win])._asdict(),
+        }
+    return summary
+
+
+def _table(title: str, summary: Dict[str, Dict[str, object]]) -> str:
+    table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
+    table.set_style(BeautifulTable.STYLE_RST)
+    table.columns.header = [title, "Adventures", "Win %", "Damage p10/p50/p90", "Diplomacy p50", "Reward mean"]
+    for name, stats in summary.items():
+        damage = stats["damage"]
+        table.rows.append(
+            [
+                name.strip(),
+                stats["adventures"],
+                f"{stats['win_rate'] * 100:.1f}",
+                f"{damage['p10']:.0f}/{damage['p50']:.0f}/{damage['p90']:.0f}",
+                f"{stats['diplomacy']['p50']:.0f}",
+                f"{stats['reward']['mean']:.0f}",
+            ]
+        )
+    return str(table)
+
+
+def _range(cast):
+    def parse(value: str):
+        low, _sep, high = value.partition("-")
+        return cast(low), cast(high or low)
+
+    return parse
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m adventure.simulate",
+        description="Simulate adventures with synthetic parties to see how the monsters are balanced.",
+    )
+    defaults = Settings()
+    parser.add_argument("--adventures", type=int, default=defaults.adventures, help="adventures per guild")
+    parser.add_argument("--guilds", type=int, default=defaults.guilds, help="guilds simulated side by side")
+    parser.add_argument("--party", type=_range(int), default=defaults.party, help="party size, like 1-5")
+    parser.add_argument("--rebirths", type=_range(int), default=defaults.rebirths, help="rebirths, like 0-40")
+    parser.add_argument(
+        "--level", type=_range(float), default=defaults.level, help="level as a fraction of max level, like 0.3-1"
+    )
+    parser.add_argument("--gear", type=int, default=defaults.gear, help="most gear per stat for each rebirth")
+    parser.add_argument("--ability-rate", type=float, default=defaults.ability_rate)
+    parser.add_argument("--num-raids", type=int, default=defaults.num_raids)
+    parser.add_argument("--seed", type=int, default=None, help="make the parties the same on every run")
+    parser.add_argument("--theme", type=Path, default=DEFAULT_THEME, help="the folder of the theme to use")
+    parser.add_argument("--workers", type=int, default=None, help="processes to use, defaults to the CPU count")
+    parser.add_argument("--json", type=Path, default=None, help="also write the results to this file")
+    args = parser.parse_args(argv)
+    settings = Settings(
+        adventures=args.adventures,
+        guilds=args.guilds,
+        party=args.party,
+        rebirths=args.rebirths,
+        level=args.level,
+        gear=args.gear,
+        ability_rate=args.ability_rate,
+        num_raids=args.num_raids,
+        seed=args.seed,
+        theme=args.theme,
+    )
+    records = simulate(settings, args.workers)
+    if not records:
+        print("No adventures had a monster to fight.")
+        return
+    monsters = summarize(records, "monster")
+    attributes = summarize(records, "attribute")
+    wins = sum(record.win for record in records)
+    print(f"{len(records)} adventures, {wins / len(records) * 100:.1f}% won\n")
+    print(_table("Monster", monsters))
+    print()
+    print(_table("Attribute", attributes))
+    if args.json is not None:
+        with args.json.open("w") as f:
+            settings_data = {**settings._asdict(), "theme": str(settings.theme)}
+            json.dump({"settings": settings_data, "monsters": monsters, "attributes": attributes}, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
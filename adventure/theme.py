@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Mapping, Tuple
+
+from .gear_sets import GearSetIndex
+
+log = logging.getLogger("red.cogs.adventure")
+
+# The attribute the cog exposes each file as, and the file it's loaded from
+THEME_FILES: Dict[str, str] = {
+    "PETS": "pets.json",
+    "ATTRIBS": "attribs.json",
+    "MONSTERS": "monsters.json",
+    "AS_MONSTERS": "as_monsters.json",
+    "LOCATIONS": "locations.json",
+    "RAISINS": "raisins.json",
+    "THREATEE": "threatee.json",
+    "TR_GEAR_SET": "tr_set.json",
+    "PREFIXES": "prefixes.json",
+    "MATERIALS": "materials.json",
+    "EQUIPMENT": "equipment.json",
+    "SUFFIXES": "suffixes.json",
+    "SET_BONUSES": "set_bonuses.json",
+    "ACTION_RESPONSE": "action_response.json",
+}
+# A theme is invalid if any of these are empty, a theme can go without ascended monsters
+REQUIRED_FILES = tuple(attr for attr in THEME_FILES if attr not in ("AS_MONSTERS", "ACTION_RESPONSE"))
+
+
+class InvalidTheme(Exception):
+    """Raised when a theme's files are missing data."""
+
+
+class ThemeData:
+    """The data of a theme along with the lookups built from it.
+
+    Loading reads from disk so it's meant to be run in a thread with
+    :meth:`load`. A theme is never changed once it's built, reloading it
+    builds a new instance which the cog swaps in all at once.
+
+    Parameters
+    ----------
+    name : str
+        The name of the theme.
+    files : dict
+        The path each file of the theme was loaded from.
+    data : dict
+        The contents of each file, keyed like :data:`THEME_FILES`.
+    mtimes : dict
+        The modification time of each file when it was read.
+    """
+
+    def __init__(self, name: str, files: Dict[str, Path], data: Dict[str, Any], mtimes: Dict[Path, float]):
+        self.name = name
+        self.files = files
+        self.data = data
+        self.mtimes = mtimes
+        self.gear_sets = GearSetIndex(data["SET_BONUSES"], data["TR_GEAR_SET"])
+        self.monsters: Mapping[str, dict] = {**data["MONSTERS"], **data["AS_MONSTERS"]}
+        # pools for random item generation, so loot doesn't build a list on every roll
+        self.prefixes: Tuple[Tuple[str, dict], ...] = tuple(data["PREFIXES"].items())
+        self.suffixes: Tuple[Tuple[str, dict], ...] = tuple(data["SUFFIXES"].items())
+        self.materials: Dict[str, Tuple[Tuple[str, int], ...]] = {
+            rarity: tuple(materials.items()) for rarity, materials in data["MATERIALS"].items()
+        }
+        self.equipment: Dict[str, Tuple[Tuple[str, dict], ...]] = {
+            slot: tuple(equipment.items()) for slot, equipment in data["EQUIPMENT"].items()
+        }
+
+    @staticmethod
+    def get_files(theme_path: Path, default_path: Path) -> Dict[str, Path]:
+        """Get the path of each file of a theme, using the default theme's for files it doesn't have."""
+        files = {}
+        for attr, filename in THEME_FILES.items():
+            path = theme_path / filename
+            files[attr] = path if path.exists() else default_path / filename
+        return files
+
+    @classmethod
+    def current_mtimes(cls, theme_path: Path, default_path: Path) -> Dict[Path, float]:
+        """Get the modification time of each file of a theme as it is on disk now.
+
+        This blocks, so run it in an executor.
+        """
+        return cls._get_mtimes(cls.get_files(theme_path, default_path))
+
+    @staticmethod
+    def _get_mtimes(files: Mapping[str, Path]) -> Dict[Path, float]:
+        mtimes = {}
+        for path in files.values():
+            try:
+                mtimes[path] = path.stat().st_mtime
+            except OSError:
+                mtimes[path] = 0
+        return mtimes
+
+    @classmethod
+    def load(cls, name: str, theme_path: Path, default_path: Path) -> ThemeData:
+        """Read a theme from disk.
+
+        This blocks, so run it in an executor.
+
+        Raises
+        ------
+        InvalidTheme
+            If one of the required files is empty.
+        """
+        files = cls.get_files(theme_path, default_path)
+        mtimes = cls._get_mtimes(files)
+        data = {}
+        for attr, path in files.items():
+            with path.open("r") as f:
+                data[attr] = json.load(f)
+        empty = [files[attr].name for attr in REQUIRED_FILES if not data[attr]]
+        if empty:
+            raise InvalidTheme(f"The {name} theme has no data in {', '.join(empty)}")
+        return cls(name, files, data, mtimes)
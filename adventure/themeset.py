@@ -62,6 +62,7 @@ class ThemesetCommands(AdventureMixin):
             if monster in config_data[theme]["monsters"]:
                 updated = True
             config_data[theme]["monsters"][monster] = theme_data
+        self.invalidate_monster_roster(theme)
         image = theme_data.pop("image", None)
         text = _(
             "Monster: `{monster}` has been {status} the `{theme}` theme\n"
@@ -156,6 +157,7 @@ class ThemesetCommands(AdventureMixin):
                 text = _("Monster: `{monster}` does not exist in `{theme}` theme").format(monster=monster, theme=theme)
                 await smart_embed(ctx, text)
                 return
+        self.invalidate_monster_roster(theme)
 
         text = _("Monster: `{monster}` has been deleted from the `{theme}` theme").format(monster=monster, theme=theme)
         await smart_embed(ctx, text)
@@ -0,0 +1,85 @@
+import pytest
+
+from adventure.constants import REBIRTH_LVL, REBIRTH_STEP
+from adventure.progression import backpack_slots, max_level, rebirth_cost, skill_points, stat_points
+
+REBIRTHS = range(0, 10001)
+
+
+# The loops the progression functions replaced, kept as they were in Character.get_stat_value,
+# Character.get_max_level and calculate_sp.
+def old_stat_points(rebirths: int) -> int:
+    extrapoints = 0
+    extrapoints += rebirths // 10 * 5
+
+    for _loop_counter in range(rebirths):
+        if rebirths >= 30:
+            extrapoints += 3
+        elif rebirths >= 20:
+            extrapoints += 5
+        elif rebirths >= 10:
+            extrapoints += 1
+        elif rebirths < 10:
+            extrapoints += 2
+        rebirths -= 1
+
+    return int(extrapoints)
+
+
+def old_max_level(rebirths: int) -> int:
+    rebirths = max(rebirths, 0)
+
+    if rebirths == 0:
+        maxlevel = 5
+    else:
+        maxlevel = REBIRTH_LVL
+
+    for _loop_counter in range(rebirths):
+        if rebirths >= 20:
+            maxlevel += REBIRTH_STEP
+        elif rebirths > 10:
+            maxlevel += 10
+        elif rebirths <= 10:
+            maxlevel += 5
+        rebirths -= 1
+    return min(maxlevel, 10000)
+
+
+def old_skill_points(lvl_end: int, rebirths: int) -> int:
+    points_300 = lvl_end - 300 if lvl_end >= 300 else 0
+    points_200 = (lvl_end - 200) - points_300 if lvl_end >= 200 else 0
+    points_100 = (lvl_end - 100) - points_300 - points_200 if lvl_end >= 100 else 0
+    points_0 = lvl_end - points_100 - points_300 - points_200
+    if 200 <= lvl_end < 300:
+        points_200 += 1
+        points_0 -= 1
+    points = (rebirths * 10) + (points_300 * 1) + (points_200 * 5) + (points_100 * 1) + (points_0 * 0.5)
+
+    return int(points)
+
+
+def test_stat_points():
+    assert [stat_points(r) for r in REBIRTHS] == [old_stat_points(r) for r in REBIRTHS]
+
+
+def test_max_level():
+    assert [max_level(r) for r in REBIRTHS] == [old_max_level(r) for r in REBIRTHS]
+
+
+@pytest.mark.parametrize("rebirths", [0, 1, 10, 100, 10000])
+def test_skill_points(rebirths):
+    levels = range(0, 10001)
+    assert [skill_points(lvl, rebirths) for lvl in levels] == [old_skill_points(lvl, rebirths) for lvl in levels]
+
+
+def test_skill_points_at_max_level():
+    expected = [old_skill_points(old_max_level(r), r) for r in REBIRTHS]
+    assert [skill_points(max_level(r), r) for r in REBIRTHS] == expected
+
+
+def test_rebirth_cost():
+    assert [rebirth_cost(r) for r in REBIRTHS] == [1000 * r for r in REBIRTHS]
+
+
+def test_backpack_slots():
+    assert [backpack_slots(r) for r in REBIRTHS] == [50 + (r * 5) for r in REBIRTHS]